@@ -2,10 +2,10 @@ import os
 import streamlit as st
 import uuid
 
-from backend.agent import run_agent  # <--- unser Agent
+from backend.agent import run_agent_stream  # <--- unser Agent
+from backend.router_local import has_sql_signal
 from backend.sql_db import (
-    get_facilities_by_query,
-    get_free_places,
+    get_facilities_by_query_cached,
     reserve_place,
     reset_pre_registrations
 )
@@ -22,32 +22,19 @@ st.write("Stelle Fragen zur Kinderbetreuung in Oberösterreich. Ich helfe dir ge
 # Chat-Verlauf im Session State
 # -----------------------------
 if "messages" not in st.session_state:
-    st.session_state.messages = [
-        {
-            "role": "system",
-            "content": (
-                "Du bist ein sachlicher, hilfsbereiter Assistent für Fragen zur Kinderbetreuung "
-                "in Oberösterreich (der schlaue Fuchs LEO). "
-                "Standardmäßig antwortest du auf Deutsch, klar und verständlich. "
-                "Wenn Nutzer*innen jedoch eindeutig in einer anderen Sprache schreiben, "
-                "antwortest du in derselben Sprache (z.B. Englisch), ohne den Inhalt zu wechseln.\n\n"
-                "Dir stehen mehrere Datenquellen zur Verfügung: eine strukturierte Datenbank mit Kinderbetreuungseinrichtungen "
-                "und Platzkapazitäten, ein Dokumentenbestand (RAG) und eine Websuche. "
-                "Du kannst Einrichtungen und freie Plätze beschreiben und konkrete nächste Schritte vorschlagen.\n\n"
-                "WICHTIG: Du führst selbst keine verbindlichen Anmeldungen durch. "
-                "Wenn Nutzer*innen ihr Kind vormerken oder anmelden möchten, erkläre ihnen, dass sie dafür "
-                "die Vormerkfunktion in der Anwendung nutzen können (Bereich 'Einrichtungen & freie Plätze' in der Seitenleiste) "
-                "oder sich direkt an die jeweilige Einrichtung bzw. Gemeinde wenden sollen."
-            ),
-        }
-    ]
-
-# Bisherige Nachrichten anzeigen (ohne system)
-for msg in st.session_state.messages:
-    if msg["role"] in ("user", "assistant"):
-        with st.chat_message("user" if msg["role"] == "user" else "assistant"):
+    # Nur User/Assistant-Nachrichten; der System-Prompt liegt in backend/agent.py
+    st.session_state.messages = []
+
+
+def render_history() -> None:
+    """Bisherige Nachrichten anzeigen."""
+    for msg in st.session_state.messages:
+        with st.chat_message(msg["role"]):
             st.markdown(msg["content"])
 
+
+render_history()
+
 # -----------------------------
 # Eingabefeld für neue Frage
 # -----------------------------
@@ -57,22 +44,27 @@ if user_input:
     # Nutzer-Nachricht speichern
     st.session_state.messages.append({"role": "user", "content": user_input})
 
-    # Agent aufrufen (Responses API + Websuche)
-    assistant_message = run_agent(st.session_state.messages)
+    # Ohne Ort/PLZ/Kennzahl/Stichworte kein Routing nötig
+    skip_router = not has_sql_signal(user_input)
+
+    # Agent aufrufen (Responses API + Websuche) und Antwort direkt streamen
+    with st.chat_message("assistant"):
+        assistant_message = st.write_stream(
+            run_agent_stream(st.session_state.messages, skip_router=skip_router)
+        )
 
     # Antwort speichern
     st.session_state.messages.append(
         {"role": "assistant", "content": assistant_message}
     )
 
-    # Antwort anzeigen
-    with st.chat_message("assistant"):
-        st.markdown(assistant_message)
-
 # -----------------------------
 # Sidebar: Einrichtungen & freie Plätze (Prototyp)
+# Als Fragment: Suche, Vormerkung und Reset laufen nur das Sidebar-Fragment
+# neu statt das ganze Skript samt Chat-Verlauf.
 # -----------------------------
-with st.sidebar:
+@st.fragment
+def render_sidebar() -> None:
     st.subheader("🔎 Einrichtungen & freie Plätze (Prototyp)")
 
     # Stadt/Gemeinde eingeben
@@ -90,7 +82,7 @@ with st.sidebar:
 
     facilities = []
     if city:
-        facilities = get_facilities_by_query(city)
+        facilities = get_facilities_by_query_cached(city)
 
         if not facilities:
             st.info(f"Ich habe keine Einrichtungen in {city} gefunden.")
@@ -130,8 +122,8 @@ with st.sidebar:
                     if contact_parts:
                         st.write(" | ".join(contact_parts))
 
-                    # Freie Plätze
-                    free = get_free_places(kennzahl)
+                    # Freie Plätze (bereits in der Einrichtungsabfrage enthalten)
+                    free = fac.get("free_places")
                     if free is None:
                         st.info(
                             "Für diese Einrichtung liegen derzeit keine Angaben zur Platzkapazität vor. "
@@ -191,3 +183,7 @@ with st.sidebar:
                     f"Alle Vormerkungen für Einrichtungen in **{city}** wurden zurückgesetzt. "
                     "Bitte die Suche erneut ausführen, um die aktualisierten freien Plätze zu sehen."
                 )
+
+
+with st.sidebar:
+    render_sidebar()
@@ -1,69 +1,205 @@
+import asyncio
+import hashlib
 import json
 import re
-from typing import List, Dict, Any
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Dict, Any, Awaitable, Iterator, Optional, Tuple, TypeVar
 
 import streamlit as st
-from openai import OpenAI
 
 from backend.sql_db import (
-    get_facilities_by_query,
+    get_facilities_by_query_cached,
     format_facilities,
-    get_free_places,
-    reserve_place,
+    check_free_places_with_name,
+    reserve_place_returning,
     get_facility_by_kennzahl,
 )
-
-# OpenAI-Client holt den Key aus Streamlit-Secrets
-client = OpenAI(api_key=st.secrets["OPENAI_API_KEY"])
+from backend.router_local import AMBIGUOUS, classify_local, guess_city
+from backend.openai_client import async_client, client
 
 # Vector Store ID aus setup_rag.py
 VECTOR_STORE_ID = "vs_69266a51597c81919d1463fc2f95128e"
 
+# System-Prompt des Chatbots – wird nur serverseitig vor den Verlauf gesetzt
+SYSTEM_PROMPT = (
+    "Du bist ein sachlicher, hilfsbereiter Assistent für Fragen zur Kinderbetreuung "
+    "in Oberösterreich (der schlaue Fuchs LEO). "
+    "Standardmäßig antwortest du auf Deutsch, klar und verständlich. "
+    "Wenn Nutzer*innen jedoch eindeutig in einer anderen Sprache schreiben, "
+    "antwortest du in derselben Sprache (z.B. Englisch), ohne den Inhalt zu wechseln.\n\n"
+    "Dir stehen mehrere Datenquellen zur Verfügung: eine strukturierte Datenbank mit Kinderbetreuungseinrichtungen "
+    "und Platzkapazitäten, ein Dokumentenbestand (RAG) und eine Websuche. "
+    "Du kannst Einrichtungen und freie Plätze beschreiben und konkrete nächste Schritte vorschlagen.\n\n"
+    "WICHTIG: Du führst selbst keine verbindlichen Anmeldungen durch. "
+    "Wenn Nutzer*innen ihr Kind vormerken oder anmelden möchten, erkläre ihnen, dass sie dafür "
+    "die Vormerkfunktion in der Anwendung nutzen können (Bereich 'Einrichtungen & freie Plätze' in der Seitenleiste) "
+    "oder sich direkt an die jeweilige Einrichtung bzw. Gemeinde wenden sollen."
+)
+
+_SYSTEM_MESSAGE = {"role": "system", "content": SYSTEM_PROMPT}
+
+# Einleitung für den SQL-Kontext, der als System-Nachricht angehängt wird
+_SQL_CONTEXT_PREFIX = (
+    "Folgende Informationen wurden aus der strukturierten Kinderbetreuungsdatenbank ermittelt. "
+    "Du kannst sie für deine Antwort verwenden:\n\n"
+)
+
+# ---------------------------------------------------------
+# Async-Infrastruktur
+# ---------------------------------------------------------
+# Eine dauerhaft laufende Event-Loop in einem Hintergrund-Thread. Der
+# AsyncOpenAI-Client (httpx.AsyncClient) bindet seine Verbindungen an eine
+# Loop – ein asyncio.run() pro Aufruf würde sie jedes Mal schließen.
+_loop = asyncio.new_event_loop()
+threading.Thread(target=_loop.run_forever, name="agent-event-loop", daemon=True).start()
+
+T = TypeVar("T")
+
+
+def _run_sync(coro: Awaitable[T]) -> T:
+    """Führt eine Coroutine auf der Agent-Loop aus und wartet auf das Ergebnis."""
+    return asyncio.run_coroutine_threadsafe(coro, _loop).result()
+
 
 # ---------------------------------------------------------
 # Helper: Zitationsmarker aus Antworten entfernen
 # ---------------------------------------------------------
+# Muster einmalig beim Import kompilieren statt bei jedem Aufruf
+# Alles ab 'filecite' bis zum nächsten Leerzeichen oder Zeilenende
+_RE_FILECITE = re.compile(r"filecite\S*")
+# 'turnXfileY'-Marker
+_RE_TURN = re.compile(r"turn\d+file\d+")
+# Private-Use-Characters und Replacement-Char (�) → Übersetzungstabelle für str.translate
+_BAD_TABLE = dict.fromkeys(
+    [*range(0xE000, 0xF900), *range(0xF0000, 0xFFFFE), *range(0x100000, 0x10FFFE), 0xFFFD],
+    None,
+)
+# Mehrfache SPACES (nicht Zeilenumbrüche)
+_RE_SPACES = re.compile(r"[ ]{2,}")
+# Whitespace am Zeilenende (ohne den Zeilenumbruch selbst)
+_RE_TRAILING = re.compile(r"[^\S\n]+$", re.MULTILINE)
+
+
 def _clean_citations(text: str) -> str:
     """
     Entfernt interne OpenAI-Zitationsmarker und private Sonderzeichen,
     lässt aber Zeilenumbrüche und normale Aufzählungen erhalten.
     """
+    text = _RE_FILECITE.sub("", text)
+    text = _RE_TURN.sub("", text)
+    text = text.translate(_BAD_TABLE)
+    text = _RE_SPACES.sub(" ", text)
 
-    # Alles entfernen, was mit 'filecite' beginnt, bis zum nächsten Leerzeichen oder Zeilenende
-    text = re.sub(r"filecite.*?(?=\s|$)", "", text)
+    # Am Zeilenende Leerzeichen entfernen, Zeilenumbrüche beibehalten
+    text = _RE_TRAILING.sub("", text)
+
+    return text.strip()
 
-    # Alle 'turnXfileY'-Marker entfernen
-    text = re.sub(r"turn\d+file\d+", "", text)
 
-    # Private-Use-Characters und Replacement-Char (�) entfernen
-    def is_bad_char(ch: str) -> bool:
-        code = ord(ch)
-        if 0xE000 <= code <= 0xF8FF:
-            return True
-        if 0xF0000 <= code <= 0xFFFFD or 0x100000 <= code <= 0x10FFFD:
-            return True
-        if code == 0xFFFD:
-            return True
-        return False
+class _StreamingCitationCleaner:
+    """
+    Inkrementelle Variante von _clean_citations für gestreamte Antworten.
 
-    text = "".join(ch for ch in text if not is_bad_char(ch))
+    Alle Muster wirken nur innerhalb einer Zeile. Deshalb wird bis zum letzten
+    Zeilenumbruch gepuffert, und nur vollständige Zeilen werden bereinigt.
+    Führender Whitespace wird verworfen und abschließender Whitespace
+    zurückgehalten, bis weiterer Inhalt folgt. Die zusammengesetzte Ausgabe
+    entspricht damit genau _clean_citations(gesamter Text).
+    """
 
-    # Mehrfache SPACES (nicht Zeilenumbrüche) reduzieren
-    text = re.sub(r"[ ]{2,}", " ", text)
+    def __init__(self) -> None:
+        self._buffer = ""
+        self._pending = ""
+        self._started = False
+
+    def _clean_block(self, block: str) -> str:
+        block = _RE_FILECITE.sub("", block)
+        block = _RE_TURN.sub("", block)
+        block = block.translate(_BAD_TABLE)
+        block = _RE_SPACES.sub(" ", block)
+        block = _RE_TRAILING.sub("", block)
+
+        if not self._started:
+            block = block.lstrip()
+            if not block:
+                return ""
+            self._started = True
+
+        content = block.rstrip()
+        if not content:
+            self._pending += block
+            return ""
+
+        out = self._pending + content
+        self._pending = block[len(content):]
+        return out
+
+    def feed(self, delta: str) -> str:
+        self._buffer += delta
+        cut = self._buffer.rfind("\n")
+        if cut < 0:
+            return ""
+        block, self._buffer = self._buffer[: cut + 1], self._buffer[cut + 1:]
+        return self._clean_block(block)
+
+    def flush(self) -> str:
+        block, self._buffer = self._buffer, ""
+        out = self._clean_block(block)
+        # Whitespace am Ende der Antwort entfällt (wie bei .strip())
+        self._pending = ""
+        return out
 
-    # Am Zeilenende Leerzeichen entfernen, Zeilenumbrüche beibehalten
-    lines = [line.rstrip() for line in text.splitlines()]
-    text = "\n".join(lines)
 
-    return text.strip()
+# ---------------------------------------------------------
+# Helper: Text aus einer Responses-API-Antwort
+# ---------------------------------------------------------
+def _extract_text(response: Any) -> str:
+    """
+    output_text fasst alle Textteile der Antwort zusammen (openai>=1.66,
+    siehe requirements.txt) – kein Fallback über response.output[...] nötig.
+    """
+    return response.output_text
+
+
+# ---------------------------------------------------------
+# Helper: letzte Nutzerfrage
+# ---------------------------------------------------------
+def _last_user_message(messages: List[Dict[str, Any]]) -> Optional[str]:
+    for m in reversed(messages):
+        if m["role"] == "user":
+            return m["content"]
+    return None
 
 
 # ---------------------------------------------------------
 # Router: Entscheidet, ob eine SQL-Aktion nötig ist
 # ---------------------------------------------------------
-def decide_sql_action(messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+# JSON-Schema für die strukturierte Router-Ausgabe (Structured Outputs)
+SQL_ACTION_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "action": {
+            "type": "string",
+            "enum": ["none", "list_facilities", "check_free_places", "reserve_place"],
+        },
+        "city": {"type": ["string", "null"]},
+        "kennzahl": {"type": ["integer", "null"]},
+        "parent_name": {"type": ["string", "null"]},
+        "parent_email": {"type": ["string", "null"]},
+        "child_name": {"type": ["string", "null"]},
+    },
+    "required": ["action", "city", "kennzahl", "parent_name", "parent_email", "child_name"],
+    "additionalProperties": False,
+}
+
+
+async def decide_sql_action(messages: List[Dict[str, Any]]) -> Dict[str, Any]:
     """
-    Nutzt ein kleines Modell, um zu entscheiden, ob eine SQL-Aktion nötig ist.
+    Entscheidet, ob eine SQL-Aktion nötig ist. Zuerst greifen lokale Regeln
+    (backend/router_local.py); nur wenn diese uneindeutig sind, wird ein
+    kleines Modell gefragt.
     Gibt ein Dict zurück, z.B.:
 
       {
@@ -77,28 +213,20 @@ def decide_sql_action(messages: List[Dict[str, Any]]) -> Dict[str, Any]:
     """
 
     # letzte User-Nachricht extrahieren
-    last_user = None
-    for m in reversed(messages):
-        if m["role"] == "user":
-            last_user = m["content"]
-            break
+    last_user = _last_user_message(messages)
 
     if not last_user:
         return {"action": "none"}
 
+    # Regelbasierter Router spart den LLM-Aufruf in den meisten Fällen
+    local = classify_local(last_user)
+    if local["action"] != AMBIGUOUS:
+        return local
+
     system_prompt = (
         "Du bist ein Routing-Assistent für einen Kinderbetreuungs-Chatbot in Oberösterreich. "
         "Analysiere die letzte Nutzerfrage und entscheide, ob eine SQL-Funktion auf der "
         "Kinderbetreuungsdatenbank aufgerufen werden soll.\n\n"
-        "Gib deine Antwort ausschließlich als JSON im folgenden Format zurück:\n"
-        "{\n"
-        '  \"action\": \"none\" | \"list_facilities\" | \"check_free_places\" | \"reserve_place\",\n'
-        '  \"city\": string oder null,\n'
-        '  \"kennzahl\": number oder null,\n'
-        '  \"parent_name\": string oder null,\n'
-        '  \"parent_email\": string oder null,\n'
-        '  \"child_name\": string oder null\n'
-        "}\n\n"
         "Regeln:\n"
         "- Verwende action=\"list_facilities\", wenn nach Einrichtungen oder freien Plätzen in einer bestimmten Stadt/Gemeinde gefragt wird "
         "(z.B. \"Welche Kinderbetreuungseinrichtungen gibt es in Linz?\") oder \"Wie viele Plätze sind in Hagenberg noch frei?\").\n"
@@ -110,34 +238,27 @@ def decide_sql_action(messages: List[Dict[str, Any]]) -> Dict[str, Any]:
         "- parent_name, parent_email, child_name nur setzen, wenn sie in der Frage klar vorkommen.\n"
     )
 
-    router_response = client.responses.create(
+    router_response = await async_client.responses.create(
         model="gpt-4.1-mini",
         input=[
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": last_user},
         ],
+        text={
+            "format": {
+                "type": "json_schema",
+                "name": "SqlAction",
+                "schema": SQL_ACTION_SCHEMA,
+                "strict": True,
+            }
+        },
     )
 
-    # Text aus der Router-Antwort holen
-    try:
-        raw = getattr(router_response, "output_text", None)
-        if not raw:
-            first = router_response.output[0].content[0].text
-            raw = getattr(first, "value", str(first))
-    except Exception:
+    # Strukturierte Ausgabe → ist garantiert gültiges JSON nach Schema
+    raw = _extract_text(router_response)
+    if not raw:
         return {"action": "none"}
-
-    # JSON robust parsen
-    try:
-        data = json.loads(raw)
-    except json.JSONDecodeError:
-        match = re.search(r"\{.*\}", raw, re.DOTALL)
-        if not match:
-            return {"action": "none"}
-        try:
-            data = json.loads(match.group(0))
-        except json.JSONDecodeError:
-            return {"action": "none"}
+    data = json.loads(raw)
 
     if "action" not in data:
         data["action"] = "none"
@@ -146,122 +267,277 @@ def decide_sql_action(messages: List[Dict[str, Any]]) -> Dict[str, Any]:
 
 
 # ---------------------------------------------------------
-# Hauptfunktion: Agent mit SQL + RAG + Web
+# Großer Modellaufruf (RAG + Websuche) inkl. Antwort-Cache
 # ---------------------------------------------------------
-def run_agent(messages: List[Dict[str, Any]]) -> str:
+MAIN_MODEL = "gpt-5.1"
+MAIN_TOOLS = [
+    {"type": "web_search_preview"},
+    {"type": "file_search", "vector_store_ids": [VECTOR_STORE_ID]},
+]
+
+ANSWER_CACHE_TTL = 3600
+ANSWER_CACHE_MAX_ENTRIES = 256
+
+
+@st.cache_resource(show_spinner=False)
+def _answer_cache() -> "OrderedDict[str, Tuple[float, str]]":
     """
-    Orchestriert:
-    - SQL (Einrichtungen, freie Plätze, Vormerkung)
-    - RAG (file_search)
-    - Websuche (web_search_preview)
-    und liefert die finale Antwort als Text.
+    Prozessweiter Antwort-Cache: Schlüssel → (Zeitstempel, bereinigte Antwort).
+    Ein explizites Dict statt st.cache_data, damit auch gestreamte Antworten
+    nach dem Stream eingetragen werden können.
     """
+    return OrderedDict()
 
-    # 1) Routing: Brauchen wir eine SQL-Aktion?
-    sql_action = decide_sql_action(messages)
-
-    sql_context_parts: List[str] = []
-
-    action = sql_action.get("action", "none")
-    city = sql_action.get("city")
-    kennzahl = sql_action.get("kennzahl")
-    parent_name = sql_action.get("parent_name")
-    parent_email = sql_action.get("parent_email")
-    child_name = sql_action.get("child_name")
-
-    # 2) SQL-Aktionen ausführen und Kontext erzeugen
-    if action == "list_facilities" and city:
-        facilities = get_facilities_by_query(city)
-        sql_context_parts.append(format_facilities(facilities, city))
-
-    elif action == "check_free_places" and kennzahl is not None:
-        kennzahl_int = int(kennzahl)
-        fac = get_facility_by_kennzahl(kennzahl_int)
-        free = get_free_places(kennzahl_int)
-        if fac:
-            name = fac.get("name", f"Einrichtung mit Kennzahl {kennzahl_int}")
-        else:
-            name = f"Einrichtung mit Kennzahl {kennzahl_int}"
 
-        if free is None:
-            txt = (
-                f"Für die Einrichtung **{name}** (Kennzahl {kennzahl_int}) liegen "
-                "keine Kapazitätsinformationen vor."
-            )
-        elif free > 0:
-            txt = (
-                f"Für die Einrichtung **{name}** (Kennzahl {kennzahl_int}) sind nach den aktuellen "
-                f"Daten noch ungefähr **{free} Plätze** verfügbar."
-            )
-        else:
-            txt = (
-                f"Für die Einrichtung **{name}** (Kennzahl {kennzahl_int}) sind nach den aktuellen "
-                "Daten derzeit keine Plätze mehr frei."
-            )
-        sql_context_parts.append(txt)
-
-    elif (
-        action == "reserve_place"
-        and kennzahl is not None
-        and parent_name
-        and parent_email
-        and child_name
-    ):
-        kennzahl_int = int(kennzahl)
-        fac = get_facility_by_kennzahl(kennzahl_int)
-        ok = reserve_place(kennzahl_int, parent_name, parent_email, child_name)
-
-        if fac:
-            name = fac.get("name", f"Einrichtung mit Kennzahl {kennzahl_int}")
-        else:
-            name = f"Einrichtung mit Kennzahl {kennzahl_int}"
-
-        if ok:
-            txt = (
-                f"Die Vormerkung für das Kind **{child_name}** bei **{name}** (Kennzahl {kennzahl_int}) "
-                "wurde in der Datenbank gespeichert. Die Einrichtung bzw. der Träger kann sich nun "
-                "bei Bedarf mit den angegebenen Kontaktdaten melden.\n\n"
-                "Hinweis: Die Vormerkung ist noch keine verbindliche Platzzusage."
+_answer_cache_lock = threading.Lock()
+
+
+def _answer_key(final_messages: List[Dict[str, Any]]) -> str:
+    """Stabiler Hash über den kompletten Nachrichtenverlauf + Vector Store."""
+    payload = json.dumps(
+        {"vector_store_id": VECTOR_STORE_ID, "messages": final_messages},
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _cache_get(key: str) -> Optional[str]:
+    cache = _answer_cache()
+    with _answer_cache_lock:
+        hit = cache.get(key)
+        if hit is None:
+            return None
+        ts, answer = hit
+        if time.time() - ts > ANSWER_CACHE_TTL:
+            del cache[key]
+            return None
+        cache.move_to_end(key)
+        return answer
+
+
+def _cache_put(key: str, answer: str) -> None:
+    cache = _answer_cache()
+    with _answer_cache_lock:
+        cache[key] = (time.time(), answer)
+        cache.move_to_end(key)
+        while len(cache) > ANSWER_CACHE_MAX_ENTRIES:
+            cache.popitem(last=False)
+
+
+async def _acall_main_model(final_messages: List[Dict[str, Any]]) -> str:
+    response = await async_client.responses.create(
+        model=MAIN_MODEL,
+        input=final_messages,
+        tools=MAIN_TOOLS,
+    )
+
+    return _clean_citations(_extract_text(response))
+
+
+def _stream_main_model(final_messages: List[Dict[str, Any]]) -> Iterator[str]:
+    """Streamt die bereinigte Antwort zeilenweise, sobald Text ankommt."""
+    cleaner = _StreamingCitationCleaner()
+    with client.responses.stream(
+        model=MAIN_MODEL,
+        input=final_messages,
+        tools=MAIN_TOOLS,
+    ) as stream:
+        for event in stream:
+            if event.type == "response.output_text.delta":
+                chunk = cleaner.feed(event.delta)
+                if chunk:
+                    yield chunk
+
+    tail = cleaner.flush()
+    if tail:
+        yield tail
+
+
+# ---------------------------------------------------------
+# Hauptfunktion: Agent mit SQL + RAG + Web
+# ---------------------------------------------------------
+async def _build_final_messages(
+    messages: List[Dict[str, Any]],
+    skip_router: bool = False,
+) -> Tuple[List[Dict[str, Any]], str]:
+    """
+    Routing + SQL-Aktionen ausführen und die Nachrichten für das große Modell
+    zusammenstellen. Gibt (final_messages, action) zurück.
+    Mit skip_router=True (keine DB-Hinweise in der Frage) entfällt das Routing.
+    """
+
+    # 1) Ort vorab erkennen und Einrichtungen spekulativ laden,
+    #    während der Router noch läuft
+    prefetch_city: Optional[str] = None
+    prefetch: Optional["asyncio.Task[List[Dict[str, Any]]]"] = None
+    last_user = _last_user_message(messages)
+    if last_user and not skip_router:
+        prefetch_city = guess_city(last_user)
+        if prefetch_city:
+            prefetch = asyncio.create_task(
+                asyncio.to_thread(get_facilities_by_query_cached, prefetch_city)
             )
+
+    try:
+        # Routing: Brauchen wir eine SQL-Aktion?
+        if skip_router:
+            sql_action = {"action": "none"}
         else:
-            txt = (
-                f"Für die Einrichtung **{name}** (Kennzahl {kennzahl_int}) konnte keine Vormerkung "
-                "mehr gespeichert werden (vermutlich keine freien Plätze mehr oder Einrichtung nicht gefunden)."
+            sql_action = await decide_sql_action(messages)
+
+        sql_context_parts: List[str] = []
+
+        action = sql_action.get("action", "none")
+        city = sql_action.get("city")
+        kennzahl = sql_action.get("kennzahl")
+        parent_name = sql_action.get("parent_name")
+        parent_email = sql_action.get("parent_email")
+        child_name = sql_action.get("child_name")
+
+        # 2) SQL-Aktionen ausführen und Kontext erzeugen
+        if action == "list_facilities" and city:
+            if prefetch is not None and prefetch_city.lower() == city.strip().lower():
+                facilities = await prefetch
+                prefetch = None
+            else:
+                facilities = await asyncio.to_thread(get_facilities_by_query_cached, city)
+            sql_context_parts.append(format_facilities(facilities, city))
+
+        elif action == "check_free_places" and kennzahl is not None:
+            kennzahl_int = int(kennzahl)
+            info = await asyncio.to_thread(check_free_places_with_name, kennzahl_int)
+            if info:
+                name = info.get("name") or f"Einrichtung mit Kennzahl {kennzahl_int}"
+                free = info.get("free")
+            else:
+                name = f"Einrichtung mit Kennzahl {kennzahl_int}"
+                free = None
+
+            if free is None:
+                txt = (
+                    f"Für die Einrichtung **{name}** (Kennzahl {kennzahl_int}) liegen "
+                    "keine Kapazitätsinformationen vor."
+                )
+            elif free > 0:
+                txt = (
+                    f"Für die Einrichtung **{name}** (Kennzahl {kennzahl_int}) sind nach den aktuellen "
+                    f"Daten noch ungefähr **{free} Plätze** verfügbar."
+                )
+            else:
+                txt = (
+                    f"Für die Einrichtung **{name}** (Kennzahl {kennzahl_int}) sind nach den aktuellen "
+                    "Daten derzeit keine Plätze mehr frei."
+                )
+            sql_context_parts.append(txt)
+
+        elif (
+            action == "reserve_place"
+            and kennzahl is not None
+            and parent_name
+            and parent_email
+            and child_name
+        ):
+            kennzahl_int = int(kennzahl)
+            result = await asyncio.to_thread(
+                reserve_place_returning, kennzahl_int, parent_name, parent_email, child_name
             )
-        sql_context_parts.append(txt)
-
-    # 3) SQL-Kontext als zusätzliche System-Nachricht anhängen
-    final_messages = list(messages)
-    if sql_context_parts:
-        sql_context_text = "\n\n".join(sql_context_parts)
-        final_messages.append(
-            {
+            ok = result is not None
+
+            if ok:
+                name = result.get("name") or f"Einrichtung mit Kennzahl {kennzahl_int}"
+            else:
+                # Name nur im Fehlerfall separat nachschlagen
+                fac = await asyncio.to_thread(get_facility_by_kennzahl, kennzahl_int)
+                if fac:
+                    name = fac.get("name", f"Einrichtung mit Kennzahl {kennzahl_int}")
+                else:
+                    name = f"Einrichtung mit Kennzahl {kennzahl_int}"
+
+            if ok:
+                txt = (
+                    f"Die Vormerkung für das Kind **{child_name}** bei **{name}** (Kennzahl {kennzahl_int}) "
+                    "wurde in der Datenbank gespeichert. Die Einrichtung bzw. der Träger kann sich nun "
+                    "bei Bedarf mit den angegebenen Kontaktdaten melden.\n\n"
+                    "Hinweis: Die Vormerkung ist noch keine verbindliche Platzzusage."
+                )
+            else:
+                txt = (
+                    f"Für die Einrichtung **{name}** (Kennzahl {kennzahl_int}) konnte keine Vormerkung "
+                    "mehr gespeichert werden (vermutlich keine freien Plätze mehr oder Einrichtung nicht gefunden)."
+                )
+            sql_context_parts.append(txt)
+
+        # 3) System-Prompt voranstellen, SQL-Kontext als zusätzliche System-Nachricht anhängen
+        if sql_context_parts:
+            sql_context_msg = {
                 "role": "system",
-                "content": (
-                    "Folgende Informationen wurden aus der strukturierten Kinderbetreuungsdatenbank ermittelt. "
-                    "Du kannst sie für deine Antwort verwenden:\n\n"
-                    f"{sql_context_text}"
-                ),
+                "content": _SQL_CONTEXT_PREFIX + "\n\n".join(sql_context_parts),
             }
-        )
+            final_messages = [_SYSTEM_MESSAGE, *messages, sql_context_msg]
+        else:
+            final_messages = [_SYSTEM_MESSAGE, *messages]
+
+        return final_messages, action
+    finally:
+        # Vorab-Abfrage nie verwaist zurücklassen: noch laufend → abbrechen;
+        # schon fertig (auch mit DB-Fehler) → Ergebnis/Fehler abholen, sonst
+        # meldet asyncio "Task exception was never retrieved"
+        if prefetch is not None:
+            if not prefetch.done():
+                prefetch.cancel()
+            elif not prefetch.cancelled():
+                prefetch.exception()
+
+
+async def run_agent_async(messages: List[Dict[str, Any]], skip_router: bool = False) -> str:
+    """
+    Orchestriert:
+    - SQL (Einrichtungen, freie Plätze, Vormerkung)
+    - RAG (file_search)
+    - Websuche (web_search_preview)
+    und liefert die finale Antwort als Text.
+    """
+    final_messages, action = await _build_final_messages(messages, skip_router)
 
     # 4) Großer Modellaufruf mit RAG + Websuche
-    response = client.responses.create(
-        model="gpt-5.1",
-        input=final_messages,
-        tools=[
-            {"type": "web_search_preview"},
-            {"type": "file_search", "vector_store_ids": [VECTOR_STORE_ID]},
-        ],
-    )
+    #    Vormerkungen verändern Daten → nie aus dem Cache beantworten
+    if action == "reserve_place":
+        return await _acall_main_model(final_messages)
 
-    try:
-        raw = getattr(response, "output_text", None)
-        if raw:
-            return _clean_citations(raw)
-    except Exception:
-        pass
-
-    first = response.output[0].content[0].text
-    raw = getattr(first, "value", str(first))
-    return _clean_citations(raw)
+    key = _answer_key(final_messages)
+    answer = _cache_get(key)
+    if answer is None:
+        answer = await _acall_main_model(final_messages)
+        _cache_put(key, answer)
+    return answer
+
+
+def run_agent(messages: List[Dict[str, Any]], skip_router: bool = False) -> str:
+    """Synchrone Variante von run_agent_async (z.B. für die Eval-Skripte)."""
+    return _run_sync(run_agent_async(messages, skip_router))
+
+
+def run_agent_stream(messages: List[Dict[str, Any]], skip_router: bool = False) -> Iterator[str]:
+    """
+    Wie run_agent, liefert die Antwort aber als Stream von Textstücken
+    (für st.write_stream). Treffer im Antwort-Cache werden direkt ausgegeben.
+    """
+    # Routing + SQL laufen auf der Agent-Loop, der Stream selbst synchron
+    final_messages, action = _run_sync(_build_final_messages(messages, skip_router))
+
+    if action == "reserve_place":
+        yield from _stream_main_model(final_messages)
+        return
+
+    key = _answer_key(final_messages)
+    cached = _cache_get(key)
+    if cached is not None:
+        yield cached
+        return
+
+    parts: List[str] = []
+    for chunk in _stream_main_model(final_messages):
+        parts.append(chunk)
+        yield chunk
+    _cache_put(key, "".join(parts))
@@ -0,0 +1,47 @@
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+try:
+    import tomllib  # Python 3.11+
+except ModuleNotFoundError:  # pragma: no cover
+    import tomli as tomllib
+
+# ---------------------------------------------------------
+# Secrets ohne Streamlit-Laufzeit lesen
+# ---------------------------------------------------------
+# Reihenfolge wie bei Streamlit: Projekt-secrets.toml vor der globalen Datei.
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SECRETS_FILES = (
+    PROJECT_ROOT / ".streamlit" / "secrets.toml",
+    Path.home() / ".streamlit" / "secrets.toml",
+)
+
+
+@lru_cache(maxsize=1)
+def _load_secrets() -> Dict[str, Any]:
+    secrets: Dict[str, Any] = {}
+    # globale Datei zuerst laden, Projektdatei überschreibt
+    for path in reversed(SECRETS_FILES):
+        if path.is_file():
+            secrets.update(tomllib.loads(path.read_text(encoding="utf-8")))
+    return secrets
+
+
+def get_secret(name: str, default: Optional[str] = None) -> Optional[str]:
+    """
+    Liest ein Secret aus der Umgebung oder aus .streamlit/secrets.toml
+    (per tomllib, ohne st.secrets). Fehlt es und ist kein Default
+    angegeben, wird ein KeyError ausgelöst.
+    """
+    value = os.environ.get(name)
+    if value:
+        return value
+
+    secrets = _load_secrets()
+    if name in secrets:
+        return secrets[name]
+    if default is not None:
+        return default
+    raise KeyError(f"Secret '{name}' weder als Umgebungsvariable noch in secrets.toml gefunden.")
@@ -1,13 +1,23 @@
 from sqlalchemy import create_engine
 from langchain_community.utilities import SQLDatabase
+import streamlit as st
 import os
 
+@st.cache_resource(show_spinner=False)
 def get_engine() -> "Engine":
     from streamlit import secrets
     db_url = secrets.get("SUPABASE_DB_URL") or os.environ["SUPABASE_DB_URL"]
-    return create_engine(db_url)
+    # Engine + Pool nur einmal pro Prozess aufbauen und über Reruns hinweg wiederverwenden
+    return create_engine(
+        db_url,
+        pool_size=5,
+        max_overflow=10,
+        pool_pre_ping=True,
+        pool_recycle=1800,
+    )
 
+@st.cache_resource(show_spinner=False)
 def get_sql_database() -> SQLDatabase:
     engine = get_engine()
     db = SQLDatabase(engine=engine, schema="public", include_tables=["KBBEs"])
-    return db
\ No newline at end of file
+    return db
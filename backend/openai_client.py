@@ -0,0 +1,26 @@
+import httpx
+from openai import AsyncOpenAI, OpenAI
+
+from backend.config import get_secret
+
+# ---------------------------------------------------------
+# Gemeinsamer OpenAI-Client für alle Module
+# ---------------------------------------------------------
+# Ein Client pro Prozess: Verbindungen (TLS, HTTP/2) bleiben offen und werden
+# von Router-, Haupt- und Upload-Aufrufen wiederverwendet.
+TIMEOUT = 60.0
+LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=40)
+
+# API-Key aus der Umgebung (CLI-Skripte wie setup_rag.py) oder .streamlit/secrets.toml
+_API_KEY = get_secret("OPENAI_API_KEY")
+
+client = OpenAI(
+    api_key=_API_KEY,
+    http_client=httpx.Client(http2=True, timeout=TIMEOUT, limits=LIMITS),
+)
+
+# Für parallele Aufrufe (asyncio.gather)
+async_client = AsyncOpenAI(
+    api_key=_API_KEY,
+    http_client=httpx.AsyncClient(http2=True, timeout=TIMEOUT, limits=LIMITS),
+)
@@ -1,9 +1,7 @@
-import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
 
-from openai import OpenAI
-
-client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+from backend.openai_client import client
 
 VECTOR_STORE_NAME = "kinderbetreuung_rag_store"
 
@@ -16,17 +14,28 @@ def create_vector_store_if_not_exists() -> str:
     return vs.id
 
 
-def upload_files_to_vector_store(vector_store_id: str, file_paths: List[str]) -> None:
+def _upload_one(vector_store_id: str, path: str) -> None:
+    """Lädt eine einzelne Datei hoch und wartet, bis sie verarbeitet ist."""
+    print(f"Lade Datei hoch: {path}")
+    with open(path, "rb") as f:
+        client.vector_stores.files.upload_and_poll(
+            vector_store_id=vector_store_id,
+            file=f,
+        )
+
+
+def upload_files_to_vector_store(
+    vector_store_id: str, file_paths: List[str], max_workers: int = 8
+) -> None:
     """
-    Lädt die angegebenen Dateien nacheinander in den Vector Store.
-    In deiner openai-Version erwartet upload_and_poll ein Argument 'file'
-    und keine Liste 'files'.
+    Lädt die angegebenen Dateien parallel (Thread-Pool) in den Vector Store.
+    Die Uploads sind rein netzwerkgebunden, daher laufen sie gleichzeitig
+    statt nacheinander. In deiner openai-Version erwartet upload_and_poll
+    ein Argument 'file' und keine Liste 'files'.
     """
-    for path in file_paths:
-        print(f"Lade Datei hoch: {path}")
-        with open(path, "rb") as f:
-            client.vector_stores.files.upload_and_poll(
-                vector_store_id=vector_store_id,
-                file=f,
-            )
+    if not file_paths:
+        return
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(file_paths))) as pool:
+        # list(...) damit Fehler einzelner Uploads hier geworfen werden
+        list(pool.map(lambda path: _upload_one(vector_store_id, path), file_paths))
     print("Alle Dateien wurden hochgeladen.")
\ No newline at end of file
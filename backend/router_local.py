@@ -0,0 +1,175 @@
+import logging
+import re
+import time
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+import psycopg
+from psycopg_pool import PoolTimeout
+
+from backend.sql_db import get_known_cities
+
+# Ergebnis, wenn die Regeln keine sichere Entscheidung treffen → LLM-Router fragen
+AMBIGUOUS = "ambiguous"
+
+# Kennzahlen der Einrichtungen sind 6–7-stellig (z.B. 401007)
+_RE_KENNZAHL = re.compile(r"\b\d{6,7}\b")
+# Postleitzahlen in Oberösterreich: 4xxx
+_RE_PLZ = re.compile(r"\b4\d{3}\b")
+
+RESERVE_KEYWORDS = ("vormerk", "anmeld", "reservier", "registrier")
+# "frei"/"Platz" nur als ganze Wörter: nicht in "Freitag", "Freistadt", "Spielplatz"
+_RE_FREE = re.compile(
+    r"\bfrei(?:e[nrs]?)?\b|\bpl(?:a|ä)tz(?:en?)?\b|verfügbar|kapazität",
+    re.IGNORECASE,
+)
+FACILITY_KEYWORDS = (
+    "einrichtung",
+    "kinderbetreuung",
+    "kindergart",
+    "kindergärt",
+    "krabbelstube",
+    "kita",
+    "hort",
+    "tagesmutter",
+    "betreuung",
+)
+
+
+# ---------------------------------------------------------
+# Ortsverzeichnis (Gazetteer)
+# ---------------------------------------------------------
+# Nach einem DB-Fehler so lange ohne Ortsverzeichnis weiterarbeiten, statt bei
+# jeder Chat-Nachricht erneut auf den Pool-Timeout zu warten
+CITY_INDEX_RETRY_SECONDS = 60.0
+_city_index_failed_at: Optional[float] = None
+
+
+def _city_index() -> tuple:
+    """
+    Regex über alle bekannten Orte und ein Lookup lower(ort) → ort in
+    DB-Schreibweise. Ein leeres Ortsverzeichnis wird nicht gecacht.
+    Ist die DB nicht erreichbar, gilt kein Ort als bekannt (kein Fehler).
+    """
+    global _city_index_failed_at
+    if (
+        _city_index_failed_at is not None
+        and time.monotonic() - _city_index_failed_at < CITY_INDEX_RETRY_SECONDS
+    ):
+        return None, {}
+    try:
+        index = _build_city_index()
+    except LookupError:
+        return None, {}
+    except (psycopg.Error, PoolTimeout) as exc:
+        logging.warning("Ortsverzeichnis nicht ladbar, weiter ohne Orte: %s", exc)
+        _city_index_failed_at = time.monotonic()
+        return None, {}
+    _city_index_failed_at = None
+    return index
+
+
+@lru_cache(maxsize=1)
+def _build_city_index() -> tuple:
+    # Wird einmal pro Prozess gebaut; bei leerem Verzeichnis (z. B. DB beim
+    # Start nicht erreichbar) per Exception → lru_cache speichert nichts
+    cities = get_known_cities()
+    if not cities:
+        get_known_cities.clear()
+        raise LookupError("Ortsverzeichnis ist leer")
+
+    # längere Namen zuerst, damit z.B. "Linz-Land" vor "Linz" greift
+    alternatives = sorted(cities, key=len, reverse=True)
+    pattern = re.compile(
+        r"\b(" + "|".join(re.escape(c) for c in alternatives) + r")\b",
+        re.IGNORECASE,
+    )
+    return pattern, {c.lower(): c for c in cities}
+
+
+def guess_city(text: str) -> Optional[str]:
+    """
+    Sucht einen bekannten Ort aus der Datenbank in der Nutzerfrage.
+    Gibt den Ortsnamen in der Schreibweise der DB zurück oder None.
+    """
+    pattern, by_lower = _city_index()
+    if pattern is None:
+        return None
+
+    match = pattern.search(text)
+    if not match:
+        return None
+    return by_lower.get(match.group(1).lower())
+
+
+# Ziffernfolge, die eine PLZ (4-stellig) oder Kennzahl (6–7-stellig) sein könnte
+_RE_DIGITS = re.compile(r"\b\d{4,7}\b")
+
+
+# ---------------------------------------------------------
+# Regelbasierte Klassifikation
+# ---------------------------------------------------------
+def _action(action: str, city: Optional[str] = None, kennzahl: Optional[int] = None) -> Dict[str, Any]:
+    return {
+        "action": action,
+        "city": city,
+        "kennzahl": kennzahl,
+        "parent_name": None,
+        "parent_email": None,
+        "child_name": None,
+    }
+
+
+def classify_local(text: str) -> Dict[str, Any]:
+    """
+    Entscheidet ohne LLM, welche SQL-Aktion nötig ist.
+    Liefert dasselbe Format wie decide_sql_action oder action=AMBIGUOUS,
+    wenn die Regeln nicht eindeutig greifen.
+    """
+    lower = text.lower()
+
+    # Vormerkungen brauchen Namen/E-Mail aus Freitext → immer LLM
+    if any(k in lower for k in RESERVE_KEYWORDS):
+        return _action(AMBIGUOUS)
+
+    asks_free = _RE_FREE.search(text) is not None
+    asks_facility = any(k in lower for k in FACILITY_KEYWORDS)
+
+    kennzahl_match = _RE_KENNZAHL.search(text)
+    if kennzahl_match:
+        if asks_free:
+            return _action("check_free_places", kennzahl=int(kennzahl_match.group(0)))
+        return _action(AMBIGUOUS)
+
+    if not (asks_free or asks_facility):
+        # Ort ohne Bezug zu Betreuung/Plätzen → unklar, sonst keine SQL-Aktion
+        if guess_city(text):
+            return _action(AMBIGUOUS)
+        return _action("none")
+
+    city = guess_city(text)
+    if city:
+        return _action("list_facilities", city=city)
+
+    plz_match = _RE_PLZ.search(text)
+    if plz_match:
+        return _action("list_facilities", city=plz_match.group(0))
+
+    # Frage nach Einrichtungen/Plätzen ohne erkannten Ort → LLM entscheiden lassen
+    return _action(AMBIGUOUS)
+
+
+def has_sql_signal(text: str) -> bool:
+    """
+    Schnelle Vorprüfung für die App: True, wenn die Nachricht überhaupt
+    DB-relevante Hinweise enthält (Stichworte, PLZ/Kennzahl, bekannter Ort).
+    Bei False kann das Routing komplett übersprungen werden.
+    """
+    lower = text.lower()
+    if any(k in lower for k in RESERVE_KEYWORDS + FACILITY_KEYWORDS):
+        return True
+    if _RE_FREE.search(text):
+        return True
+    if _RE_DIGITS.search(text):
+        return True
+    return guess_city(text) is not None
@@ -0,0 +1,13 @@
+-- Indizes für die Einrichtungssuche (backend/sql_db.py: get_facilities_by_query)
+-- Einmalig in Supabase (SQL Editor) ausführen.
+
+-- Ortssuche: lower(ort) = lower(q) OR lower(ort) LIKE lower('%q%')
+-- Trigram-GIN-Index, damit auch LIKE mit führendem % keinen Seq-Scan braucht
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS kbbes_ort_trgm_idx
+    ON public."KBBEs" USING gin (lower(ort) gin_trgm_ops);
+
+-- PLZ-Suche: plz = %s (Integer-Parameter, kein ::text-Cast)
+CREATE INDEX IF NOT EXISTS kbbes_plz_idx
+    ON public."KBBEs" (plz);
@@ -1,99 +1,192 @@
-import psycopg
 import streamlit as st
-from typing import List, Dict, Any, Optional
+from functools import lru_cache
+from psycopg.rows import dict_row
+from psycopg_pool import ConnectionPool
+from typing import List, Dict, Any, Optional, Union
 
-DB_URL = st.secrets["SUPABASE_DB_URL"]
+from backend.config import get_secret
 
+# DB-URL aus der Umgebung oder .streamlit/secrets.toml (auch ohne laufende App)
+DB_URL = get_secret("SUPABASE_DB_URL")
 
-def query_db(sql: str, params: tuple = ()) -> List[Dict[str, Any]]:
+
+@st.cache_resource(show_spinner=False)
+def get_pool() -> ConnectionPool:
+    """
+    Connection-Pool einmal pro Prozess aufbauen: TCP/TLS/Auth-Handshake nur
+    beim Öffnen der Verbindungen, danach Wiederverwendung über alle Abfragen.
+    Zeilen kommen direkt als Dicts (dict_row).
+    """
+    return ConnectionPool(
+        DB_URL,
+        min_size=2,
+        max_size=10,
+        kwargs={"row_factory": dict_row},
+        open=True,
+    )
+
+
+def query_db(
+    sql: str,
+    params: Union[tuple, Dict[str, Any]] = (),
+    prepare: Optional[bool] = None,
+) -> List[Dict[str, Any]]:
     """
     Führt ein SELECT-Statement aus und gibt eine Liste von Dicts zurück.
     Nur für READ-Only gedacht.
-    """
-    rows: List[Dict[str, Any]] = []
 
-    with psycopg.connect(DB_URL) as conn:
-        with conn.cursor(row_factory=psycopg.rows.dict_row) as cur:
-            cur.execute(sql, params)
-            for row in cur.fetchall():
-                rows.append(dict(row))
-
-    return rows
+    prepare=None (Standard): psycopg bereitet Statements automatisch vor, sobald
+    sie sich auf einer Verbindung wiederholen (prepare_threshold).
+    prepare=True erzwingt ein serverseitiges PREPARE schon beim ersten Aufruf –
+    nur für häufige Abfragen und nur mit Session-Pooler/Direktverbindung; hinter
+    einem Transaction-Pooler (PgBouncer, Supabase-Port 6543) schlägt das fehl
+    ("prepared statement … already exists"). prepare=False schaltet es ab.
+    """
+    with get_pool().connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(sql, params, prepare=prepare)
+            # dict_row liefert bereits echte Dicts → keine Kopie nötig
+            return cur.fetchall()
 
 
-def clean_contact_field(value: str | None) -> str | None:
+def _contact_col(col: str) -> str:
     """
-    Entfernt Markdown-Reste wie '(...utm_source=openai)' aus Telefon/E-Mail/URL.
+    SQL-Ausdruck, der Markdown-Reste wie '(...utm_source=openai)' aus
+    Telefon/E-Mail/URL schon in der DB abschneidet (leer → NULL).
     """
-    if not value:
-        return None
-    return value.split("(")[0].strip()
+    return f"NULLIF(TRIM(split_part({col}, '(', 1)), '') AS {col}"
+
+
+# Freie Plätze direkt in SQL berechnen (Spalten können leer/Text sein)
+def _int_col(col: str) -> str:
+    return f"COALESCE(NULLIF(trim({col}::text), ''), '0')::int"
+
+
+FREE_PLACES_EXPR = (
+    f"GREATEST({_int_col('capacity_estimate')} - {_int_col('current_occupancy')}"
+    f" - {_int_col('pre_registrations')}, 0)"
+)
 
 
 # ---------------------------------------------------------
 # Einrichtungen nach Ort
 # ---------------------------------------------------------
+FACILITY_COLUMNS = f"""
+                kennzahl,
+                name,
+                ort,
+                plz,
+                {_contact_col("telefon")},
+                {_contact_col("email")},
+                {_contact_col("weburl")},
+                {FREE_PLACES_EXPR} AS free_places"""
+
+
+# Ein Statement für PLZ- und Ortssuche → ein vorbereiteter Plan für beide Fälle.
+# Der jeweils inaktive Zweig fällt über "%(plz)s IS [NOT] NULL" weg; der
+# Ortszweig nutzt lower(ort) → Trigram-Index, siehe backend/sql/.
+# %(plz)s ist immer None oder eine vierstellige PLZ (siehe
+# get_facilities_by_query), der ::int-Cast kann also nicht überlaufen.
+FACILITIES_BY_QUERY_SQL = f"""
+    SELECT {FACILITY_COLUMNS}
+    FROM public."KBBEs"
+    WHERE (%(plz)s::int IS NOT NULL AND plz = %(plz)s::int)
+       OR (
+            %(plz)s::int IS NULL
+            AND (lower(ort) = lower(%(q)s::text) OR lower(ort) LIKE lower(%(like)s::text))
+       )
+    ORDER BY ort, name
+"""
+
+
 def get_facilities_by_query(query: str) -> List[Dict[str, Any]]:
     """
     Sucht Einrichtungen nach Ortsname ODER PLZ.
 
-    - Wenn query nur aus Ziffern besteht → als PLZ interpretieren (Spalte plz).
-    - Sonst → fuzzy-Ortsname: exakter Match ODER Ort ILIKE %query%.
+    - Wenn query aus genau vier Ziffern besteht → als PLZ interpretieren (Spalte plz).
+    - Andere reine Ziffernfolgen (z. B. Telefonnummern) → keine Treffer.
+    - Sonst → fuzzy-Ortsname: exakter Match ODER lower(Ort) LIKE %query%.
     """
     q = (query or "").strip()
     if not q:
         return []
 
-    rows: List[Dict[str, Any]] = []
+    # Nur Ziffern → PLZ-Suche, sonst Ortsname
+    digits = q.replace(" ", "")
+    if digits.isdigit():
+        # österreichische PLZ sind vierstellig; längere Ziffernfolgen würden
+        # beim ::int-Cast in Postgres überlaufen und können ohnehin nicht passen
+        if len(digits) != 4:
+            return []
+        plz = int(digits)
+    else:
+        plz = None
 
-    # Nur Ziffern → PLZ-Suche
-    if q.replace(" ", "").isdigit():
-        sql = """
-            SELECT
-                kennzahl,
-                name,
-                ort,
-                plz,
-                telefon,
-                email,
-                weburl,
-                capacity_estimate,
-                current_occupancy,
-                pre_registrations
-            FROM public."KBBEs"
-            WHERE plz::text = %s
-            ORDER BY ort, name
+    if plz is None:
+        # Unbekannter Ort → ohne DB-Abfrage leer zurückgeben.
+        # Bedingung entspricht dem LIKE %q% im SQL (Teilstring, case-insensitive);
+        # bei LIKE-Wildcards im Suchbegriff wird nicht abgekürzt.
+        ql = q.lower()
+        if "%" not in q and "_" not in q and not any(ql in c.lower() for c in get_known_cities()):
+            return []
+
+    params = {"plz": plz, "q": q, "like": f"%{q}%"}
+    return query_db(FACILITIES_BY_QUERY_SQL, params)
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def get_facilities_by_query_cached(query: str) -> List[Dict[str, Any]]:
+    """
+    Gecachte Variante von get_facilities_by_query für Reruns/Chat-Turns.
+    Wird nach Schreibzugriffen (Vormerkung, Reset) per .clear() invalidiert.
+    """
+    return get_facilities_by_query(query)
+
+
+@st.cache_resource(show_spinner=False)
+def get_known_cities() -> frozenset:
+    """
+    Alle Orte aus der Datenbank, einmal pro Prozess geladen.
+    Dient als Ortsverzeichnis, um Städte/Gemeinden in Nutzerfragen zu erkennen
+    und Suchen nach unbekannten Orten ohne DB-Abfrage zu beantworten.
+    Nach Änderungen an den Orten mit get_known_cities.clear() neu laden.
+    """
+    rows = query_db(
         """
-        rows = query_db(sql, (q,))
-    else:
-        # Ortsname → exakter Match ODER fuzzy via ILIKE %q%
-        like = f"%{q}%"
-        sql = """
-            SELECT
-                kennzahl,
-                name,
-                ort,
-                plz,
-                telefon,
-                email,
-                weburl,
-                capacity_estimate,
-                current_occupancy,
-                pre_registrations
-            FROM public."KBBEs"
-            WHERE lower(ort) = lower(%s)
-               OR ort ILIKE %s
-            ORDER BY ort, name
+        SELECT DISTINCT ort
+        FROM public."KBBEs"
+        WHERE ort IS NOT NULL
         """
-        rows = query_db(sql, (q, like))
-
-    # Kontakte säubern
-    for r in rows:
-        r["telefon"] = clean_contact_field(r.get("telefon"))
-        r["email"] = clean_contact_field(r.get("email"))
-        r["weburl"] = clean_contact_field(r.get("weburl"))
+    )
+    return frozenset(r["ort"].strip() for r in rows if r["ort"] and r["ort"].strip())
+
+
+def _format_facility_line(r: Dict[str, Any]) -> str:
+    """Eine Listenzeile: Name, Kontakt und (falls Kennzahl vorhanden) freie Plätze."""
+    contact = " | ".join(
+        part
+        for part in (
+            f"Tel.: {r['telefon']}" if r.get("telefon") else None,
+            f"E-Mail: {r['email']}" if r.get("email") else None,
+            f"Web: {r['weburl']}" if r.get("weburl") else None,
+        )
+        if part
+    )
+    contact_tail = f" — {contact}" if contact else ""
+
+    # freie Plätze ergänzen (von get_facilities_by_query mitgeliefert)
+    if r.get("kennzahl") is None:
+        free_tail = ""
+    else:
+        free = r.get("free_places")
+        if free is None:
+            free_tail = " — keine Angaben zu freien Plätzen vorhanden."
+        elif free > 0:
+            free_tail = f" — nach aktuellen Daten ca. {free} Plätze frei."
+        else:
+            free_tail = " — nach aktuellen Daten derzeit keine Plätze frei."
 
-    return rows
+    return f"- **{r['name']}**{contact_tail}{free_tail}"
 
 
 def format_facilities(rows: List[Dict[str, Any]], city: str) -> str:
@@ -104,88 +197,94 @@ def format_facilities(rows: List[Dict[str, Any]], city: str) -> str:
     if not rows:
         return f"Ich habe in der Datenbank keine Kinderbetreuungseinrichtungen in {city} gefunden."
 
-    lines = [f"Ich habe folgende Kinderbetreuungseinrichtungen in {city} gefunden:\n"]
-    for r in rows:
-        line = f"- **{r['name']}**"
-        contact_parts = []
-        if r.get("telefon"):
-            contact_parts.append(f"Tel.: {r['telefon']}")
-        if r.get("email"):
-            contact_parts.append(f"E-Mail: {r['email']}")
-        if r.get("weburl"):
-            contact_parts.append(f"Web: {r['weburl']}")
-        if contact_parts:
-            line += " — " + " | ".join(contact_parts)
-
-        # freie Plätze aus der DB ergänzen
-        kennzahl = r.get("kennzahl")
-        if kennzahl is not None:
-            free = get_free_places(int(kennzahl))
-            if free is None:
-                line += " — keine Angaben zu freien Plätzen vorhanden."
-            elif free > 0:
-                line += f" — nach aktuellen Daten ca. {free} Plätze frei."
-            else:
-                line += " — nach aktuellen Daten derzeit keine Plätze frei."
-
-        lines.append(line)
-
-    return "\n".join(lines)
+    header = f"Ich habe folgende Kinderbetreuungseinrichtungen in {city} gefunden:\n"
+    # eine Zeile pro Einrichtung als ein String, ein einziges join am Ende
+    return "\n".join([header, *map(_format_facility_line, rows)])
 
 
 # ---------------------------------------------------------
 # Kapazität & Vormerkung
 # ---------------------------------------------------------
+FREE_PLACES_SQL = f"""
+    SELECT capacity_estimate, current_occupancy, pre_registrations,
+           {FREE_PLACES_EXPR} AS free_places
+    FROM public."KBBEs"
+    WHERE kennzahl = %s
+"""
+
+
 def get_free_places(kennzahl: int) -> Optional[int]:
-    sql = """
-        SELECT capacity_estimate, current_occupancy, pre_registrations
+    """Freie Plätze einer Einrichtung – in SQL berechnet (FREE_PLACES_SQL)."""
+    rows = query_db(FREE_PLACES_SQL, (kennzahl,))
+    return rows[0]["free_places"] if rows else None
+
+
+def get_free_places_bulk(kennzahlen: List[int]) -> Dict[int, Optional[int]]:
+    """
+    Ermittelt die freien Plätze mehrerer Einrichtungen mit einer einzigen Abfrage.
+    Kennzahlen ohne DB-Eintrag werden auf None gemappt.
+    """
+    if not kennzahlen:
+        return {}
+
+    sql = f"""
+        SELECT kennzahl, {FREE_PLACES_EXPR} AS free_places
         FROM public."KBBEs"
-        WHERE kennzahl = %s
+        WHERE kennzahl = ANY(%s)
     """
-    rows = query_db(sql, (kennzahl,))
-    if not rows:
-        return None
+    rows = query_db(sql, (list(kennzahlen),))
 
-    r = rows[0]
+    free_by_kennzahl: Dict[int, Optional[int]] = {k: None for k in kennzahlen}
+    for r in rows:
+        free_by_kennzahl[int(r["kennzahl"])] = r["free_places"]
 
-    def to_int(x) -> int:
-        if x is None:
-            return 0
-        if isinstance(x, str):
-            x = x.strip()
-            if x == "":
-                return 0
-        return int(x)
+    return free_by_kennzahl
 
-    cap = to_int(r.get("capacity_estimate"))
-    occ = to_int(r.get("current_occupancy"))
-    pre = to_int(r.get("pre_registrations"))
 
-    free_places = cap - occ - pre
-    return max(free_places, 0)
+def check_free_places_with_name(kennzahl: int) -> Optional[Dict[str, Any]]:
+    """
+    Name und freie Plätze einer Einrichtung in einer einzigen Abfrage.
+    Gibt {"name": ..., "free": ...} zurück oder None, wenn es die Kennzahl nicht gibt.
+    """
+    sql = f"""
+        SELECT name, {FREE_PLACES_EXPR} AS free
+        FROM public."KBBEs"
+        WHERE kennzahl = %s
+    """
+    rows = query_db(sql, (kennzahl,))
+    return rows[0] if rows else None
 
 
-def reserve_place(
+def reserve_place_returning(
     kennzahl: int,
     parent_name: str,
     parent_email: str,
     child_name: str,
-) -> bool:
-    free = get_free_places(kennzahl)
-    if free is None or free <= 0:
-        return False
+) -> Optional[Dict[str, Any]]:
+    """
+    Vormerkung mit einem bedingten UPDATE ... RETURNING statt Lesen + Schreiben.
+    Der Zähler wird nur erhöht, wenn noch Plätze frei sind; im selben
+    Transaktionsschritt werden die Details gespeichert.
 
-    with psycopg.connect(DB_URL) as conn:
+    Gibt {"name": ..., "free": ...} (freie Plätze nach der Vormerkung) zurück
+    oder None, wenn nichts frei ist bzw. die Einrichtung nicht existiert.
+    """
+    with get_pool().connection() as conn:
         with conn.cursor() as cur:
-            # 1) Zähler in KBBEs hochsetzen
+            # 1) Zähler in KBBEs hochsetzen – nur wenn noch Plätze frei sind
             cur.execute(
-                """
+                f"""
                 UPDATE public."KBBEs"
                 SET pre_registrations = COALESCE(pre_registrations, 0) + 1
                 WHERE kennzahl = %s
+                  AND {FREE_PLACES_EXPR} > 0
+                RETURNING name, {FREE_PLACES_EXPR} AS free
                 """,
                 (kennzahl,),
             )
+            row = cur.fetchone()
+            if row is None:
+                return None
 
             # 2) Details der Vormerkung in eigener Tabelle in Supabase speichern
             cur.execute(
@@ -199,10 +298,42 @@ def reserve_place(
 
         conn.commit()
 
-    return True
+    # freie Plätze haben sich geändert → gecachte Einrichtungslisten verwerfen
+    get_facilities_by_query_cached.clear()
+    return dict(row)
 
 
-def get_facility_by_kennzahl(kennzahl: int) -> Optional[Dict[str, Any]]:
+def reserve_place(
+    kennzahl: int,
+    parent_name: str,
+    parent_email: str,
+    child_name: str,
+) -> bool:
+    """
+    Merkt ein Kind vor. Prüfen und Hochzählen passieren atomar in einem
+    bedingten UPDATE (siehe reserve_place_returning) – kein Lesen vorab,
+    keine Race Condition bei gleichzeitigen Vormerkungen.
+    """
+    return reserve_place_returning(kennzahl, parent_name, parent_email, child_name) is not None
+
+
+def reserve_place_and_count(
+    kennzahl: int,
+    parent_name: str,
+    parent_email: str,
+    child_name: str,
+) -> Optional[int]:
+    """
+    Merkt ein Kind vor und liefert die freien Plätze danach – ein einziger
+    Roundtrip statt get_free_places vorher/nachher. None, wenn nichts frei ist
+    bzw. die Einrichtung nicht existiert.
+    """
+    row = reserve_place_returning(kennzahl, parent_name, parent_email, child_name)
+    return row["free"] if row is not None else None
+
+
+def _load_facility_meta(kennzahl: int) -> Optional[Dict[str, Any]]:
+    """Stammdaten einer Einrichtung direkt aus der DB (None, wenn unbekannt)."""
     sql = """
         SELECT
             kennzahl,
@@ -210,16 +341,48 @@ def get_facility_by_kennzahl(kennzahl: int) -> Optional[Dict[str, Any]]:
             ort,
             telefon,
             email,
-            weburl,
-            capacity_estimate,
-            current_occupancy,
-            pre_registrations
+            weburl
         FROM public."KBBEs"
         WHERE kennzahl = %s
     """
     rows = query_db(sql, (kennzahl,))
     return rows[0] if rows else None
 
+
+@lru_cache(maxsize=2048)
+def _cached_facility_meta(kennzahl: int) -> Dict[str, Any]:
+    # lru_cache speichert keine Exceptions → unbekannte Kennzahlen werden
+    # nicht gecacht und beim nächsten Aufruf erneut abgefragt
+    meta = _load_facility_meta(kennzahl)
+    if meta is None:
+        raise LookupError(kennzahl)
+    return meta
+
+
+def _facility_meta(kennzahl: int) -> Optional[Dict[str, Any]]:
+    """
+    Stammdaten einer Einrichtung (ändern sich im Betrieb nicht) – pro Prozess gecacht.
+    Nur Treffer werden gecacht; später angelegte Einrichtungen werden gefunden.
+    Nicht verändern: das Dict wird zwischen Aufrufen geteilt.
+    """
+    try:
+        return _cached_facility_meta(kennzahl)
+    except LookupError:
+        return None
+
+
+def get_facility_by_kennzahl(kennzahl: int) -> Optional[Dict[str, Any]]:
+    meta = _facility_meta(kennzahl)
+    if meta is None:
+        return None
+
+    # Kapazitätsspalten ändern sich mit jeder Vormerkung → immer live lesen
+    rows = query_db(FREE_PLACES_SQL, (kennzahl,))
+    if not rows:
+        return None
+    return {**meta, **rows[0]}
+
+
 def reset_pre_registrations(city: Optional[str] = None) -> None:
     """
     Setzt pre_registrations entweder:
@@ -228,7 +391,7 @@ def reset_pre_registrations(city: Optional[str] = None) -> None:
     wieder auf 0.
     Nur für Test-/Demo-Zwecke gedacht.
     """
-    with psycopg.connect(DB_URL) as conn:
+    with get_pool().connection() as conn:
         with conn.cursor() as cur:
             if city:
                 cur.execute(
@@ -246,4 +409,6 @@ def reset_pre_registrations(city: Optional[str] = None) -> None:
                     SET pre_registrations = 0
                     """
                 )
-        conn.commit()
\ No newline at end of file
+        conn.commit()
+
+    get_facilities_by_query_cached.clear()
\ No newline at end of file
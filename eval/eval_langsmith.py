@@ -92,17 +92,18 @@ def target(inputs: Dict[str, Any]) -> Dict[str, str]:
 from openevals.llm import create_llm_as_judge
 from openevals.prompts import CORRECTNESS_PROMPT
 
+# Judge einmal erstellen und von allen (parallelen) Evaluator-Aufrufen nutzen
+_correctness_judge = create_llm_as_judge(
+    prompt=CORRECTNESS_PROMPT,
+    model="gpt-4o-mini",   # billig & gut für Bewertung
+    feedback_key="correctness",
+)
+
 def correctness_evaluator(inputs: Dict, outputs: Dict, reference_outputs: Dict):
     """
     Prüft: Wie gut deckt die Antwort die erwarteten Punkte ab?
     """
-    evaluator = create_llm_as_judge(
-        prompt=CORRECTNESS_PROMPT,
-        model="gpt-4o-mini",   # billig & gut für Bewertung
-        feedback_key="correctness",
-    )
-
-    return evaluator(
+    return _correctness_judge(
         inputs=inputs,
         outputs=outputs,
         reference_outputs=reference_outputs
@@ -115,6 +116,7 @@ results = client.evaluate(
     data=DATASET_NAME,
     evaluators=[correctness_evaluator],
     experiment_prefix="eval-run-",
+    max_concurrency=8,   # Beispiele parallel durch Agent + Judge schicken
 )
 
 print("Experiment gestartet. Ergebnisse in LangSmith sichtbar.")
@@ -1,7 +1,7 @@
 """
 LangSmith Evaluation Script für den Kinderbetreuungs-Chatbot (LEO).
 
-- Lädt API Keys aus .streamlit/secrets.toml
+- Lädt API Keys aus .streamlit/secrets.toml (per tomllib, ohne st.secrets)
 - Erstellt oder verwendet ein LangSmith-Dataset
 - Definiert den Chatbot als Target für die Evaluierung
 - Führt mehrere LLM-as-a-Judge Evaluatoren aus:
@@ -10,20 +10,30 @@ LangSmith Evaluation Script für den Kinderbetreuungs-Chatbot (LEO).
   - faithfulness
   - inconclusive_behavior
 
+Optional (Flag --batch oder EVAL_BATCH=1): Die Judges laufen gesammelt über
+die OpenAI Batch API (ein Job pro Metrik, ~50 % günstiger); die Scores werden
+danach als Feedback an die Runs in LangSmith gehängt.
+
 WICHTIG: Alle Evaluatoren geben Scores im Bereich 0.0–1.0 zurück,
 damit sie mit der LangSmith-Feedback-Konfiguration kompatibel sind.
 """
 
+import hashlib
+import io
+import json
 import os
+import pickle
 import sys
-from typing import Dict, Any, List
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Optional, Tuple
 
-import streamlit as st
+import numpy as np
 from langsmith import Client
 from langsmith.utils import LangSmithConflictError
 
-from openevals.llm import create_llm_as_judge
-
 # ---------------------------------------------------------------------------
 # Projektstruktur & Agent-Import
 # ---------------------------------------------------------------------------
@@ -34,6 +44,8 @@ if PROJECT_ROOT not in sys.path:
     sys.path.append(PROJECT_ROOT)
 
 from backend.agent import run_agent  # type: ignore
+from backend.config import get_secret  # type: ignore
+from backend.openai_client import client as openai_client  # type: ignore
 
 
 # ---------------------------------------------------------------------------
@@ -44,7 +56,7 @@ from backend.agent import run_agent  # type: ignore
 DATASET_NAME = "kinderbetreuung-eval-rag-bucket"
 # DATASET_NAME = "kinderbetreuung-eval-web-bucket"
 
-examples: List[Dict[str, Any]] = [
+EXAMPLES: Tuple[Mapping[str, Any], ...] = tuple(MappingProxyType(e) for e in (
     {
         "inputs": {
             "question": "Wer hat den Oö. Sozialratgeber 2025 herausgegeben?"
@@ -77,12 +89,12 @@ examples: List[Dict[str, Any]] = [
             "expected": "Die Antwort soll darauf eingehen, dass der Sozialratgeber Informationen zu Kinderbetreuungsangeboten, Zuständigkeiten und Anlaufstellen in Oberösterreich enthält und diese im Kontext des gesamten sozialen Versorgungssystems einordnet."
         },
     },
-]
+))
 
 
 
 
-# examples: List[Dict[str, Any]] = [
+# EXAMPLES: List[Dict[str, Any]] = [
 #     {
 #         "inputs": {"question": "Wie melde ich mein Kind im Kindergarten Linz an?"},
 #         "outputs": {
@@ -108,9 +120,9 @@ examples: List[Dict[str, Any]] = [
 # Secrets & Environment Variablen
 # ---------------------------------------------------------------------------
 
-OPENAI_KEY = st.secrets["OPENAI_API_KEY"]
-LANGSMITH_KEY = st.secrets["LANGCHAIN_API_KEY"]
-LANGSMITH_PROJECT = st.secrets.get("LANGCHAIN_PROJECT", "Kinderbetreuung-Chatbot")
+OPENAI_KEY = get_secret("OPENAI_API_KEY")
+LANGSMITH_KEY = get_secret("LANGCHAIN_API_KEY")
+LANGSMITH_PROJECT = get_secret("LANGCHAIN_PROJECT", "Kinderbetreuung-Chatbot")
 
 os.environ["OPENAI_API_KEY"] = OPENAI_KEY
 os.environ["LANGCHAIN_API_KEY"] = LANGSMITH_KEY
@@ -124,6 +136,10 @@ os.environ["LANGSMITH_PROJECT"] = LANGSMITH_PROJECT
 os.environ["LANGSMITH_ENDPOINT"] = "https://eu.api.smith.langchain.com"
 
 
+# Beispiele, die gleichzeitig durch den Agenten laufen (I/O-gebunden: LLM/SQL/RAG)
+MAX_CONCURRENCY = 8
+
+
 # ---------------------------------------------------------------------------
 # LangSmith Client & Dataset
 # ---------------------------------------------------------------------------
@@ -131,22 +147,131 @@ os.environ["LANGSMITH_ENDPOINT"] = "https://eu.api.smith.langchain.com"
 client = Client()
 
 
+def _example_hash(inputs: Mapping[str, Any], outputs: Optional[Mapping[str, Any]]) -> str:
+    """Inhalts-Hash eines Beispiels, um Duplikate im Dataset zu erkennen."""
+    payload = json.dumps(
+        {"inputs": dict(inputs), "outputs": dict(outputs or {})},
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
 def ensure_dataset() -> Any:
-    """Erstellt das Dataset in LangSmith oder liest ein bestehendes ein."""
+    """
+    Erstellt das Dataset in LangSmith oder liest ein bestehendes ein.
+    Bei einem bestehenden Dataset werden nur Beispiele hochgeladen, die
+    inhaltlich noch nicht vorhanden sind (sonst kein Upload).
+    """
     try:
         dataset = client.create_dataset(
             dataset_name=DATASET_NAME,
             description="Testset für den Kinderbetreuungs-Chatbot (LEO)",
         )
         print(f"[LangSmith] Dataset neu erstellt: {DATASET_NAME}")
-        client.create_examples(dataset_id=dataset.id, examples=examples)
-        print(f"[LangSmith] {len(examples)} Beispiele zum Dataset hinzugefügt.")
+        missing = list(EXAMPLES)
     except LangSmithConflictError:
         dataset = client.read_dataset(dataset_name=DATASET_NAME)
         print(f"[LangSmith] Bestehendes Dataset verwendet: {DATASET_NAME}")
+        existing = {
+            _example_hash(ex.inputs, ex.outputs)
+            for ex in client.list_examples(dataset_id=dataset.id)
+        }
+        missing = [
+            e for e in EXAMPLES
+            if _example_hash(e["inputs"], e["outputs"]) not in existing
+        ]
+
+    if missing:
+        client.create_examples(
+            dataset_id=dataset.id,
+            examples=[{"inputs": e["inputs"], "outputs": e["outputs"]} for e in missing],
+        )
+        print(f"[LangSmith] {len(missing)} Beispiele zum Dataset hinzugefügt.")
     return dataset
 
 
+# ---------------------------------------------------------------------------
+# Semantischer Cache für Chatbot-Antworten (über Eval-Läufe hinweg)
+# ---------------------------------------------------------------------------
+
+SEMCACHE_PATH = os.path.join(CURRENT_DIR, ".semcache.pkl")
+SEMCACHE_EMBEDDING_MODEL = "text-embedding-3-small"
+SEMCACHE_THRESHOLD = 0.93  # Cosinus-Ähnlichkeit ab der eine Frage als "gleich" gilt
+# EVAL_SEMCACHE=0 → Agent bei jedem Beispiel neu aufrufen (Cache weder lesen noch schreiben)
+SEMCACHE_ENABLED = os.environ.get("EVAL_SEMCACHE", "1") != "0"
+
+_semcache_lock = threading.Lock()
+
+
+def _agent_version() -> str:
+    """
+    Hash über den Quellcode des Agenten (backend/*.py: Prompts, Modelle, Tools).
+    Jede Änderung daran ergibt eine neue Version → alte Antworten werden nicht
+    wiederverwendet und ein veralteter Agent wird nicht bewertet.
+    """
+    h = hashlib.sha256()
+    backend_dir = os.path.join(PROJECT_ROOT, "backend")
+    for name in sorted(os.listdir(backend_dir)):
+        if name.endswith(".py"):
+            h.update(name.encode("utf-8"))
+            with open(os.path.join(backend_dir, name), "rb") as f:
+                h.update(f.read())
+    return h.hexdigest()
+
+
+AGENT_VERSION = _agent_version()
+
+
+def _load_semcache() -> Tuple[np.ndarray, List[str]]:
+    """
+    Lädt (normierte Embeddings, Antworten) von der Platte oder startet leer.
+    Einträge einer anderen Agent-Version werden verworfen.
+    """
+    if SEMCACHE_ENABLED and os.path.exists(SEMCACHE_PATH):
+        with open(SEMCACHE_PATH, "rb") as f:
+            data = pickle.load(f)
+        if data.get("version") == AGENT_VERSION:
+            return data["embeddings"], data["answers"]
+        print("[SemCache] Agent geändert – Cache aus früheren Läufen wird verworfen.")
+    return np.empty((0, 0), dtype=np.float32), []
+
+
+_sem_embeddings, _sem_answers = _load_semcache()
+
+
+def _embed(text: str) -> np.ndarray:
+    emb = openai_client.embeddings.create(model=SEMCACHE_EMBEDDING_MODEL, input=text).data[0].embedding
+    vec = np.asarray(emb, dtype=np.float32)
+    return vec / np.linalg.norm(vec)
+
+
+def _semcache_lookup(vec: np.ndarray) -> Optional[str]:
+    with _semcache_lock:
+        if not _sem_answers:
+            return None
+        sims = _sem_embeddings @ vec
+        best = int(np.argmax(sims))
+        if sims[best] >= SEMCACHE_THRESHOLD:
+            return _sem_answers[best]
+    return None
+
+
+def _semcache_store(vec: np.ndarray, answer: str) -> None:
+    global _sem_embeddings
+    with _semcache_lock:
+        if _sem_answers:
+            _sem_embeddings = np.vstack([_sem_embeddings, vec])
+        else:
+            _sem_embeddings = vec[np.newaxis, :]
+        _sem_answers.append(answer)
+        with open(SEMCACHE_PATH, "wb") as f:
+            pickle.dump(
+                {"version": AGENT_VERSION, "embeddings": _sem_embeddings, "answers": _sem_answers},
+                f,
+            )
+
+
 # ---------------------------------------------------------------------------
 # Target: Chatbot-Funktion für LangSmith
 # ---------------------------------------------------------------------------
@@ -155,11 +280,25 @@ def target(inputs: Dict[str, Any]) -> Dict[str, str]:
     """
     Wird von LangSmith für jedes Beispiel aufgerufen.
     inputs entspricht dem 'inputs'-Dict aus dem Dataset, z.B. {"question": "..."}.
+
+    Semantisch (nahezu) gleiche Fragen aus früheren Läufen derselben
+    Agent-Version werden aus dem Cache (eval/.semcache.pkl) beantwortet, statt
+    den Agenten erneut aufzurufen. Abschalten mit EVAL_SEMCACHE=0.
     """
 
     question = inputs.get("question", "")
+    if not SEMCACHE_ENABLED:
+        return {"answer": run_agent([{"role": "user", "content": question}])}
+
+    vec = _embed(question)
+
+    cached = _semcache_lookup(vec)
+    if cached is not None:
+        return {"answer": cached}
+
     messages = [{"role": "user", "content": question}]
     answer = run_agent(messages)
+    _semcache_store(vec, answer)
 
     # Optional: später contexts ergänzen (answer, contexts = run_agent(...))
     return {"answer": answer}
@@ -169,6 +308,12 @@ def target(inputs: Dict[str, Any]) -> Dict[str, str]:
 # LLM-as-a-Judge Prompts (Skala 0.0–1.0)
 # ---------------------------------------------------------------------------
 
+# Aufbau: statische Anweisungen + Bewertungsskala zuerst, die variablen Teile
+# ({inputs}, {outputs}, {reference_outputs}) ganz am Ende. So bleibt das Präfix
+# über alle Judge-Aufrufe identisch und kann vom Prompt-Cache des Anbieters
+# wiederverwendet werden. Literale Klammern im JSON-Beispiel sind für
+# str.format verdoppelt.
+
 CORRECTNESS_PROMPT = """
 Du bist ein sachlicher Gutachter.
 
@@ -177,6 +322,15 @@ Du erhältst:
 - outputs: die Antwort des Chatbots,
 - reference_outputs: eine Referenzbeschreibung, was inhaltlich erwartet wird.
 
+Bewerte auf einer Skala von 0.0 bis 1.0, wie gut die Antwort des Chatbots die
+Referenz inhaltlich trifft.
+
+0.0 = Antwort verfehlt den Kern weitgehend oder ist falsch.
+0.5 = Antwort trifft Teile der Referenz, lässt aber Wichtiges aus.
+1.0 = Antwort deckt die Referenz inhaltlich sehr gut ab.
+
+Antworte NUR als JSON: {{"score": <Zahl zwischen 0.0 und 1.0>}} (z.B. {{"score": 0.7}}).
+
 inputs:
 {inputs}
 
@@ -185,15 +339,6 @@ outputs:
 
 reference_outputs:
 {reference_outputs}
-
-Bewerte auf einer Skala von 0.0 bis 1.0, wie gut die Antwort des Chatbots die
-Referenz inhaltlich trifft.
-
-0.0 = Antwort verfehlt den Kern weitgehend oder ist falsch.
-0.5 = Antwort trifft Teile der Referenz, lässt aber Wichtiges aus.
-1.0 = Antwort deckt die Referenz inhaltlich sehr gut ab.
-
-Gib NUR eine Zahl zwischen 0.0 und 1.0 aus (z.B. 0.0, 0.4, 0.7, 1.0).
 """
 
 CONTEXT_RELEVANCE_PROMPT = """
@@ -203,12 +348,6 @@ Du erhältst:
 - inputs: die Nutzereingabe (z.B. Frage),
 - outputs: die vom System erzeugten Inhalte (z.B. Antwort oder Kontexte).
 
-inputs:
-{inputs}
-
-outputs:
-{outputs}
-
 Bewerte auf einer Skala von 0.0 bis 1.0, wie relevant outputs für die Beantwortung
 von inputs ist.
 
@@ -216,7 +355,13 @@ von inputs ist.
 0.5 = teils relevant, teils irrelevant,
 1.0 = sehr relevant und direkt hilfreich.
 
-Gib NUR eine Zahl zwischen 0.0 und 1.0 aus.
+Antworte NUR als JSON: {{"score": <Zahl zwischen 0.0 und 1.0>}}.
+
+inputs:
+{inputs}
+
+outputs:
+{outputs}
 """
 
 FAITHFULNESS_PROMPT = """
@@ -227,6 +372,15 @@ Du erhältst:
 - outputs: die Antwort des Chatbots,
 - reference_outputs: zusätzliche Informationen (z.B. Referenztexte oder Kontext).
 
+Bewerte auf einer Skala von 0.0 bis 1.0, wie gut die Antwort durch reference_outputs
+gestützt ist.
+
+0.0 = größtenteils nicht gedeckt / wirkt halluziniert,
+0.5 = teilweise gedeckt, aber mit Lücken oder spekulativen Anteilen,
+1.0 = vollständig gedeckt, keine offensichtlichen Halluzinationen.
+
+Antworte NUR als JSON: {{"score": <Zahl zwischen 0.0 und 1.0>}}.
+
 inputs (Frage):
 {inputs}
 
@@ -235,15 +389,6 @@ outputs (Antwort des Chatbots):
 
 reference_outputs (Kontext oder Referenz):
 {reference_outputs}
-
-Bewerte auf einer Skala von 0.0 bis 1.0, wie gut die Antwort durch reference_outputs
-gestützt ist.
-
-0.0 = größtenteils nicht gedeckt / wirkt halluziniert,
-0.5 = teilweise gedeckt, aber mit Lücken oder spekulativen Anteilen,
-1.0 = vollständig gedeckt, keine offensichtlichen Halluzinationen.
-
-Gib NUR eine Zahl zwischen 0.0 und 1.0 aus.
 """
 
 INCONCLUSIVE_PROMPT = """
@@ -254,6 +399,15 @@ Du erhältst:
 - outputs: die Antwort des Chatbots,
 - reference_outputs: eine Beschreibung, was im Idealfall passieren soll.
 
+Bewerte auf einer Skala von 0.0 bis 1.0:
+
+1.0 = Der Chatbot erklärt nachvollziehbar, dass keine ausreichenden Informationen
+      vorliegen (oder verweist korrekt auf fehlende Zuständigkeit), und spekuliert nicht.
+0.0 = Der Chatbot erfindet offensichtlich Inhalte oder gibt eine scheinbar
+      selbstbewusste Antwort, obwohl klar ist, dass die Informationen nicht vorliegen.
+
+Antworte NUR als JSON: {{"score": <Zahl zwischen 0.0 und 1.0>}}.
+
 inputs (Frage):
 {inputs}
 
@@ -262,77 +416,231 @@ outputs (Antwort des Chatbots):
 
 reference_outputs (Erwartung):
 {reference_outputs}
+"""
 
-Bewerte auf einer Skala von 0.0 bis 1.0:
 
-1.0 = Der Chatbot erklärt nachvollziehbar, dass keine ausreichenden Informationen
-      vorliegen (oder verweist korrekt auf fehlende Zuständigkeit), und spekuliert nicht.
-0.0 = Der Chatbot erfindet offensichtlich Inhalte oder gibt eine scheinbar
-      selbstbewusste Antwort, obwohl klar ist, dass die Informationen nicht vorliegen.
+# ---------------------------------------------------------------------------
+# Judges: strukturierte Ausgabe ({"score": float}) statt Freitext
+# ---------------------------------------------------------------------------
+
+# Judge-Modell per Umgebung austauschbar (z.B. JUDGE_MODEL=gpt-4.1-nano),
+# vor einem Wechsel des Defaults gegen gpt-4o-mini auf dem Dataset vergleichen
+JUDGE_MODEL = os.environ.get("JUDGE_MODEL", "gpt-4o-mini")
+# '{"score": 0.85}' braucht bereits ~9 Tokens → Luft lassen, sonst wird abgeschnitten
+JUDGE_MAX_TOKENS = 20
+
+# Deterministisches Sampling für reproduzierbare Scores zwischen Läufen
+JUDGE_SAMPLING = {"temperature": 0, "top_p": 1, "seed": 7}
+
+# Minimales Schema: das Modell liefert genau ein Objekt mit "score",
+# das sich mit einem json.loads lesen lässt
+JUDGE_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "score",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {"score": {"type": "number"}},
+            "required": ["score"],
+            "additionalProperties": False,
+        },
+    },
+}
 
-Gib NUR eine Zahl zwischen 0.0 und 1.0 aus.
-"""
 
+def _parse_score(text: Optional[str]) -> Optional[float]:
+    """
+    Score aus der JSON-Antwort des Judges, auf 0.0–1.0 begrenzt.
+    None bei abgeschnittener/unlesbarer Antwort – ein Judge-Fehler ist kein 0.0.
+    """
+    try:
+        score = float(json.loads(text)["score"])
+    except (TypeError, ValueError, KeyError):
+        return None
+    return min(max(score, 0.0), 1.0)
 
-evaluator_correctness = create_llm_as_judge(
-    prompt=CORRECTNESS_PROMPT,
-    model="gpt-4o-mini",
-    feedback_key="correctness",
-)
 
-evaluator_context_relevance = create_llm_as_judge(
-    prompt=CONTEXT_RELEVANCE_PROMPT,
-    model="gpt-4o-mini",
-    feedback_key="context_relevance",
-)
+def _make_judge(key: str, prompt: str):
+    """
+    Baut einen Judge für eine Metrik: Prompt füllen, ein Chat-Completion-Aufruf
+    mit JSON-Schema und wenigen Output-Tokens, Score lokal parsen.
+    Liefert das gleiche Feedback-Format wie openevals ({"key", "score", "comment"}).
+    """
 
-evaluator_faithfulness = create_llm_as_judge(
-    prompt=FAITHFULNESS_PROMPT,
-    model="gpt-4o-mini",
-    feedback_key="faithfulness",
-)
+    def judge(inputs: Any, outputs: Any, reference_outputs: Any = None) -> Dict[str, Any]:
+        content = prompt.format(
+            inputs=inputs,
+            outputs=outputs,
+            reference_outputs=reference_outputs,
+        )
+        resp = openai_client.chat.completions.create(
+            model=JUDGE_MODEL,
+            messages=[{"role": "user", "content": content}],
+            response_format=JUDGE_RESPONSE_FORMAT,
+            max_tokens=JUDGE_MAX_TOKENS,
+            **JUDGE_SAMPLING,
+        )
+        text = resp.choices[0].message.content
+        score = _parse_score(text)
+        if score is None:
+            raise ValueError(f"Judge-Antwort nicht lesbar: {text!r}")
+        return {"key": key, "score": score, "comment": None}
 
-evaluator_inconclusive = create_llm_as_judge(
-    prompt=INCONCLUSIVE_PROMPT,
-    model="gpt-4o-mini",
-    feedback_key="inconclusive_behavior",
-)
+    return judge
 
 
 # ---------------------------------------------------------------------------
-# Evaluator-Wrapper für LangSmith (run + example)
+# Kombinierter Evaluator: alle Judges pro Beispiel parallel
 # ---------------------------------------------------------------------------
 
-def correctness_evaluator(run, example, langsmith_extra=None):
-    return evaluator_correctness(
-        inputs=example.inputs or {},
-        outputs=run.outputs or {},
-        reference_outputs=example.outputs or {},
-    )
+# (feedback_key, Prompt) – einzige Liste der Metriken, für Live- und Batch-Modus;
+# Reihenfolge = Reihenfolge im Ergebnis
+JUDGE_PROMPTS = [
+    ("correctness", CORRECTNESS_PROMPT),
+    ("context_relevance", CONTEXT_RELEVANCE_PROMPT),
+    ("faithfulness", FAITHFULNESS_PROMPT),
+    ("inconclusive_behavior", INCONCLUSIVE_PROMPT),
+]
+
+# (feedback_key, Judge)
+JUDGES = [(key, _make_judge(key, prompt)) for key, prompt in JUDGE_PROMPTS]
 
+# Die Judge-Aufrufe sind reine API-Roundtrips → Threads reichen
+_judge_pool = ThreadPoolExecutor(max_workers=len(JUDGES) * 4)
 
-def context_relevance_evaluator(run, example, langsmith_extra=None):
-    return evaluator_context_relevance(
+
+def combined_evaluator(run, example, langsmith_extra=None) -> Dict[str, Any]:
+    """
+    Ruft alle vier Judges für ein Beispiel gleichzeitig auf und liefert
+    mehrere Feedbacks auf einmal ({"results": [...]}) an LangSmith zurück.
+    Schlägt ein einzelner Judge fehl, bekommt dessen Feedback keinen Score
+    (nur einen Kommentar), statt das ganze Beispiel abzubrechen oder als
+    schlechteste Bewertung (0.0) in die Auswertung einzugehen.
+    """
+    kwargs = dict(
         inputs=example.inputs or {},
         outputs=run.outputs or {},
         reference_outputs=example.outputs or {},
     )
+    futures = [(key, _judge_pool.submit(judge, **kwargs)) for key, judge in JUDGES]
 
+    results: List[Dict[str, Any]] = []
+    for key, future in futures:
+        try:
+            results.append(future.result())
+        except Exception as exc:
+            print(f"[Eval] Judge '{key}' fehlgeschlagen: {exc}")
+            results.append({"key": key, "score": None, "comment": f"Judge-Fehler: {exc}"})
 
-def faithfulness_evaluator(run, example, langsmith_extra=None):
-    return evaluator_faithfulness(
-        inputs=example.inputs or {},
-        outputs=run.outputs or {},
-        reference_outputs=example.outputs or {},
+    return {"results": results}
+
+
+# ---------------------------------------------------------------------------
+# Batch-Modus: Judges über die OpenAI Batch API
+# ---------------------------------------------------------------------------
+
+USE_BATCH = "--batch" in sys.argv or os.environ.get("EVAL_BATCH") == "1"
+
+BATCH_POLL_SECONDS = 30
+
+
+def _submit_batch(key: str, prompt: str, pairs: List[Tuple[Any, Any]]) -> str:
+    """Schreibt eine JSONL-Datei mit allen Beispielen für eine Metrik und startet den Batch-Job."""
+    lines = []
+    for run, example in pairs:
+        content = prompt.format(
+            inputs=example.inputs or {},
+            outputs=run.outputs or {},
+            reference_outputs=example.outputs or {},
+        )
+        lines.append(
+            json.dumps(
+                {
+                    "custom_id": f"{run.id}__{key}",
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": {
+                        "model": JUDGE_MODEL,
+                        "messages": [{"role": "user", "content": content}],
+                        "response_format": JUDGE_RESPONSE_FORMAT,
+                        "max_tokens": JUDGE_MAX_TOKENS,
+                        **JUDGE_SAMPLING,
+                    },
+                },
+                ensure_ascii=False,
+            )
+        )
+
+    payload = io.BytesIO("\n".join(lines).encode("utf-8"))
+    input_file = openai_client.files.create(file=(f"judge_{key}.jsonl", payload), purpose="batch")
+    batch = openai_client.batches.create(
+        input_file_id=input_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+        metadata={"metric": key, "dataset": DATASET_NAME},
     )
+    print(f"[Batch] Job für '{key}' gestartet: {batch.id} ({len(lines)} Anfragen)")
+    return batch.id
 
 
-def inconclusive_evaluator(run, example, langsmith_extra=None):
-    return evaluator_inconclusive(
-        inputs=example.inputs or {},
-        outputs=run.outputs or {},
-        reference_outputs=example.outputs or {},
+def _wait_for_batch(batch_id: str) -> Any:
+    while True:
+        batch = openai_client.batches.retrieve(batch_id)
+        if batch.status in ("completed", "failed", "expired", "cancelled"):
+            return batch
+        time.sleep(BATCH_POLL_SECONDS)
+
+
+def run_batch_evaluation() -> None:
+    """
+    1) Chatbot-Antworten für alle Beispiele über client.evaluate erzeugen (ohne Judges)
+    2) pro Metrik einen Batch-Job einreichen
+    3) Ergebnisse einsammeln und als Feedback an die Runs hängen
+    """
+    results = client.evaluate(
+        target,
+        data=DATASET_NAME,
+        experiment_prefix="eval-batch-",
+        max_concurrency=MAX_CONCURRENCY,
     )
+    pairs = [(r["run"], r["example"]) for r in results]
+    print(f"[Batch] {len(pairs)} Antworten erzeugt.")
+
+    batch_ids = [_submit_batch(key, prompt, pairs) for key, prompt in JUDGE_PROMPTS]
+
+    for batch_id in batch_ids:
+        batch = _wait_for_batch(batch_id)
+        if batch.status != "completed" or not batch.output_file_id:
+            print(f"[Batch] Job {batch_id} beendet mit Status '{batch.status}' – übersprungen.")
+            continue
+
+        output = openai_client.files.content(batch.output_file_id).text
+        failed = 0
+        for line in output.splitlines():
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            run_id, key = item["custom_id"].rsplit("__", 1)
+            body = (item.get("response") or {}).get("body") or {}
+            choices = body.get("choices") or []
+            text = choices[0]["message"]["content"] if choices else None
+            score = _parse_score(text)
+            if score is None:
+                # fehlgeschlagene/abgeschnittene Anfrage → kein Feedback statt 0.0
+                failed += 1
+                print(f"[Batch] Kein Score für {item['custom_id']}: {item.get('error') or text!r}")
+                continue
+            # trace_id gesetzt → Feedback geht in die Hintergrund-Queue des Clients
+            # und wird gesammelt übertragen statt als einzelner POST pro Score
+            # (die Runs aus client.evaluate sind Root-Runs: trace_id == run_id)
+            client.create_feedback(run_id, key=key, score=score, trace_id=run_id)
+
+        print(f"[Batch] Feedback aus Job {batch_id} eingereiht ({failed} fehlgeschlagen).")
+
+    # Queue leeren, bevor das Skript endet
+    client.flush()
+    print("[Batch] Feedback an LangSmith übertragen.")
 
 
 # ---------------------------------------------------------------------------
@@ -342,18 +650,21 @@ def inconclusive_evaluator(run, example, langsmith_extra=None):
 def main() -> None:
     dataset = ensure_dataset()
 
+    if USE_BATCH:
+        print(f"[LangSmith] Starte Batch-Evaluation auf Dataset: {dataset.name}")
+        run_batch_evaluation()
+        print("[LangSmith] Batch-Evaluation abgeschlossen. Ergebnisse im LangSmith-Dashboard sichtbar.")
+        return
+
     print(f"[LangSmith] Starte Evaluation auf Dataset: {dataset.name}")
 
     _ = client.evaluate(
         target,
         data=DATASET_NAME,
-        evaluators=[
-            correctness_evaluator,
-            context_relevance_evaluator,
-            faithfulness_evaluator,
-            inconclusive_evaluator,
-        ],
+        evaluators=[combined_evaluator],
         experiment_prefix="eval-run-",
+        max_concurrency=MAX_CONCURRENCY,
+        num_repetitions=1,
     )
 
     print("[LangSmith] Evaluation gestartet. Ergebnisse im LangSmith-Dashboard sichtbar.")
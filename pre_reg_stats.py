@@ -1,6 +1,6 @@
 import os
 import sys
-from datetime import datetime, timedelta
+from datetime import datetime
 
 # Projekt-Root in den Suchpfad nehmen
 CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -18,58 +18,66 @@ def summary_last_7_days():
     - Anzahl pro Einrichtung
     - Anzahl pro Ort
     """
-    sql_total = """
-        SELECT COUNT(*) AS total
-        FROM public.pre_registrations
-        WHERE created_at >= now() - interval '7 days'
-    """
-    total = query_db(sql_total)[0]["total"]
-
-    sql_by_facility = """
-        SELECT
-            k.kennzahl,
-            k.name,
-            k.ort,
-            COUNT(p.id) AS pre_reg_count
-        FROM public.pre_registrations p
-        JOIN public."KBBEs" k USING (kennzahl)
-        WHERE p.created_at >= now() - interval '7 days'
-        GROUP BY k.kennzahl, k.name, k.ort
-        ORDER BY pre_reg_count DESC, k.ort, k.name
-    """
-    by_facility = query_db(sql_by_facility)
-
-    sql_by_city = """
+    # Alle drei Aggregationen in einer Abfrage (ein Scan des 7-Tage-Fensters):
+    # GROUPING(...) = 0 markiert, nach welcher Spalte die Zeile gruppiert ist.
+    # LEFT JOIN, damit die Gesamtzahl auch Vormerkungen ohne Eintrag in KBBEs
+    # zählt; "known" trennt diese in den Gruppen pro Einrichtung/Ort ab.
+    sql = """
+        WITH p AS (
+            SELECT p.id, k.kennzahl, k.name, k.ort, k.kennzahl IS NOT NULL AS known
+            FROM public.pre_registrations p
+            LEFT JOIN public."KBBEs" k USING (kennzahl)
+            WHERE p.created_at >= now() - interval '7 days'
+        )
         SELECT
-            k.ort,
-            COUNT(p.id) AS pre_reg_count
-        FROM public.pre_registrations p
-        JOIN public."KBBEs" k USING (kennzahl)
-        WHERE p.created_at >= now() - interval '7 days'
-        GROUP BY k.ort
-        ORDER BY pre_reg_count DESC, k.ort
+            kennzahl,
+            name,
+            ort,
+            known,
+            COUNT(id) AS pre_reg_count,
+            GROUPING(kennzahl) AS g_fac,
+            GROUPING(ort) AS g_city
+        FROM p
+        GROUP BY GROUPING SETS ((known, kennzahl, name, ort), (known, ort), ())
+        ORDER BY pre_reg_count DESC, ort, name
     """
-    by_city = query_db(sql_by_city)
+    rows = query_db(sql)
 
-    print("=== Vormerkungen (letzte 7 Tage) ===")
-    print(f"Gesamtanzahl Vormerkungen: {total}\n")
+    total = 0
+    by_facility = []
+    by_city = []
+    for row in rows:
+        if row["g_fac"] == 0:
+            if row["known"]:
+                by_facility.append(row)
+        elif row["g_city"] == 0:
+            if row["known"]:
+                by_city.append(row)
+        else:
+            total = row["pre_reg_count"]
 
-    print("Top-Einrichtungen (nach Vormerkungen):")
+    # Ausgabe sammeln und mit einem write() ausgeben statt vieler print()-Aufrufe
+    out = [
+        "=== Vormerkungen (letzte 7 Tage) ===",
+        f"Gesamtanzahl Vormerkungen: {total}\n",
+        "Top-Einrichtungen (nach Vormerkungen):",
+    ]
     if not by_facility:
-        print("  Keine Vormerkungen im gewählten Zeitraum.")
+        out.append("  Keine Vormerkungen im gewählten Zeitraum.")
     else:
-        for row in by_facility:
-            print(
-                f"  - {row['name']} (Kennzahl {row['kennzahl']}, {row['ort']}): "
-                f"{row['pre_reg_count']} Vormerkung(en)"
-            )
+        out.extend(
+            f"  - {row['name']} (Kennzahl {row['kennzahl']}, {row['ort']}): "
+            f"{row['pre_reg_count']} Vormerkung(en)"
+            for row in by_facility
+        )
 
-    print("\nVormerkungen nach Ort:")
+    out.append("\nVormerkungen nach Ort:")
     if not by_city:
-        print("  Keine Vormerkungen im gewählten Zeitraum.")
+        out.append("  Keine Vormerkungen im gewählten Zeitraum.")
     else:
-        for row in by_city:
-            print(f"  - {row['ort']}: {row['pre_reg_count']} Vormerkung(en)")
+        out.extend(f"  - {row['ort']}: {row['pre_reg_count']} Vormerkung(en)" for row in by_city)
+
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 def list_recent_pre_regs(limit: int = 20):
@@ -92,19 +100,26 @@ def list_recent_pre_regs(limit: int = 20):
     """
     rows = query_db(sql, (limit,))
 
-    print(f"\n=== Letzte {limit} Vormerkungen ===")
+    out = [f"\n=== Letzte {limit} Vormerkungen ==="]
     if not rows:
-        print("Keine Vormerkungen gefunden.")
-        return
+        out.append("Keine Vormerkungen gefunden.")
+    else:
+        # Zeitstempel-Format einmal festlegen statt isinstance-Prüfung pro Zeile
+        # (created_at ist timestamptz → psycopg liefert datetime)
+        if isinstance(rows[0]["created_at"], datetime):
+            def fmt_ts(ts: datetime) -> str:
+                return ts.strftime("%Y-%m-%d %H:%M")
+        else:
+            fmt_ts = str
 
-    for r in rows:
-        ts = r["created_at"]
-        ts_str = ts.strftime("%Y-%m-%d %H:%M") if isinstance(ts, datetime) else str(ts)
-        print(
-            f"- {ts_str}: {r['child_name']} (Eltern: {r['parent_name']}, {r['parent_email']}) "
+        out.extend(
+            f"- {fmt_ts(r['created_at'])}: {r['child_name']} (Eltern: {r['parent_name']}, {r['parent_email']}) "
             f"→ {r['einrichtungsname']} (Kennzahl {r['kennzahl']}, {r['ort']})"
+            for r in rows
         )
 
+    sys.stdout.write("\n".join(out) + "\n")
+
 
 if __name__ == "__main__":
     summary_last_7_days()
@@ -7,7 +7,7 @@ Dieses Skript:
 - liest das PDF
   "Liste_der_kirchlichen_Kinderbildungs-_und_-betreuungseinrichtungen.pdf"
   aus dem Ordner raw_data/,
-- extrahiert alle Tabellen mit tabula-py,
+- extrahiert alle Tabellen mit pdfplumber (Fallback: tabula-py),
 - parst die Zeilen in ein einheitliches Schema,
 - leitet Einrichtungstyp (art) und Träger (traeger) ab,
 - bereinigt Ortsnamen,
@@ -18,15 +18,22 @@ Dieses Skript:
 from __future__ import annotations
 
 import logging
+import os
+import pickle
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional
 
-import matplotlib.pyplot as plt
-import missingno as msno
+import numpy as np
 import pandas as pd
 import tabula
 
+try:  # schnellere, parallele Extraktion; ohne pdfplumber nur tabula
+    import pdfplumber
+except ImportError:  # pragma: no cover
+    pdfplumber = None
+
 # ---------------------------------------------------------------------------
 # Projektpfade & Konstanten
 # ---------------------------------------------------------------------------
@@ -46,8 +53,64 @@ OUTPUT_CSV = OUTPUT_DIR / "caritas_kinderbetreuung_ooe.csv"
 # ---------------------------------------------------------------------------
 
 
+# pdfplumber-Einstellungen für Tabellen mit Linien (entspricht tabula lattice=True)
+PDFPLUMBER_TABLE_SETTINGS = {
+    "vertical_strategy": "lines",
+    "horizontal_strategy": "lines",
+}
+
+
+def _table_to_frame(rows: List[List[Optional[str]]]) -> pd.DataFrame:
+    """Wandelt eine pdfplumber-Tabelle in einen DataFrame im tabula-Format um.
+
+    Wie bei tabula wird die erste Zeile zur Spaltenüberschrift (dort steht
+    z.B. "Bezirk Braunau"); leere Zellen werden zu None.
+    """
+    cleaned = [[(c.strip() or None) if isinstance(c, str) else c for c in row] for row in rows]
+    header, body = cleaned[0], cleaned[1:]
+    return pd.DataFrame(body, columns=header)
+
+
+def _extract_page_tables(pdf_path: str, page_no: int) -> List[pd.DataFrame]:
+    """Extrahiert alle Tabellen einer Seite (läuft in einem eigenen Prozess)."""
+    with pdfplumber.open(pdf_path) as pdf:
+        tables = pdf.pages[page_no].extract_tables(PDFPLUMBER_TABLE_SETTINGS)
+    return [_table_to_frame(t) for t in tables if t]
+
+
+def _extract_tables_pdfplumber(pdf_path: Path) -> List[pd.DataFrame]:
+    """Seitenweise Extraktion mit pdfplumber, parallel über mehrere Prozesse.
+
+    Die Reihenfolge der Seiten bleibt erhalten (wichtig für die Bezirkszuordnung).
+    """
+    with pdfplumber.open(str(pdf_path)) as pdf:
+        n_pages = len(pdf.pages)
+
+    with ProcessPoolExecutor() as pool:
+        per_page = pool.map(_extract_page_tables, [str(pdf_path)] * n_pages, range(n_pages))
+        return [tbl for page_tables in per_page for tbl in page_tables]
+
+
+def _extract_tables_tabula(pdf_path: Path) -> List[pd.DataFrame]:
+    """Fallback: alle Seiten mit tabula-py (einzelner JVM-Aufruf)."""
+    return tabula.read_pdf(
+        str(pdf_path),
+        pages="all",
+        lattice=True,        # Tabellen mit Linien
+        multiple_tables=True,
+    )
+
+
 def extract_tables_from_pdf(pdf_path: Path) -> List[pd.DataFrame]:
-    """Liest alle Tabellentseiten aus dem PDF mit tabula-py.
+    """Liest alle Tabellentseiten aus dem PDF.
+
+    Standardmäßig mit pdfplumber (Seiten parallel in mehreren Prozessen);
+    tabula-py dient als Fallback, wenn pdfplumber nicht installiert ist
+    oder keine Tabellen findet.
+
+    Das Ergebnis wird als Pickle in OUTPUT_DIR gecacht (Key: mtime + Größe
+    des PDFs), sodass Folgeläufe kein PDF-Parsing mehr brauchen.
+    Mit CARITAS_FORCE_REPARSE=1 wird der Cache ignoriert und neu geschrieben.
 
     Args:
         pdf_path: Pfad zur PDF-Datei.
@@ -63,14 +126,31 @@ def extract_tables_from_pdf(pdf_path: Path) -> List[pd.DataFrame]:
         logging.error(msg)
         raise FileNotFoundError(msg)
 
+    # Cache-Key aus Änderungszeit + Größe: neues/geändertes PDF → neuer Cache
+    stat = pdf_path.stat()
+    cache_path = OUTPUT_DIR / f"pdf_tables_cache_{stat.st_mtime_ns}_{stat.st_size}.pkl"
+    force_reparse = os.environ.get("CARITAS_FORCE_REPARSE") == "1"
+
+    if cache_path.is_file() and not force_reparse:
+        logging.info("Lade Tabellen aus Cache: %s", cache_path)
+        with cache_path.open("rb") as fh:
+            tables: List[pd.DataFrame] = pickle.load(fh)
+        logging.info("Anzahl extrahierter Tabellen: %d", len(tables))
+        return tables
+
     logging.info("Lese Tabellen aus PDF: %s", pdf_path)
-    tables: List[pd.DataFrame] = tabula.read_pdf(
-        str(pdf_path),
-        pages="all",
-        lattice=True,        # Tabellen mit Linien
-        multiple_tables=True,
-    )
+    tables = []
+    if pdfplumber is not None:
+        tables = _extract_tables_pdfplumber(pdf_path)
+    if not tables:
+        logging.info("pdfplumber nicht verfügbar oder ohne Ergebnis – nutze tabula-py.")
+        tables = _extract_tables_tabula(pdf_path)
     logging.info("Anzahl extrahierter Tabellen: %d", len(tables))
+
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    with cache_path.open("wb") as fh:
+        pickle.dump(tables, fh, protocol=pickle.HIGHEST_PROTOCOL)
+    logging.info("Tabellen-Cache gespeichert: %s", cache_path)
     return tables
 
 
@@ -81,7 +161,7 @@ def parse_caritas_tables(tables: List[pd.DataFrame]) -> pd.DataFrame:
     - name, ort, plz, strasse, email, telefon, bezirk
 
     Args:
-        tables: Liste von Tabellen-DataFrames aus tabula.read_pdf.
+        tables: Liste von Tabellen-DataFrames aus extract_tables_from_pdf.
 
     Returns:
         DataFrame mit Rohdaten.
@@ -152,33 +232,59 @@ def parse_caritas_tables(tables: List[pd.DataFrame]) -> pd.DataFrame:
     return df_raw
 
 
-def infer_type(name: str) -> str:
-    """Leitet den Einrichtungstyp aus dem Namen ab."""
-    n = str(name).lower()
-    if "hort" in n:
-        return "hort"
-    if "krabbelstube" in n:
-        return "krabbelstube"
-    if "kindergarten" in n:
-        return "kindergarten"
-    return "unknown"
-
-
-def infer_provider(email: str, name: str) -> str:
-    """Leitet den Träger aus E-Mail-Domain bzw. Name ab."""
-    e = (email or "").lower()
-    n = (name or "").lower()
-    if "caritas-ooe.at" in e:
-        return "Caritas"
-    if "pfarrcaritas-kita.at" in e:
-        return "Pfarrcaritas"
-    if "vffb.or.at" in e:
-        return "VFFB"
-    if "kreuzschwestern" in n or "kreuzschwestern" in e:
-        return "Kreuzschwestern"
-    if "ordens" in n:
-        return "Ordens- bzw. Schulverein"
-    return "Kirchlich (sonst.)"
+def infer_type(names: pd.Series) -> pd.Series:
+    """Leitet den Einrichtungstyp aus dem Namen ab (vektorisiert).
+
+    Args:
+        names: Spalte mit Einrichtungsnamen.
+
+    Returns:
+        Series mit 'hort', 'krabbelstube', 'kindergarten' oder 'unknown'.
+    """
+    n = names.astype(str).str.lower()
+    # Reihenfolge der Bedingungen = Priorität (erster Treffer gewinnt)
+    art = np.select(
+        [
+            n.str.contains("hort", regex=False),
+            n.str.contains("krabbelstube", regex=False),
+            n.str.contains("kindergarten", regex=False),
+        ],
+        ["hort", "krabbelstube", "kindergarten"],
+        default="unknown",
+    )
+    return pd.Series(art, index=names.index)
+
+
+def infer_provider(emails: pd.Series, names: pd.Series) -> pd.Series:
+    """Leitet den Träger aus E-Mail-Domain bzw. Name ab (vektorisiert).
+
+    Args:
+        emails: Spalte mit E-Mail-Adressen (fehlende Werte erlaubt).
+        names: Spalte mit Einrichtungsnamen (fehlende Werte erlaubt).
+
+    Returns:
+        Series mit dem abgeleiteten Träger.
+    """
+    e = emails.fillna("").astype(str).str.lower()
+    n = names.fillna("").astype(str).str.lower()
+    traeger = np.select(
+        [
+            e.str.contains("caritas-ooe.at", regex=False),
+            e.str.contains("pfarrcaritas-kita.at", regex=False),
+            e.str.contains("vffb.or.at", regex=False),
+            n.str.contains("kreuzschwestern", regex=False)
+            | e.str.contains("kreuzschwestern", regex=False),
+            n.str.contains("ordens", regex=False),
+        ],
+        ["Caritas", "Pfarrcaritas", "VFFB", "Kreuzschwestern", "Ordens- bzw. Schulverein"],
+        default="Kirchlich (sonst.)",
+    )
+    return pd.Series(traeger, index=names.index)
+
+
+# Straßen-Schlüsselwörter und Nicht-Buchstaben für clean_city (einmal kompiliert)
+_STREET_TOKEN_RE = re.compile(r"str\.|straße|strasse|weg|gasse|platz")
+_NON_LETTER_RE = re.compile(r"[^a-zäöüß]")
 
 
 def clean_city(city: Optional[str], street: Optional[str]) -> Optional[str]:
@@ -198,10 +304,8 @@ def clean_city(city: Optional[str], street: Optional[str]) -> Optional[str]:
     cut_idx = None
     for i, tok in enumerate(tokens):
         low = tok.lower()
-        if any(
-            key in low for key in ["str.", "straße", "strasse", "weg", "gasse", "platz"]
-        ):
-            stem = re.sub(r"[^a-zäöüß]", "", low).replace("ß", "ss")
+        if _STREET_TOKEN_RE.search(low):
+            stem = _NON_LETTER_RE.sub("", low).replace("ß", "ss")
             if stem and stem in street_lower:
                 cut_idx = i
                 break
@@ -225,11 +329,8 @@ def build_caritas_dataframe(df_raw: pd.DataFrame) -> pd.DataFrame:
     df = df_raw.copy()
 
     # Einrichtungstyp & Träger ableiten
-    df["art"] = df["name"].apply(infer_type)
-    df["traeger"] = df.apply(
-        lambda r: infer_provider(r.get("email", None), r.get("name", None)),
-        axis=1,
-    )
+    df["art"] = infer_type(df["name"])
+    df["traeger"] = infer_provider(df["email"], df["name"])
 
     df_caritas = pd.DataFrame(
         {
@@ -262,18 +363,25 @@ def build_caritas_dataframe(df_raw: pd.DataFrame) -> pd.DataFrame:
         .str.replace("Pfarrcaritashort", "Pfarrcaritas Hort", regex=False)
     )
 
-    # Ortsnamen bereinigen
-    df_caritas["ort"] = df_caritas.apply(
-        lambda r: clean_city(r["ort"], r["strasse"]),
-        axis=1,
-    )
+    # Ortsnamen bereinigen: eine Schleife über die Spaltenlisten statt
+    # apply(axis=1), das pro Zeile eine Series aufbaut
+    df_caritas["ort"] = [
+        clean_city(city, street)
+        for city, street in zip(df_caritas["ort"].tolist(), df_caritas["strasse"].tolist())
+    ]
 
     logging.info("df_caritas: %d Zeilen, %d Spalten", *df_caritas.shape)
     return df_caritas
 
 
-def log_missingness(df: pd.DataFrame, name: str) -> None:
-    """Loggt fehlende Werte (Anzahl und Prozentsatz) und optional eine Matrix."""
+def log_missingness(df: pd.DataFrame, name: str, plot: bool = False) -> None:
+    """Loggt fehlende Werte (Anzahl und Prozentsatz) und optional eine Matrix.
+
+    Args:
+        df: zu analysierender DataFrame.
+        name: Logischer Name (für Logging).
+        plot: Missingno-Matrix anzeigen (lädt matplotlib, blockiert interaktiv).
+    """
     logging.info("Missingness-Analyse für %s", name)
 
     missing_counts = df.isna().sum().sort_values(ascending=False)
@@ -285,8 +393,15 @@ def log_missingness(df: pd.DataFrame, name: str) -> None:
     )
     logging.info("Fehlende Werte (%s):\n%s", name, missing_df)
 
-    # Optional: Missingness-Matrix (kann bei Bedarf auskommentiert werden)
+    if not plot:
+        return
+
+    # Optional: Missingness-Matrix – Imports erst hier, damit normale Läufe
+    # matplotlib gar nicht laden
     try:
+        import matplotlib.pyplot as plt
+        import missingno as msno
+
         msno.matrix(df)
         plt.tight_layout()
         plt.show()
@@ -325,10 +440,18 @@ def main() -> int:
     df_caritas = build_caritas_dataframe(df_raw)
 
     # 4) Deskriptive Missingness-Statistik
-    log_missingness(df_caritas, "df_caritas")
+    # (Matrix-Plot nur mit CARITAS_PLOT=1)
+    log_missingness(df_caritas, "df_caritas", plot=os.environ.get("CARITAS_PLOT") == "1")
 
     # 5) CSV speichern
-    df_caritas.to_csv(OUTPUT_CSV, index=False, encoding="utf-8-sig")
+    # 1 MiB Schreibpuffer: viele kleine Writes von to_csv -> wenige Syscalls
+    with open(OUTPUT_CSV, "wb", buffering=1 << 20) as fh:
+        df_caritas.to_csv(fh, index=False, encoding="utf-8-sig")
+    # Parquet-Kopie: kbbe_merge liest diese bevorzugt (schneller als CSV)
+    try:
+        df_caritas.to_parquet(OUTPUT_CSV.with_suffix(".parquet"), compression="snappy", index=False)
+    except (ImportError, TypeError, ValueError) as exc:
+        logging.warning("Parquet-Kopie für %s nicht geschrieben: %s", "Caritas-Daten", exc)
     logging.info("Caritas-Daten gespeichert unter: %s", OUTPUT_CSV)
 
     return 0
@@ -26,18 +26,22 @@ Dieses Skript:
    und speichert:
    - ogd_enriched.csv
    - optional: Links-Tabelle kbbes_links.csv für Debugging.
+   (jeweils zusätzlich als .parquet zum schnellen Neu-Einlesen)
 """
 
 from __future__ import annotations
 
 import logging
 import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
-from rapidfuzz import fuzz
+import polars as pl
+from rapidfuzz import fuzz, process
 
 # ---------------------------------------------------------------------------
 # Projektpfade & Dateinamen
@@ -57,6 +61,10 @@ OGD_CLEAN = OUTPUT_DIR / "ogd_preprocessed.csv"
 OGD_ENRICHED = OUTPUT_DIR / "ogd_enriched.csv"
 LINKS_PATH = OUTPUT_DIR / "kbbes_links.csv"
 
+# Key-Spalten mit wenigen Ausprägungen → category-Dtype (weniger Speicher,
+# schnelleres Hashing in groupby/merge)
+CATEGORY_COLS: List[str] = ["plz_norm", "ort_norm", "art_norm", "bezirk"]
+
 # Spalten, die aus df_all an den OGD-Datensatz "angeflanscht" werden sollen
 ENRICH_COLS: List[str] = [
     "traeger",
@@ -83,10 +91,18 @@ ENRICH_COLS: List[str] = [
 # Hilfsfunktionen: Laden, Normalisierung
 # ---------------------------------------------------------------------------
 
+# Regex-Muster der Normalisierung – einmal kompiliert, für Skalar- und .str-Pfad
+_WS_RE = re.compile(r"\s+")
+_NON_DIGIT_RE = re.compile(r"\D")
+_SCHEME_RE = re.compile(r"^https?://")
+
 
 def load_csv(path: Path, name: str) -> pd.DataFrame:
     """Lädt ein CSV und wirft bei Nichtvorhandensein einen klaren Fehler.
 
+    Liegt daneben eine mindestens gleich aktuelle Parquet-Datei (gleicher Name,
+    Endung .parquet), wird stattdessen diese gelesen.
+
     Args:
         path: Pfad zur CSV-Datei.
         name: Logischer Name (für Logging).
@@ -94,12 +110,46 @@ def load_csv(path: Path, name: str) -> pd.DataFrame:
     Returns:
         Eingelesener DataFrame.
     """
+    parquet_path = path.with_suffix(".parquet")
+    if parquet_path.is_file() and (
+        not path.is_file() or parquet_path.stat().st_mtime >= path.stat().st_mtime
+    ):
+        logging.info("Lade %s aus %s", name, parquet_path)
+        return pd.read_parquet(parquet_path, engine="pyarrow")
+
     if not path.is_file():
         msg = f"{name}-Datei nicht gefunden unter: {path}"
         logging.error(msg)
         raise FileNotFoundError(msg)
     logging.info("Lade %s aus %s", name, path)
-    return pd.read_csv(path)
+    # Arrow-Parser (C++, mehrere Threads); ohne pyarrow bzw. bei Dateien, die
+    # er nicht lesen kann, der Standard-Parser von pandas
+    try:
+        return pd.read_csv(path, engine="pyarrow")
+    except (ImportError, ValueError) as exc:
+        logging.info("pyarrow-Parser nicht nutzbar für %s (%s) – nutze Standard-Parser.", name, exc)
+        return pd.read_csv(path)
+
+
+def save_csv(df: pd.DataFrame, path: Path, name: str) -> None:
+    """Speichert ein CSV (für Menschen) plus Parquet-Kopie (snappy) zum schnellen Neu-Einlesen.
+
+    Scheitert das Parquet-Schreiben (z.B. gemischte Typen in einer Spalte),
+    bleibt es beim CSV.
+
+    Args:
+        df: zu speichernder DataFrame.
+        path: Pfad zur CSV-Datei; die Parquet-Datei bekommt die Endung .parquet.
+        name: Logischer Name (für Logging).
+    """
+    # 1 MiB Schreibpuffer: viele kleine Writes von to_csv -> wenige Syscalls
+    with open(path, "wb", buffering=1 << 20) as fh:
+        df.to_csv(fh, index=False, encoding="utf-8")
+    try:
+        df.to_parquet(path.with_suffix(".parquet"), engine="pyarrow", compression="snappy", index=False)
+    except (ImportError, TypeError, ValueError) as exc:
+        logging.warning("Parquet-Kopie für %s nicht geschrieben: %s", name, exc)
+    logging.info("%s gespeichert unter: %s", name, path)
 
 
 def norm_plz(x: object) -> Optional[str]:
@@ -124,7 +174,7 @@ def norm_strasse(s: object) -> Optional[str]:
         .replace("Str.", "Strasse")
         .replace("str.", "strasse")
     )
-    s = re.sub(r"\s+", " ", s)
+    s = _WS_RE.sub(" ", s)
     return s.lower()
 
 
@@ -140,7 +190,7 @@ def norm_city(c: object) -> Optional[str]:
     """Normalisiert Ortsnamen (Whitespace, Kleinbuchstaben)."""
     if not isinstance(c, str):
         return None
-    return re.sub(r"\s+", " ", c.strip()).lower()
+    return _WS_RE.sub(" ", c.strip()).lower()
 
 
 def norm_art(a: object) -> Optional[str]:
@@ -163,7 +213,7 @@ def norm_phone(p: object) -> Optional[str]:
         p = str(p) if not pd.isna(p) else None
     if p is None:
         return None
-    digits = re.sub(r"\D", "", p)
+    digits = _NON_DIGIT_RE.sub("", p)
     return digits or None
 
 
@@ -179,7 +229,7 @@ def norm_url(u: object) -> Optional[str]:
     if not isinstance(u, str):
         return None
     u = u.strip().lower()
-    u = re.sub(r"^https?://", "", u)
+    u = _SCHEME_RE.sub("", u)
     u = u.rstrip("/")
     return u or None
 
@@ -189,7 +239,38 @@ def norm_name(s: object) -> Optional[str]:
     if not isinstance(s, str):
         return None
     s = s.lower().strip()
-    return re.sub(r"\s+", " ", s) or None
+    return _WS_RE.sub(" ", s) or None
+
+
+def _text(s: pd.Series) -> pd.Series:
+    """Object-Series, damit .str auch auf komplett leeren (float-)Spalten funktioniert."""
+    return s.astype(object)
+
+
+def _map_list(func, s: pd.Series) -> pd.Series:
+    """Wendet eine skalare norm_*-Funktion per List-Comprehension auf eine Spalte an."""
+    return pd.Series([func(v) for v in s.tolist()], index=s.index, dtype=object)
+
+
+def _none_if_empty(s: pd.Series) -> pd.Series:
+    """Leere Strings als fehlend markieren (entspricht `... or None`)."""
+    return s.mask(s == "")
+
+
+def _norm_art_series(s: pd.Series) -> pd.Series:
+    """Vektorisierte Variante von norm_art für eine ganze Spalte."""
+    a_low = _text(s).str.lower()
+    art = np.select(
+        [
+            a_low.str.contains("hort", regex=False, na=False),
+            a_low.str.contains("krabbelstube", regex=False, na=False)
+            | a_low.str.contains("kleinkind", regex=False, na=False),
+            a_low.str.contains("kindergarten", regex=False, na=False),
+        ],
+        ["hort", "krabbelstube", "kindergarten"],
+        default=None,
+    )
+    return pd.Series(art, index=s.index).fillna(a_low)
 
 
 # ---------------------------------------------------------------------------
@@ -197,26 +278,144 @@ def norm_name(s: object) -> Optional[str]:
 # ---------------------------------------------------------------------------
 
 
+def _norm_strasse_col(s: pd.Series) -> pd.Series:
+    return (
+        _text(s)
+        .str.strip()
+        .str.replace("ß", "ss", regex=False)  # deckt auch Straße → Strasse ab
+        .str.replace("Str.", "Strasse", regex=False)
+        .str.replace("str.", "strasse", regex=False)
+        .str.replace(_WS_RE, " ", regex=True)
+        .str.lower()
+    )
+
+
+def _norm_city_col(s: pd.Series) -> pd.Series:
+    return _text(s).str.strip().str.replace(_WS_RE, " ", regex=True).str.lower()
+
+
+def _norm_phone_col(s: pd.Series) -> pd.Series:
+    # auch Zahlen (z.B. float aus CSV) als Text behandeln
+    telefon = s.astype(object)
+    telefon = telefon.where(telefon.isna(), telefon.astype(str))
+    return _none_if_empty(telefon.str.replace(_NON_DIGIT_RE, "", regex=True))
+
+
+def _norm_email_col(s: pd.Series) -> pd.Series:
+    return _none_if_empty(_text(s).str.strip().str.lower())
+
+
+def _norm_url_col(s: pd.Series) -> pd.Series:
+    return _none_if_empty(
+        _text(s).str.strip().str.lower().str.replace(_SCHEME_RE, "", regex=True).str.rstrip("/")
+    )
+
+
+def _norm_name_col(s: pd.Series) -> pd.Series:
+    return _none_if_empty(_text(s).str.lower().str.strip().str.replace(_WS_RE, " ", regex=True))
+
+
+# Zielspalte → (Quellspalte, Normalisierung für die ganze Spalte).
+# plz/hausnr sind kurz: List-Comprehension über .tolist() statt .apply;
+# der Rest läuft über den .str-Accessor (Nicht-Strings → NaN, wie None in
+# den skalaren norm_*-Funktionen).
+NORM_JOBS: Dict[str, Tuple[str, Callable[[pd.Series], pd.Series]]] = {
+    "plz_norm": ("plz", partial(_map_list, norm_plz)),
+    "strasse_norm": ("strasse", _norm_strasse_col),
+    "hausnr_norm": ("hausnr", partial(_map_list, norm_hausnr)),
+    "ort_norm": ("ort", _norm_city_col),
+    "art_norm": ("art", _norm_art_series),
+    "telefon_norm": ("telefon", _norm_phone_col),
+    "email_norm": ("email", _norm_email_col),
+    "weburl_norm": ("weburl", _norm_url_col),
+    "name_norm": ("name", _norm_name_col),
+}
+
+# Quellspalten, die fehlen dürfen (Zielspalte wird dann None)
+OPTIONAL_NORM_SOURCES = {"hausnr"}
+
+
 def compute_normalized_keys(df: pd.DataFrame) -> pd.DataFrame:
     """Erzeugt Normalisierungs-Spalten für Matching.
 
+    Die Spalten sind unabhängig voneinander und werden parallel in einem
+    kleinen Thread-Pool berechnet.
+
     Args:
         df: Eingabedatensatz.
 
     Returns:
         DataFrame mit zusätzlichen *_norm-Spalten.
     """
-    df = df.copy()
-    df["plz_norm"] = df.get("plz").apply(norm_plz)
-    df["strasse_norm"] = df.get("strasse").apply(norm_strasse)
-    df["hausnr_norm"] = df.get("hausnr").apply(norm_hausnr) if "hausnr" in df else None
-    df["ort_norm"] = df.get("ort").apply(norm_city)
-    df["art_norm"] = df.get("art").apply(norm_art)
-    df["telefon_norm"] = df.get("telefon").apply(norm_phone)
-    df["email_norm"] = df.get("email").apply(norm_email)
-    df["weburl_norm"] = df.get("weburl").apply(norm_url)
-    df["name_norm"] = df.get("name").apply(norm_name)
-    return df
+    with ThreadPoolExecutor(max_workers=4) as ex:
+        futures = {
+            name: ex.submit(fn, df[src])
+            for name, (src, fn) in NORM_JOBS.items()
+            if src in df or src not in OPTIONAL_NORM_SOURCES
+        }
+        new_cols = {
+            name: futures[name].result() if name in futures else None for name in NORM_JOBS
+        }
+    # assign: eine neue Frame mit allen Zusatzspalten, statt copy() + Einzelzuweisungen
+    return df.assign(**new_cols)
+
+
+def _unique_key_links(df_all: pd.DataFrame, df_ogd: pd.DataFrame, key: str) -> pd.DataFrame:
+    """1:1-Links über einen exakten Key, berechnet mit Polars (lazy, mehrere Threads).
+
+    Es werden nur Keys gejoint, die auf beiden Seiten genau einmal vorkommen
+    (Zählung per Fenster-Funktion vor dem Join → kein Aufblähen durch häufige
+    Werte). Nur Key und Index wandern nach Polars, nicht der ganze Datensatz.
+
+    Args:
+        df_all: Scraping-Datensatz mit Key-Spalte.
+        df_ogd: OGD-Datensatz mit Key-Spalte.
+        key: Name der normalisierten Key-Spalte (z.B. email_norm).
+
+    Returns:
+        DataFrame mit Spalten idx_ogd, idx_all, <key>.
+    """
+    def unique_keys(df: pd.DataFrame, idx_name: str) -> pl.LazyFrame:
+        frame = pd.DataFrame({key: df[key].astype(object), idx_name: df.index.to_numpy()})
+        return (
+            pl.from_pandas(frame)
+            .lazy()
+            .filter(pl.col(key).is_not_null())
+            .filter(pl.len().over(key) == 1)
+        )
+
+    links = (
+        unique_keys(df_all, "idx_all")
+        .join(unique_keys(df_ogd, "idx_ogd"), on=key, how="inner")
+        .select(["idx_ogd", "idx_all", key])
+        .collect()
+    )
+    return links.to_pandas()
+
+
+def align_categories(
+    df_a: pd.DataFrame, df_b: pd.DataFrame, cols: Iterable[str]
+) -> None:
+    """Wandelt Key-Spalten beider Datensätze in denselben category-Dtype um.
+
+    Gemeinsame Kategorien (Vereinigung beider Seiten) sind nötig, damit
+    Vergleiche, groupby und merge über die Integer-Codes laufen können.
+    Spalten, die nicht in beiden DataFrames vorkommen, werden übersprungen.
+
+    Args:
+        df_a: erster Datensatz (wird in-place geändert).
+        df_b: zweiter Datensatz (wird in-place geändert).
+        cols: Namen der Key-Spalten.
+    """
+    for col in cols:
+        if col not in df_a or col not in df_b:
+            continue
+        cats = pd.Index(df_a[col].dropna().unique()).union(
+            pd.Index(df_b[col].dropna().unique()), sort=False
+        )
+        dtype = pd.CategoricalDtype(cats)
+        df_a[col] = df_a[col].astype(dtype)
+        df_b[col] = df_b[col].astype(dtype)
 
 
 def find_strong_email_matches(df_all: pd.DataFrame, df_ogd: pd.DataFrame) -> pd.DataFrame:
@@ -229,35 +428,9 @@ def find_strong_email_matches(df_all: pd.DataFrame, df_ogd: pd.DataFrame) -> pd.
     Returns:
         DataFrame mit Spalten idx_all, idx_ogd, email_norm, match_rule, score.
     """
-    df_all_email = df_all[~df_all["email_norm"].isna()].copy()
-    df_ogd_email = df_ogd[~df_ogd["email_norm"].isna()].copy()
-
-    df_all_email["idx_all"] = df_all_email.index
-    df_ogd_email["idx_ogd"] = df_ogd_email.index
-
-    email_matches = df_all_email.merge(
-        df_ogd_email,
-        on="email_norm",
-        how="inner",
-        suffixes=("_all", "_ogd"),
-    )
-
-    logging.info("Rohzahl E-Mail-Matches: %s", len(email_matches))
-
-    # Häufigkeit je E-Mail in beiden Datensätzen
-    cnt_all = df_all_email.groupby("email_norm").size().rename("n_all")
-    cnt_ogd = df_ogd_email.groupby("email_norm").size().rename("n_ogd")
-    email_counts = pd.concat([cnt_all, cnt_ogd], axis=1).fillna(0).astype(int)
-
-    email_matches = email_matches.merge(email_counts, on="email_norm", how="left")
-    email_matches["email_unique_both"] = (email_matches["n_all"] == 1) & (
-        email_matches["n_ogd"] == 1
-    )
-
-    email_strong = email_matches[email_matches["email_unique_both"]].copy()
-    logging.info("Starke E-Mail-Matches (1:1): %s", len(email_strong))
+    links_email = _unique_key_links(df_all, df_ogd, "email_norm")
+    logging.info("Starke E-Mail-Matches (1:1): %s", len(links_email))
 
-    links_email = email_strong[["idx_ogd", "idx_all", "email_norm"]].copy()
     links_email["match_rule"] = "email_unique"
     links_email["score"] = np.nan
     return links_email
@@ -268,38 +441,19 @@ def find_strong_phone_matches(
     df_ogd_after_email: pd.DataFrame,
 ) -> pd.DataFrame:
     """Findet eindeutige 1:1-Telefon-Matches im Rest nach E-Mail-Matching."""
-    all_tel = df_all_after_email[~df_all_after_email["telefon_norm"].isna()].copy()
-    ogd_tel = df_ogd_after_email[~df_ogd_after_email["telefon_norm"].isna()].copy()
+    links_phone = _unique_key_links(df_all_after_email, df_ogd_after_email, "telefon_norm")
+    logging.info("Starke Telefon-Matches (1:1): %s", len(links_phone))
 
-    all_tel["idx_all"] = all_tel.index
-    ogd_tel["idx_ogd"] = ogd_tel.index
-
-    phone_matches = all_tel.merge(
-        ogd_tel,
-        on="telefon_norm",
-        how="inner",
-        suffixes=("_all", "_ogd"),
-    )
-    logging.info("Telefon-Matches (roh): %s", len(phone_matches))
-
-    cnt_all_tel = all_tel.groupby("telefon_norm").size().rename("n_all_tel")
-    cnt_ogd_tel = ogd_tel.groupby("telefon_norm").size().rename("n_ogd_tel")
-    tel_counts = pd.concat([cnt_all_tel, cnt_ogd_tel], axis=1).fillna(0).astype(int)
-
-    phone_matches = phone_matches.merge(tel_counts, on="telefon_norm", how="left")
-    phone_matches["phone_unique_both"] = (phone_matches["n_all_tel"] == 1) & (
-        phone_matches["n_ogd_tel"] == 1
-    )
-
-    phone_strong = phone_matches[phone_matches["phone_unique_both"]].copy()
-    logging.info("Starke Telefon-Matches (1:1): %s", len(phone_strong))
-
-    links_phone = phone_strong[["idx_ogd", "idx_all", "telefon_norm"]].copy()
     links_phone["match_rule"] = "phone_unique"
     links_phone["score"] = np.nan
     return links_phone
 
 
+# Obergrenze für die cdist-Score-Matrix eines Blocks (float64 → 8 Byte pro Zelle);
+# darüber wird pro Zeile mit extractOne gesucht
+CDIST_MAX_CELLS = 5_000_000
+
+
 def fuzzy_match_blocked(
     df_left: pd.DataFrame,
     df_right: pd.DataFrame,
@@ -317,50 +471,108 @@ def fuzzy_match_blocked(
     Returns:
         DataFrame mit Spalten idx_ogd, idx_all, score, match_rule.
     """
-    df_left = df_left.copy()
-    df_right = df_right.copy()
+    block_cols = list(block_cols)
+
+    # Zeilen ohne Namen können nie matchen
+    df_left = df_left[df_left["name_norm"].notna()]
+    df_right = df_right[df_right["name_norm"].notna()]
+
+    # Linke Zeilen nach Block-Key gruppieren: ein cdist-Aufruf pro Block statt
+    # einer Python-Schleife pro Paar. Fehlende Block-Werte (None/NaN) schränken
+    # die Kandidaten wie bisher nicht ein.
+    # Spalten einmal als numpy-Arrays holen und per Position lesen
+    # (kein Tupel-Objekt pro Zeile wie bei itertuples)
+    block_vals = [df_left[c].to_numpy() for c in block_cols]
+    isna = pd.isna
+    left_by_key: Dict[Tuple[object, ...], List[int]] = {}
+    for pos in range(len(df_left)):
+        key = tuple(None if isna(vals[pos]) else vals[pos] for vals in block_vals)
+        left_by_key.setdefault(key, []).append(pos)
+
+    left_names = df_left["name_norm"].to_numpy()
+    left_index = df_left.index.to_numpy()
+    right_names = df_right["name_norm"].to_numpy()
+    right_index = df_right.index.to_numpy()
+
+    # Blocking über vorab gebaute groupby-Indizes (Key → Positionen in df_right)
+    # statt wiederholter Boolean-Filter. Ein Index pro Kombination belegter
+    # Block-Spalten, erst bei Bedarf gebaut.
+    group_indices: Dict[Tuple[str, ...], Dict[object, np.ndarray]] = {}
+
+    def candidate_positions(key: Tuple[object, ...]) -> Optional[np.ndarray]:
+        cols = tuple(c for c, v in zip(block_cols, key) if v is not None)
+        vals = tuple(v for v in key if v is not None)
+        if not cols:
+            return np.arange(len(df_right))
+        if cols not in group_indices:
+            group_indices[cols] = df_right.groupby(
+                list(cols), sort=False, dropna=False, observed=True
+            ).indices
+        # groupby.indices nutzt bei einer Spalte Skalare statt 1-Tupel als Key
+        return group_indices[cols].get(vals if len(cols) > 1 else vals[0])
+
+    # (score, Position links, Index rechts) – bester Kandidat je linker Zeile
+    best: List[Tuple[float, int, object]] = []
+
+    for key, left_pos in left_by_key.items():
+        cand_pos = candidate_positions(key)
+        if cand_pos is None or len(cand_pos) == 0:
+            continue
 
-    df_left["idx_left"] = df_left.index
-    df_right["idx_right"] = df_right.index
+        cand_names = right_names[cand_pos]
+
+        # Große Blöcke (z.B. ohne PLZ/Ort) nicht als volle Matrix bewerten:
+        # extractOne pro Zeile bricht intern mit score_cutoff ab und braucht
+        # keinen Speicher für links × Kandidaten
+        if len(left_pos) * len(cand_pos) > CDIST_MAX_CELLS:
+            for pos in left_pos:
+                hit = process.extractOne(
+                    left_names[pos],
+                    cand_names,
+                    scorer=fuzz.token_set_ratio,
+                    score_cutoff=score_cutoff,
+                )
+                if hit is not None:
+                    _, score, col_idx = hit
+                    best.append((float(score), pos, right_index[cand_pos[col_idx]]))
+            continue
 
+        # Score-Matrix (links × Kandidaten) im C++-Threadpool von RapidFuzz;
+        # Werte unter score_cutoff kommen als 0 zurück. float64 wie bei extractOne:
+        # ungerundete Scores, gleiche Auswahl bei knappen Abständen
+        scores = process.cdist(
+            left_names[left_pos],
+            cand_names,
+            scorer=fuzz.token_set_ratio,
+            score_cutoff=score_cutoff,
+            workers=-1,
+            dtype=np.float64,
+        )
+        best_cols = scores.argmax(axis=1)  # erster Treffer bei Gleichstand
+        best_scores = scores[np.arange(len(left_pos)), best_cols]
+        for pos, col_idx, score in zip(left_pos, best_cols, best_scores):
+            if score >= score_cutoff:
+                best.append((float(score), pos, right_index[cand_pos[col_idx]]))
+
+    # Eindeutigkeit rechts: Greedy nach Score (bei Gleichstand Zeilenreihenfolge)
     matches: List[Dict[str, object]] = []
     used_right: set[int] = set()
-
-    for row in df_left.itertuples():
-        cand = df_right
-
-        # Blocking
-        for col in block_cols:
-            val = getattr(row, col)
-            if val is None or (isinstance(val, float) and np.isnan(val)):
-                continue
-            cand = cand[cand[col] == val]
-        if cand.empty:
+    for score, pos, idx_right in sorted(best, key=lambda t: (-t[0], t[1])):
+        if idx_right in used_right:
             continue
+        matches.append(
+            {
+                "idx_ogd": left_index[pos],
+                "idx_all": idx_right,
+                "score": score,
+                "match_rule": "fuzzy_name_plz_ort_art",
+            }
+        )
+        used_right.add(idx_right)
 
-        best_score = -1
-        best_idx_right: Optional[int] = None
-
-        for cand_row in cand.itertuples():
-            if row.name_norm is None or cand_row.name_norm is None:
-                continue
-            score = fuzz.token_set_ratio(row.name_norm, cand_row.name_norm)
-            if score > best_score:
-                best_score = score
-                best_idx_right = cand_row.idx_right
-
-        if best_score >= score_cutoff and best_idx_right not in used_right:
-            matches.append(
-                {
-                    "idx_ogd": row.idx_left,
-                    "idx_all": best_idx_right,
-                    "score": best_score,
-                    "match_rule": "fuzzy_name_plz_ort_art",
-                }
-            )
-            used_right.add(best_idx_right)
-
-    fuzzy_matches = pd.DataFrame(matches)
+    fuzzy_matches = pd.DataFrame(
+        matches, columns=["idx_ogd", "idx_all", "score", "match_rule"]
+    )
     logging.info(
         "Fuzzy-Matches (Name + PLZ + Ort + Art, Score >= %d): %s",
         score_cutoff,
@@ -391,6 +603,7 @@ def build_enrichment(
     # Normalisierte Keys
     df_all_norm = compute_normalized_keys(df_all)
     df_ogd_norm = compute_normalized_keys(df_ogd)
+    align_categories(df_all_norm, df_ogd_norm, CATEGORY_COLS)
 
     # E-Mail-Matches
     links_email = find_strong_email_matches(df_all_norm, df_ogd_norm)
@@ -398,8 +611,9 @@ def build_enrichment(
     # Rest nach E-Mail
     idx_all_email = links_email["idx_all"].unique()
     idx_ogd_email = links_email["idx_ogd"].unique()
-    df_all_after_email = df_all_norm.loc[~df_all_norm.index.isin(idx_all_email)].copy()
-    df_ogd_after_email = df_ogd_norm.loc[~df_ogd_norm.index.isin(idx_ogd_email)].copy()
+    # Boolean-.loc liefert bereits neue Frames → kein zusätzliches copy()
+    df_all_after_email = df_all_norm.loc[~df_all_norm.index.isin(idx_all_email)]
+    df_ogd_after_email = df_ogd_norm.loc[~df_ogd_norm.index.isin(idx_ogd_email)]
 
     logging.info(
         "Rest nach E-Mail-Matching: df_all=%d, df_ogd=%d",
@@ -413,12 +627,8 @@ def build_enrichment(
     # Rest nach Telefon
     idx_all_phone = links_phone["idx_all"].unique()
     idx_ogd_phone = links_phone["idx_ogd"].unique()
-    df_all_after_phone = df_all_after_email.loc[
-        ~df_all_after_email.index.isin(idx_all_phone)
-    ].copy()
-    df_ogd_after_phone = df_ogd_after_email.loc[
-        ~df_ogd_after_email.index.isin(idx_ogd_phone)
-    ].copy()
+    df_all_after_phone = df_all_after_email.loc[~df_all_after_email.index.isin(idx_all_phone)]
+    df_ogd_after_phone = df_ogd_after_email.loc[~df_ogd_after_email.index.isin(idx_ogd_phone)]
 
     logging.info(
         "Rest nach Email+Telefon: df_all=%d, df_ogd=%d",
@@ -509,22 +719,26 @@ def main() -> int:
     )
 
     # 2) Scraping-Datensätze zusammenführen
-    df_all = pd.concat([df_linz, df_kf, df_fb, df_car], ignore_index=True)
-    logging.info("df_all (Scraping gesamt): %d Zeilen, %d Spalten", *df_all.shape)
-
-    # Optional: leere Spalten melden
-    for name, df_part in [
+    parts = [
         ("Stadt Linz", df_linz),
         ("Kinderfreunde", df_kf),
         ("Familienbund", df_fb),
         ("Caritas/Pfarrcaritas", df_car),
-    ]:
-        empty_cols = df_part.columns[df_part.isna().all()].tolist()
-        logging.info("%s: %d komplett leere Spalten", name, len(empty_cols))
+    ]
+    df_all = pd.concat([df_part for _, df_part in parts], ignore_index=True)
+    logging.info("df_all (Scraping gesamt): %d Zeilen, %d Spalten", *df_all.shape)
+
+    # Optional: leere Spalten melden – ein notna()-Durchlauf über df_all,
+    # gruppiert nach Quelle (nur Spalten, die die Quelle selbst hat)
+    src = np.repeat([name for name, _ in parts], [len(df_part) for _, df_part in parts])
+    has_values = df_all.notna().groupby(src, sort=False).any()
+    for name, df_part in parts:
+        row = has_values.loc[name] if name in has_values.index else None
+        n_empty = len(df_part.columns) if row is None else int((~row[df_part.columns]).sum())
+        logging.info("%s: %d komplett leere Spalten", name, n_empty)
 
     # 3) df_all speichern
-    df_all.to_csv(SCRAPED_MERGED, index=False)
-    logging.info("Gescrapte Trägerdaten gespeichert unter: %s", SCRAPED_MERGED)
+    save_csv(df_all, SCRAPED_MERGED, "Gescrapte Trägerdaten")
 
     # 4) OGD-Kern laden
     df_ogd = load_csv(OGD_CLEAN, "OGD (bereinigt)")
@@ -534,11 +748,9 @@ def main() -> int:
     df_ogd_enriched, links = build_enrichment(df_all=df_all, df_ogd=df_ogd)
 
     # 6) Ergebnisse speichern
-    df_ogd_enriched.to_csv(OGD_ENRICHED, index=False)
-    logging.info("Angereicherter OGD-Datensatz gespeichert unter: %s", OGD_ENRICHED)
+    save_csv(df_ogd_enriched, OGD_ENRICHED, "Angereicherter OGD-Datensatz")
 
-    links.to_csv(LINKS_PATH, index=False)
-    logging.info("Matching-Links gespeichert unter: %s", LINKS_PATH)
+    save_csv(links, LINKS_PATH, "Matching-Links")
 
     # 7) Kurze Coverage-Statistiken
     scraped_with_traeger = df_all["traeger"].notna().sum()
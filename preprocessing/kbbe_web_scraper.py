@@ -14,16 +14,44 @@ Es:
 
 from __future__ import annotations
 
+import asyncio
+import csv
 import logging
+import os
 import re
 import time
+from collections import defaultdict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from email.utils import parsedate_to_datetime
 from pathlib import Path
-from typing import Callable, Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Mapping, Optional, Tuple, Union
+from urllib.parse import unquote, urlparse
 
+import aiohttp
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+from requests.adapters import HTTPAdapter
+from tenacity import (
+    before_sleep_log,
+    retry,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
 from tqdm import tqdm
+from tqdm.asyncio import tqdm_asyncio
+from urllib3.util.retry import Retry
+
+try:  # optionaler HTTP-Disk-Cache für die Entwicklung (KBBE_HTTP_CACHE=1)
+    import requests_cache
+    from aiohttp_client_cache import CachedSession, SQLiteBackend
+except ImportError:  # pragma: no cover - Cache ist nur ein Dev-Komfort
+    requests_cache = None
+    CachedSession = SQLiteBackend = None
 
 # ---------------------------------------------------------------------------
 # Projektpfade
@@ -37,6 +65,15 @@ OUTPUT_LINZ = OUTPUT_DIR / "linz_kinderbetreuung_stadt.csv"
 OUTPUT_KF = OUTPUT_DIR / "kinderfreunde_kinderbetreuung_ooe.csv"
 OUTPUT_FB = OUTPUT_DIR / "familienbund_kinderbetreuung_ooe.csv"
 
+URL_CATALOG = PREPROCESSING_DIR / "url_catalog.csv"
+
+# HTTP-Cache nur bei KBBE_HTTP_CACHE=1 (wiederholte Entwicklungsläufe parsen nur noch)
+HTTP_CACHE_ENABLED = (
+    os.environ.get("KBBE_HTTP_CACHE") == "1" and requests_cache is not None
+)
+HTTP_CACHE_DIR = OUTPUT_DIR / ".http_cache"
+HTTP_CACHE_EXPIRE_SECONDS = 86400
+
 # ---------------------------------------------------------------------------
 # Globale Konstanten (Header, Regex, Formular-URLs)
 # ---------------------------------------------------------------------------
@@ -46,7 +83,12 @@ HEADERS = {
         "Mozilla/5.0 (X11; Linux x86_64) "
         "AppleWebKit/537.36 (KHTML, like Gecko) "
         "Chrome/122.0 Safari/537.36"
-    )
+    ),
+    "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.8",
+    # Komprimierte Übertragung; requests/aiohttp dekomprimieren transparent.
+    # Kein "br": ohne installiertes brotli-Paket könnten beide Clients es nicht lesen.
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive",
 }
 
 FORM_URLS = {
@@ -59,408 +101,289 @@ EMAIL_PATTERN = re.compile(
     r"[A-Za-z0-9._%+\-]+@[A-Za-z0-9.\-]+\.[A-Za-z]{2,}"
 )
 
+# Gemeinsame Präfixe ausfaktorisiert; re.ASCII spart Unicode-Case-Folding
 WEEKDAY_PATTERN = re.compile(
-    r"(Montag|Dienstag|Mittwoch|Donnerstag|Freitag|Samstag|Sonntag)",
-    re.IGNORECASE,
+    r"M(?:ontag|ittwoch)|D(?:ienstag|onnerstag)|Freitag|S(?:amstag|onntag)",
+    re.IGNORECASE | re.ASCII,
+)
+
+PLZ_PATTERN = re.compile(r"\b\d{4,5}\b", re.ASCII)
+PLZ_FULL_PATTERN = re.compile(r"\d{4,5}", re.ASCII)
+PHONE_PATTERN = re.compile(r"\+?\d[\d\s/()-]{5,}")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+DOUBLE_COMMA_PATTERN = re.compile(r",\s*,")
+TRAILING_COLON_PATTERN = re.compile(r"\s*:\s*$")
+MAILTO_PATTERN = re.compile(r"^mailto:", re.IGNORECASE)
+
+# Nur die Inhaltsblöcke je Website parsen (Navigation/Footer werden übersprungen)
+LINZ_STRAINER = SoupStrainer("div", id=re.compile(r"^content"))
+KF_STRAINER = SoupStrainer("main")
+FB_STRAINER = SoupStrainer("article")
+
+# Maximale gleichzeitige Requests je Host (kleinere Hosts werden stärker gedrosselt)
+HOST_CONCURRENCY: Dict[str, int] = {
+    "www.linz.at": 32,
+    "kinderfreunde.at": 16,
+    "ooe.familienbund.at": 8,
+}
+DEFAULT_HOST_CONCURRENCY = 8
+
+# HTTP-Status, bei denen ein Request mit Backoff wiederholt wird
+RETRY_STATUSES = {429, 500, 502, 503}
+RETRY_AFTER_MAX_SECONDS = 60.0
+
+# Persistente Session für den synchronen Pfad (Keep-Alive statt TLS-Handshake je URL)
+if HTTP_CACHE_ENABLED:
+    HTTP_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    SESSION = requests_cache.CachedSession(
+        str(HTTP_CACHE_DIR / "sync"),
+        backend="sqlite",
+        expire_after=HTTP_CACHE_EXPIRE_SECONDS,
+    )
+else:
+    SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
+_adapter = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=0.3),
 )
+SESSION.mount("https://", _adapter)
+SESSION.mount("http://", _adapter)
 
 # ---------------------------------------------------------------------------
-# URL-Listen (Platzhalter – hier deine echten Listen einfügen)
+# URL-Listen (aus preprocessing/url_catalog.csv: provider, category, name, url)
 # ---------------------------------------------------------------------------
 
-hort_urls: List[Tuple[str, str]] = [
-    ("Hort Allendeplatz", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122477"),
-    ("Hort Biesenfeld", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122479"),
-    ("Hort Coulinstraße", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=123116"),
-    ("Hort Dorfhalleschule", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122480"),
-    ("Hort Edlbacherstraße", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=123117"),
-    ("Hort Edmund Aigner", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122481"),
-    ("Hort Fechterweg", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122482"),
-    ("Hort Goetheschule", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122483"),
-    ("Hort Harbach", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=123142"),
-    ("Hort Hauderweg", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122484"),
-    ("Hort Keferfeld", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=123267"),
-    ("Hort Khevenhüllerstraße", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122488"),
-    ("Hort Koref", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122489"),
-    ("Hort Löwenfeld", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122493"),
-    ("Hort Mira-Lobe", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=123431"),
-    ("Hort Mozartschule", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122492"),
-    ("Hort Pichlingschule", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122494"),
-    ("Hort Raimundstraße", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122495"),
-    ("Hort Robinson", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122478"),
-    ("Hort Rohrmayrstraße", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122496"),
-    ("Hort Römerbergschule", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122497"),
-    ("Hort Schärfschule", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122498"),
-    ("Hort Scharmühlwinkel", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122508"),
-    ("Hort Siemensschule", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122499"),
-    ("Hort Solar City", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122500"),
-    ("Hort Sonnenstein", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122486"),
-    ("Hort Spallerhofschule", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122501"),
-    ("Hort Spaunstraße", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=123141"),
-    ("Hort Stadlerstraße", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=123235"),
-    ("Hort Straßlandweg", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122502"),
-    ("Hort Weberschule", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122503"),
-    ("Hort Wieningerstraße", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122504"),
-    ("Integrationshort Karlhofschule", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122506"),
-    ("Integrationshort Rennerschule", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122507"),
-]
-
-kindergarten_urls: List[Tuple[str, str]] = [
-    ("Kindergarten Allendeplatz", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122512"),
-    ("Kindergarten Am Hartmayrgut", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=123283"),
-    ("Kindergarten Anastasius-Grün-Straße", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122513"),
-    ("Kindergarten Auwiesenstraße 130", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122514"),
-    ("Kindergarten Auwiesenstraße 22-24", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122515"),
-    ("Kindergarten Auwiesenstraße 60", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122516"),
-    ("Kindergarten Breitwiesergutstraße", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122517"),
-    ("Kindergarten Brucknerstraße", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=123232"),
-    ("Kindergarten Bürgerstraße", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122518"),
-    ("Kindergarten Commendastraße", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122519"),
-    ("Kindergarten Cremeristraße", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122520"),
-    ("Kindergarten Darrgutstraße", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122521"),
-    ("Kindergarten Dauphinestraße 216", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=123040"),
-    ("Kindergarten Dornacher Straße", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122522"),
-    ("Kindergarten Edeltraud-Hofer-Straße", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=123213"),
-    ("Kindergarten Freistädter Straße", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122524"),
-    ("Kindergarten Garnisonstraße 33", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122525"),
-    ("Kindergarten Garnisonstraße 38", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=123096"),
-    ("Kindergarten Glimpfingerstraße", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=123265"),
-    ("Kindergarten Hauderweg", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122526"),
-    ("Kindergarten Hebenstreitstraße", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122527"),
-    ("Kindergarten Heliosallee 181", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=123311"),
-    ("Kindergarten Helmholtzstraße", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=123176"),
-    ("Kindergarten Hertzstraße", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122529"),
-    ("Kindergarten Hofmannsthalweg", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122530"),
-    ("Kindergarten Hofmeindlweg", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122531"),
-    ("Kindergarten Holzstraße", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122807"),
-    ("Kindergarten In der Auerpeint", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122532"),
-    ("Kindergarten J.-W.-Klein-Straße 60", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122533"),
-    ("Kindergarten Kraußstraße", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122534"),
-    ("Kindergarten Langgasse", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122536"),
-    ("Kindergarten Leonfeldner Straße 102a", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122537"),
-    ("Kindergarten Leonfeldner Straße 3a", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122538"),
-    ("Kindergarten Leonfeldner Straße 99d", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122540"),
-    ("Kindergarten Ludlgasse", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122541"),
-    ("Kindergarten Marienberg", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122542"),
-    ("Kindergarten Minnesängerplatz", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122543"),
-    ("Kindergarten Neufelderstraße", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122555"),
-    ("Kindergarten Pestalozzistraße 84", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122544"),
-    ("Kindergarten Pestalozzistraße 96", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=123346"),
-    ("Kindergarten Poschacherstraße – Bilingualer Kindergarten", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=123049"),
-    ("Kindergarten Posthofstraße", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122545"),
-    ("Kindergarten Reischekstraße", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122547"),
-    ("Kindergarten Rohrmayrstraße", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122549"),
-    ("Kindergarten Römerstraße", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122550"),
-    ("Kindergarten Scharmühlwinkel", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122551"),
-    ("Kindergarten Schiedermayrweg", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122552"),
-    ("Kindergarten Schiffmannstraße", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=123255"),
-    ("Kindergarten Schnitzlerweg", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122553"),
-    ("Kindergarten Sennweg", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122554"),
-    ("Kindergarten Sintstraße", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=123273"),
-    ("Kindergarten Traundorfer Straße 286", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=123348"),
-    ("Kindergarten Tungassingerstraße", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122556"),
-    ("Kindergarten Webergasse", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122557"),
-    ("Kindergarten Weikerlseestraße", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122528"),
-    ("Kindergarten Werndlstraße", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122805"),
-    ("Kindergarten Wieningerstraße 16", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122558"),
-    ("Kindergarten Wieningerstraße 19", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=123347"),
-    ("Kindergarten Ziererfeldstraße", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122559"),
-]
-
-krabbelstube_urls: List[Tuple[str, str]] = [
-    ("Krabbelstube Am Hartmayrgut", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=123048"),
-    ("Krabbelstube Anastasius-Grün-Straße", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122561"),
-    ("Krabbelstube Auf der Wies", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=123228"),
-    ("Krabbelstube Dauphinestraße 56a", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=123042"),
-    ("Krabbelstube Don-Bosco-Weg", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122562"),
-    ("Krabbelstube Freistädter Straße", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122563"),
-    ("Krabbelstube Hessenplatz", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=123146"),
-    ("Krabbelstube Humboldtstraße", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=123099"),
-    ("Krabbelstube Kreßweg", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=123043"),
-    ("Krabbelstube Leonfeldner Straße 100a", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122564"),
-    ("Krabbelstube Maidwieserstraße", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=123072"),
-    ("Krabbelstube Rohrmayrstraße", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122565"),
-    ("Krabbelstube Scharmühlwinkel", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122566"),
-    ("Krabbelstube Schiedermayrweg", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=123262"),
-    ("Krabbelstube Schubertstraße", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=123229"),
-    ("Krabbelstube Wallenbergstraße (vormals Tungassingerstraße)", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=123073"),
-
-    ("Krabbelstubengruppe Bürgerstraße im Kindergarten", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122567"),
-    ("Krabbelstubengruppe Dauphinestraße 216 im Kindergarten", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=123041"),
-    ("Krabbelstubengruppe Helmholtzstraße im Kindergarten", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=123177"),
-    ("Krabbelstubengruppe Hofmannsthalweg im Kindergarten", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122568"),
-    ("Krabbelstubengruppe Schnitzlerweg im Kindergarten", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122806"),
-    ("Krabbelstubengruppe Sennweg im Kindergarten", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122571"),
-    ("Krabbelstubengruppe Wieningerstraße 16 im Kindergarten", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122572"),
-
-    ("Krabbelstubengruppen Allendeplatz im Kindergarten", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122560"),
-    ("Krabbelstubengruppen Commendastraße im Kindergarten", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=123225"),
-    ("Krabbelstubengruppen Edeltraud-Hofer-Straße im Kindergarten", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=123214"),
-    ("Krabbelstubengruppen Garnisonstraße 38 im Kindergarten", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=123095"),
-    ("Krabbelstubengruppen Glimpfingerstraße im Kindergarten", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=123291"),
-    ("Krabbelstubengruppen Hauderweg im Kindergarten", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=123312"),
-    ("Krabbelstubengruppen Heliosallee im Kindergarten", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=123044"),
-    ("Krabbelstubengruppen Hertzstraße im Kindergarten", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=123071"),
-    ("Krabbelstubengruppen Hofmeindlweg im Kindergarten", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=123272"),
-    ("Krabbelstubengruppen Johann-Wilhelm-Klein-Straße im Kindergarten", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122569"),
-    ("Krabbelstubengruppen Leonfeldnerstr. 99d im Kindergarten", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=123212"),
-    ("Krabbelstubengruppen Neufelderstraße im Kindergarten", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122573"),
-    ("Krabbelstubengruppen Poschacherstraße im bilingualen Kindergarten", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=123050"),
-    ("Krabbelstubengruppen Reischekstraße im Kindergarten", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=122570"),
-    ("Krabbelstubengruppen Schiffmannstraße im Kindergarten", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=123254"),
-    ("Krabbelstubengruppen Sintstraße im Kindergarten", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=123274"),
-    ("Krabbelstubengruppen Traundorfer Straße 286", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=123358"),
-    ("Krabbelstubengruppen Weikerlseestraße im Kindergarten", "https://www.linz.at/serviceguide/viewchapter.php?chapter_id=123139"),
-]
-
-kinderfreunde_hort_urls: List[Tuple[str, str]] = [
-    ("Hort Ansfelden", "https://kinderfreunde.at/angebote/detail/hort-ansfelden"),
-    ("Hort Braunau", "https://kinderfreunde.at/angebote/detail/hort-braunau"),
-
-    ("Hort Eferding - Gruppe 1, 2 und 6",
-     "https://kinderfreunde.at/angebote/detail/hort-eferding-gruppe-3-4-5-und-buro-leitung"), # hier sind tatsächlich die URLs vertauscht worden
-    ("Hort Eferding - Gruppe 3, 4, 5 und Büro Leitung",
-     "https://kinderfreunde.at/angebote/detail/hort-eferding-gruppe-1-2-und-6"), # hier sind tatsächlich die URLs vertauscht worden
-    ("Hort Grünau", "https://kinderfreunde.at/angebote/detail/hort-grunau"),
-    ("Hort Gutau", "https://kinderfreunde.at/angebote/detail/hort-gutau"),
-    ("Hort Haid", "https://kinderfreunde.at/angebote/detail/hort-haid"),
-    ("Hort Hallstatt", "https://kinderfreunde.at/angebote/detail/hort-hallstatt"),
-    ("Hort Kirchberg-Thening", "https://kinderfreunde.at/angebote/detail/hort-kirchberg-thening"),
-    ("Hort Kirchdorf", "https://kinderfreunde.at/angebote/detail/hort-kirchdorf"),
-    ("Hort Kremsdorf", "https://kinderfreunde.at/angebote/detail/hort-kremsdorf"),
-    ("Hort Langholzfeld", "https://kinderfreunde.at/angebote/detail/hort-langholzfeld"),
-
-    ("Hort Lengau", "https://kinderfreunde.at/angebote/detail/hort-lengau"),
-    ("Hort Mauerkirchen", "https://kinderfreunde.at/angebote/detail/hort-mauerkirchen"),
-    ("Hort Neumarkt", "https://kinderfreunde.at/angebote/detail/hort-neumarkt"),
-    ("Hort Oftering", "https://kinderfreunde.at/angebote/detail/hort-oftering"),
-    ("Hort Riedersbach", "https://kinderfreunde.at/angebote/detail/hort-riedersbach"),
-    ("Hort Schwertberg", "https://kinderfreunde.at/angebote/detail/hort-schwertberg"),
-    ("Hort Sierning", "https://kinderfreunde.at/angebote/detail/hort-sierning"),
-    ("Hort St. Georgen/Gusen", "https://kinderfreunde.at/angebote/detail/hort-st-georgen-gusen"),
-    ("Hort St. Margarethen", "https://kinderfreunde.at/angebote/detail/hort-st-margarethen"),
-    ("Hort Unterweitersdorf", "https://kinderfreunde.at/angebote/detail/hort-unterweitersdorf"),
-    ("Hort Wartberg", "https://kinderfreunde.at/angebote/detail/hort-wartberg"),
-    ("Hort Wilhering", "https://kinderfreunde.at/angebote/detail/hort-wilhering"),
-    ("Linz - Hort Ziegeleistraße", "https://kinderfreunde.at/angebote/detail/linz-hort-ziegeleistrasse"),
-]
-
-kinderfreunde_kindergarten_urls: List[Tuple[str, str]] = [
-    ("Kindergarten Eferding",
-     "https://kinderfreunde.at/angebote/detail/kindergarten-eferding"),
-    ("Kindergarten Langholzfeld",
-     "https://kinderfreunde.at/angebote/detail/kindergarten-langholzfeld"),
-    ("Kindergarten Mauthausen",
-     "https://kinderfreunde.at/angebote/detail/kindergarten-mauthausen"),
-    ("Kindergarten Neuhofen",
-     "https://kinderfreunde.at/angebote/detail/kindergarten-neuhofen"),
-    ("Kindergarten Obertraun",
-     "https://kinderfreunde.at/angebote/detail/kindergarten-obertraun"),
-    ("Kindergarten Pasching",
-     "https://kinderfreunde.at/angebote/detail/kindergarten-pasching"),
-    ("Kindergarten Plus City",
-     "https://kinderfreunde.at/angebote/detail/kindergarten-plus-city"),
-    ("Kindergarten Schwertberg",
-     "https://kinderfreunde.at/angebote/detail/kindergarten-schwertberg"),
-    ("Kinderzentrum Pasching",
-     "https://kinderfreunde.at/angebote/detail/kinderzentrum-pasching"),
-    ("Krabbelstube und Kindergarten Langholzfeld",
-     "https://kinderfreunde.at/angebote/detail/krabbelstube-und-kindergarten-langholzfeld"),
-    ("Krabbelstube und Kindergarten Plus City",
-     "https://kinderfreunde.at/angebote/detail/krabbelstube-und-kindergarten-plus-city"),
-    ("Linz - Kindergarten Edisonstraße",
-     "https://kinderfreunde.at/angebote/detail/linz-kindergarten-edisonstrasse"),
-    ("Linz - Kindergarten Einfaltstraße",
-     "https://kinderfreunde.at/angebote/detail/linz-kindergarten-einfaltstrasse"),
-    ("Linz - Kindergarten Ing. Stern-Straße",
-     "https://kinderfreunde.at/angebote/detail/linz-kindergarten-ing-stern-strasse"),
-    ("Linz - Kindergarten Zaunmüllerstraße",
-     "https://kinderfreunde.at/angebote/detail/linz-kindergarten-zaunmullerstrasse"),
-    ("Naturkindergarten St.Georgen/Gusen",
-     "https://kinderfreunde.at/angebote/detail/naturkindergarten-st-georgen-gusen"),
-    ("Steyr - Kindergarten Ennsleite",
-     "https://kinderfreunde.at/angebote/detail/kindergarten-ennsleite"),
-]
-
-kinderfreunde_krabbelstube_urls: List[Tuple[str, str]] = [
-    ("Betriebskrabbelstube Forensisch-Therapeutisches Zentrum Asten",
-     "https://kinderfreunde.at/angebote/detail/betriebskrabbelstube-forensisch-therapeutisches-zentrum-asten"),
-    ("Kinderzentrum Pasching",
-     "https://kinderfreunde.at/angebote/detail/kinderzentrum-pasching"),
-    ("Krabbelstube Asten",
-     "https://kinderfreunde.at/angebote/detail/krabbelstube-asten"),
-    ("Krabbelstube Attnang-Puchheim",
-     "https://kinderfreunde.at/angebote/detail/krabbelstube-attnang-puchheim"),
-    ("Krabbelstube Braunau",
-     "https://kinderfreunde.at/angebote/detail/krabbelstube-braunau"),
-    ("Krabbelstube Braunau Expositur Neustadt",
-     "https://kinderfreunde.at/angebote/detail/krabbelstube-braunau-expositur-neustadt"),
-    ("Krabbelstube Eferding",
-     "https://kinderfreunde.at/angebote/detail/krabbelstube-eferding"),
-    ("Krabbelstube Gallneukirchen",
-     "https://kinderfreunde.at/angebote/detail/krabbelstube-gallneukirchen"),
-    ("Krabbelstube Haid",
-     "https://kinderfreunde.at/angebote/detail/krabbelstube-haid"),
-    ("Krabbelstube Haid - Expositur Ansfelden",
-     "https://kinderfreunde.at/angebote/detail/krabbelstube-haid-expositur-ansfelden"),
-
-    ("Krabbelstube Haid - Haidpark",
-     "https://kinderfreunde.at/angebote/detail/krabbelstube-haid-haidpark"),
-    ("Krabbelstube Haslach",
-     "https://kinderfreunde.at/angebote/detail/krabbelstube-haslach"),
-    ("Krabbelstube Langholzfeld",
-     "https://kinderfreunde.at/angebote/detail/krabbelstube-langholzfeld"),
-    ("Krabbelstube Lengau",
-     "https://kinderfreunde.at/angebote/detail/krabbelstube-lengau"),
-    ("Krabbelstube Lengau II",
-     "https://kinderfreunde.at/angebote/detail/krabbelstube-lengau-ii"),
-    ("Krabbelstube Mattighofen",
-     "https://kinderfreunde.at/angebote/detail/krabbelstube-mattighofen"),
-
-    ("Krabbelstube Mattighofen KTM",
-     "https://kinderfreunde.at/angebote/detail/krabbelstube-mattighofen-ktm"),
-    ("Krabbelstube Mauthausen",
-     "https://kinderfreunde.at/angebote/detail/krabbelstube-mauthausen"),
-    ("Krabbelstube Neuhofen",
-     "https://kinderfreunde.at/angebote/detail/krabbelstube-neuhofen"),
-    ("Krabbelstube Neumarkt",
-     "https://kinderfreunde.at/angebote/detail/krabbelstube-neumarkt"),
-
-    ("Krabbelstube Pasching",
-     "https://kinderfreunde.at/angebote/detail/krabbelstube-pasching"),
-    ("Krabbelstube Plus City",
-     "https://kinderfreunde.at/angebote/detail/krabbelstube-plus-city"),
-    ("Krabbelstube Schörfling",
-     "https://kinderfreunde.at/angebote/detail/krabbelstube-schorfling"),
-    ("Krabbelstube Seewalchen",
-     "https://kinderfreunde.at/angebote/detail/krabbelstube-seewalchen-1"),
-    ("Krabbelstube St. Georgen / Gusen",
-     "https://kinderfreunde.at/angebote/detail/krabbelstube-st-georgen-1"),
-
-    ("Krabbelstube und Kindergarten Langholzfeld",
-     "https://kinderfreunde.at/angebote/detail/krabbelstube-und-kindergarten-langholzfeld"),
-    ("Krabbelstube und Kindergarten Plus City",
-     "https://kinderfreunde.at/angebote/detail/krabbelstube-und-kindergarten-plus-city"),
-    ("Krabbelstube Wilhering",
-     "https://kinderfreunde.at/angebote/detail/krabbelstube-wilhering-1"),
-
-    ("Naturkindergarten St.Georgen/Gusen",
-     "https://kinderfreunde.at/angebote/detail/naturkindergarten-st-georgen-gusen"),
-    ("Steyr - Krabbelstube Kuschelbär",
-     "https://kinderfreunde.at/angebote/detail/steyr-krabbelstube-kuschelbar"),
-
-    ("Wels - Krabbelstube Purzelbaum",
-     "https://kinderfreunde.at/angebote/detail/wels-krabbelstube-purzelbaum"),
-    ("Wels - Krabbelstube Regenbogen",
-     "https://kinderfreunde.at/angebote/detail/wels-krabbelstube-regenbogen"),
-    ("Wels - Krabbelstube Sonnenschein",
-     "https://kinderfreunde.at/angebote/detail/wels-krabbelstube-sonnenschein"),
-    ("Wels - Krabbelstube Spatzennest",
-     "https://kinderfreunde.at/angebote/detail/wels-krabbelstube-spatzennest"),
-    ("Wels - Krabbelstube Wirbelwind",
-     "https://kinderfreunde.at/angebote/detail/wels-krabbelstube-wirbelwind"),
-]
-
-familienbund_kindergarten_urls: List[Tuple[str, str]] = [
-    ("Krabbelstube & Kindergarten Gmunden",
-     "https://ooe.familienbund.at/betreuung/krabbelstube-kindergarten-gmunden/"),
-    ("Kindergarten & Krabbelstube Hargelsberg",
-     "https://ooe.familienbund.at/betreuung/kindergaerten-krabbelstuben-hargelsberg/"),
-    ("Kindergarten Katsdorf – Reiser",
-     "https://ooe.familienbund.at/betreuung/kindergaerten-katsdorf-reiser/"),
-    ("Kindergarten & Krabbelstube Kematen/Krems",
-     "https://ooe.familienbund.at/betreuung/krabbelstuben-kematen-krems/"),
-    ("Kindergarten & Krabbelstube Pregarten Althauserstraße",
-     "https://ooe.familienbund.at/betreuung/kindergaerten-krabbelstuben-pregarten-althauserstrasse/"),
-    ("Kindergarten & Krabbelstube Pregarten Grünbichl",
-     "https://ooe.familienbund.at/betreuung/kindergaerten-pregarten-gruenbichl/"),
-]
-
-familienbund_krabbelstube_urls: List[Tuple[str, str]] = [
-    ("Krabbelstube Bad Hall",
-     "https://ooe.familienbund.at/betreuung/krabbelstuben-bad-hall/"),
-    ("Krabbelstube Dietach",
-     "https://ooe.familienbund.at/betreuung/krabbelstuben-dietach/"),
-    ("Krabbelstube & Kindergarten Gmunden",
-     "https://ooe.familienbund.at/betreuung/krabbelstube-kindergarten-gmunden/"),
-    ("Kindergarten & Krabbelstube Hargelsberg",
-     "https://ooe.familienbund.at/betreuung/kindergaerten-krabbelstuben-hargelsberg/"),
-    ("Kindergarten & Krabbelstube Kematen/Krems",
-     "https://ooe.familienbund.at/betreuung/krabbelstuben-kematen-krems/"),
-    ("Krabbelstube Kirchham",
-     "https://ooe.familienbund.at/betreuung/krabbelstuben-kirchham/"),
-    ("Krabbelstube Köckendorf",
-     "https://ooe.familienbund.at/betreuung/krabbelstuben-koeckendorf/"),
-    ("Krabbelstube Kronstorf",
-     "https://ooe.familienbund.at/betreuung/krabbelstuben-kronstorf/"),
-    ("Krabbelstube Mondseeland",
-     "https://ooe.familienbund.at/betreuung/krabbelstuben-mondseeland/"),
-    ("Kindergarten & Krabbelstube Pregarten Althauserstraße",
-     "https://ooe.familienbund.at/betreuung/kindergaerten-krabbelstuben-pregarten-althauserstrasse/"),
-    ("Kindergarten & Krabbelstube Pregarten Grünbichl",
-     "https://ooe.familienbund.at/betreuung/kindergaerten-pregarten-gruenbichl/"),
-    ("Krabbelstube Puchenau",
-     "https://ooe.familienbund.at/betreuung/krabbelstuben-puchenau/"),
-    ("Krabbelstube St. Florian Ort",
-     "https://ooe.familienbund.at/betreuung/krabbelstuben-st-florian/"),
-    ("Krabbelstube St. Florian Hausfeld",
-     "https://ooe.familienbund.at/betreuung/krabbelstube-st-florian-hausfeld/"),
-    ("Krabbelstube St. Marienkirchen",
-     "https://ooe.familienbund.at/betreuung/krabbelstuben-st-marienkirchen/"),
-]
-
-familienbund_krabbelstube_betrieb_urls: List[Tuple[str, str]] = [
-    ("Krabbelstube Rotax",
-     "https://ooe.familienbund.at/betreuung/krabbelstube-rotax/"),
-    ("Krabbelstube RoSiPez (Rosenbauer/Silhouette/PEZ)",
-     "https://ooe.familienbund.at/betreuung/betriebliche-krabbelstuben-leonding-rosenbauer-silhouette-pez/"),
-    ("Krabbelstube Ordensklinikum Elisabethinen",
-     "https://ooe.familienbund.at/betreuung/krabbelstube-ordensklinikum-elisabethinen/"),
-    ("Krabbelstube Energie AG",
-     "https://ooe.familienbund.at/betreuung/betriebliche-krabbelstuben-linz-energie-ag/"),
-    ("Krabbelstube Oberbank",
-     "https://ooe.familienbund.at/betreuung/betriebliche-krabbelstuben-linz-oberbank/"),
-    ("Krabbelstube WiKi",
-     "https://ooe.familienbund.at/betreuung/betriebliche-krabbelstuben-linz-primetals-wifi-wko-siemens/"),
-    ("Krabbelstube HABAU – BauZwerge",
-     "https://ooe.familienbund.at/betreuung/betriebliche-krabbelstuben-perg-habau/"),
-    ("Krabbelstube Engel GmbH",
-     "https://ooe.familienbund.at/betreuung/betriebliche-krabbelstuben-schwertberg-engel-gmbh/"),
-    ("Krabbelstube Felbermayr",
-     "https://ooe.familienbund.at/betreuung/betriebliche-krabbelstuben-wels-felbermayr/"),
-]
-
-familienbund_flexible_urls: List[Tuple[str, str]] = [
-    ("Flexible Kinderbetreuung Haid-Center",
-     "https://ooe.familienbund.at/betreuung/flexible-kinderbetreuungen-ansfelden-haid-center-kinderland/"),
-    ("Flexible Kleinkindbetreuung Pfarrwichtel",
-     "https://ooe.familienbund.at/betreuung/flexible-kinderbetreuungen-ansfelden-pfarrwichtel/"),
-]
-
-familienbund_hort_urls: List[Tuple[str, str]] = [
-    ("Hort Bad Hall",
-     "https://ooe.familienbund.at/betreuung/hort-bad-hall/"),
-    ("Hort Pregarten",
-     "https://ooe.familienbund.at/betreuung/hort-pregarten/"),
-]
+
+def load_url_catalog(path: Path) -> Dict[Tuple[str, str], List[Tuple[str, str]]]:
+    """Lädt den URL-Katalog und gruppiert ihn nach (provider, category).
+
+    Returns:
+        Dictionary (provider, category) -> Liste von (name, url)-Tupeln in
+        Dateireihenfolge; unbekannte Schlüssel liefern eine leere Liste.
+    """
+    catalog: Dict[Tuple[str, str], List[Tuple[str, str]]] = defaultdict(list)
+    with open(path, newline="", encoding="utf-8") as fh:
+        for row in csv.DictReader(fh):
+            catalog[(row["provider"], row["category"])].append(
+                (row["name"], row["url"])
+            )
+    return catalog
+
+
+# Modulattribut -> (provider, category) im Katalog
+URL_LISTS: Dict[str, Tuple[str, str]] = {
+    "hort_urls": ("linz", "hort"),
+    "kindergarten_urls": ("linz", "kindergarten"),
+    "krabbelstube_urls": ("linz", "krabbelstube"),
+    "kinderfreunde_hort_urls": ("kinderfreunde", "hort"),
+    "kinderfreunde_kindergarten_urls": ("kinderfreunde", "kindergarten"),
+    "kinderfreunde_krabbelstube_urls": ("kinderfreunde", "krabbelstube"),
+    "familienbund_kindergarten_urls": ("familienbund", "kindergarten"),
+    "familienbund_krabbelstube_urls": ("familienbund", "krabbelstube"),
+    "familienbund_krabbelstube_betrieb_urls": ("familienbund", "krabbelstube_betrieb"),
+    "familienbund_flexible_urls": ("familienbund", "flexible"),
+    "familienbund_hort_urls": ("familienbund", "hort"),
+}
+
+_catalog: Optional[Dict[Tuple[str, str], List[Tuple[str, str]]]] = None
+
+
+def url_list(name: str) -> List[Tuple[str, str]]:
+    """Liefert eine URL-Liste (z.B. ``"hort_urls"``); der Katalog wird erst beim
+    ersten Zugriff geladen, damit Importe (z.B. in Worker-Prozessen) billig bleiben.
+    """
+    global _catalog
+    if _catalog is None:
+        _catalog = load_url_catalog(URL_CATALOG)
+    return _catalog[URL_LISTS[name]]
+
+
+def __getattr__(name: str) -> List[Tuple[str, str]]:
+    """Lazy Modulattribute ``hort_urls`` usw. für externe Aufrufer (PEP 562)."""
+    if name not in URL_LISTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = url_list(name)
+    globals()[name] = value
+    return value
 
 # ---------------------------------------------------------------------------
 # Hilfsfunktionen: HTTP & Textbereinigung
 # ---------------------------------------------------------------------------
 
 
-def fetch_html(url: str) -> BeautifulSoup:
-    """Lädt eine Webseite und gibt ein BeautifulSoup-Objekt zurück."""
-    resp = requests.get(url, headers=HEADERS, timeout=20)
+def _parse(
+    html: Union[str, bytes], strainer: Optional[SoupStrainer] = None
+) -> BeautifulSoup:
+    """Parst HTML mit lxml (deutlich schneller als der reine Python-Parser).
+
+    Bytes werden bevorzugt: lxml erkennt das Encoding dann selbst aus dem
+    Dokument, statt dass vorher per ``apparent_encoding`` dekodiert wird.
+
+    Mit ``strainer`` wird nur der Inhaltsblock aufgebaut (Navigation, Skripte,
+    Footer entfallen). Ist der gefilterte Baum leer (Seitenlayout geändert),
+    wird das komplette Dokument geparst.
+    """
+    if strainer is not None:
+        soup = BeautifulSoup(html, "lxml", parse_only=strainer)
+        if soup.find() is not None:
+            return soup
+    return BeautifulSoup(html, "lxml")
+
+
+def fetch_page(url: str) -> bytes:
+    """Lädt eine Webseite synchron und gibt den Body als ``bytes`` zurück."""
+    resp = SESSION.get(url, timeout=20)
     resp.raise_for_status()
-    return BeautifulSoup(resp.text, "html.parser")
+    return resp.content
+
+
+def fetch_html(url: str, strainer: Optional[SoupStrainer] = None) -> BeautifulSoup:
+    """Lädt eine Webseite und gibt ein BeautifulSoup-Objekt zurück."""
+    return _parse(fetch_page(url), strainer)
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    """True für HTTP-Fehler, die typischerweise vorübergehend sind."""
+    return (
+        isinstance(exc, aiohttp.ClientResponseError)
+        and exc.status in RETRY_STATUSES
+    )
+
+
+def _retry_after_seconds(headers: Mapping[str, str]) -> Optional[float]:
+    """Liest die vom Server gewünschte Wartezeit aus den Rate-Limit-Headern.
+
+    Unterstützt ``Retry-After`` (Sekunden oder HTTP-Datum) sowie
+    ``X-RateLimit-Reset`` (Sekunden oder Unix-Zeitstempel), falls
+    ``X-RateLimit-Remaining`` auf 0 steht.
+    """
+    retry_after = headers.get("Retry-After")
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            try:
+                when = parsedate_to_datetime(retry_after)
+            except (TypeError, ValueError):
+                return None
+            return max(0.0, when.timestamp() - time.time())
+
+    if headers.get("X-RateLimit-Remaining") == "0":
+        try:
+            reset = float(headers.get("X-RateLimit-Reset", ""))
+        except ValueError:
+            return None
+        # Große Werte sind absolute Zeitstempel, kleine relative Sekunden
+        return max(0.0, reset - time.time()) if reset > 1e9 else reset
+
+    return None
+
+
+@retry(
+    retry=retry_if_exception(_is_retryable),
+    stop=stop_after_attempt(5),
+    wait=wait_exponential_jitter(initial=0.5, max=10),
+    before_sleep=before_sleep_log(logging.getLogger(__name__), logging.WARNING),
+    reraise=True,
+)
+async def fetch(
+    session: aiohttp.ClientSession,
+    url: str,
+    host_semaphores: Dict[str, asyncio.BoundedSemaphore],
+) -> bytes:
+    """Lädt eine Webseite asynchron und gibt den Body als ``bytes`` zurück.
+
+    Dekodiert wird erst beim Parsen (lxml erkennt das Encoding selbst).
+
+    Die Anzahl paralleler Requests je Host wird über ``host_semaphores``
+    begrenzt, damit die Server nicht ins Rate-Limit laufen. Bei 429/5xx wird
+    mit exponentiellem Backoff wiederholt; verlangt der Server per Header
+    eine längere Pause, wird diese zusätzlich abgewartet (Semaphore bleibt
+    gehalten, damit der Host in der Zeit gedrosselt ist).
+    """
+    host = urlparse(url).netloc
+    async with host_semaphores[host]:
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=20)) as resp:
+            if resp.status in RETRY_STATUSES:
+                delay = _retry_after_seconds(resp.headers)
+                logging.warning(
+                    "HTTP %s für %s (Retry-After: %s s)", resp.status, url, delay
+                )
+                if delay:
+                    await asyncio.sleep(min(delay, RETRY_AFTER_MAX_SECONDS))
+            resp.raise_for_status()
+            return await resp.read()
+
+
+async def _fetch_or_error(
+    session: aiohttp.ClientSession,
+    url: str,
+    host_semaphores: Dict[str, asyncio.BoundedSemaphore],
+) -> Union[bytes, BaseException]:
+    """Wie ``fetch``, gibt Fehler aber zurück statt sie zu werfen.
+
+    ``tqdm_asyncio.gather`` kennt kein ``return_exceptions``.
+    """
+    try:
+        return await fetch(session, url, host_semaphores)
+    except Exception as exc:  # noqa: BLE001
+        return exc
+
+
+async def fetch_all(
+    url_pairs: List[Tuple[str, str]],
+) -> Dict[str, Union[bytes, BaseException]]:
+    """Lädt alle URLs nebenläufig (mit Fortschrittsbalken): url -> HTML-Bytes.
+
+    Fehlgeschlagene Downloads werden als Exception im Ergebnis abgelegt,
+    damit eine einzelne Seite nicht den gesamten Lauf abbricht.
+    """
+    # Mehrfach gelistete Seiten (z.B. Kindergarten + Krabbelstube) nur einmal laden;
+    # scrape_facility_list verteilt das HTML danach auf jeden Listeneintrag
+    urls = list(dict.fromkeys(url for _, url in url_pairs))
+    logging.info(
+        "%s URLs, davon %s eindeutig (%s Duplikate übersprungen)",
+        len(url_pairs),
+        len(urls),
+        len(url_pairs) - len(urls),
+    )
+    host_semaphores = {
+        host: asyncio.BoundedSemaphore(
+            HOST_CONCURRENCY.get(host, DEFAULT_HOST_CONCURRENCY)
+        )
+        for host in {urlparse(url).netloc for url in urls}
+    }
+    connector = aiohttp.TCPConnector(
+        limit_per_host=max(HOST_CONCURRENCY.values()),
+        keepalive_timeout=30,
+    )
+    if HTTP_CACHE_ENABLED:
+        session_ctx = CachedSession(
+            cache=SQLiteBackend(
+                cache_name=str(HTTP_CACHE_DIR / "async"),
+                expire_after=HTTP_CACHE_EXPIRE_SECONDS,
+            ),
+            headers=HEADERS,
+            connector=connector,
+        )
+    else:
+        session_ctx = aiohttp.ClientSession(headers=HEADERS, connector=connector)
+    async with session_ctx as session:
+        results = await tqdm_asyncio.gather(
+            *(_fetch_or_error(session, url, host_semaphores) for url in urls),
+            desc="Seiten laden",
+        )
+    return dict(zip(urls, results))
 
 
 def normalize_whitespace(text: Optional[str]) -> Optional[str]:
     """Reduziert mehrere Whitespaces/Zeilenumbrüche auf ein Leerzeichen."""
     if pd.isna(text):
         return text
-    return re.sub(r"\s+", " ", str(text)).strip()
+    # str.split() ohne Argument teilt an beliebigem Whitespace (C, kein Regex)
+    return " ".join(str(text).split())
 
 
 def clean_contact_name(text: Optional[str]) -> Optional[str]:
@@ -468,12 +391,33 @@ def clean_contact_name(text: Optional[str]) -> Optional[str]:
     if pd.isna(text):
         return text
     x = str(text)
-    x = re.sub(r",\s*,", ",", x)
-    x = re.sub(r"\s+", " ", x).strip()
-    x = re.sub(r"\s*:\s*$", "", x)
+    x = DOUBLE_COMMA_PATTERN.sub(",", x)
+    x = " ".join(x.split())
+    x = TRAILING_COLON_PATTERN.sub("", x)
     return x
 
 
+def normalize_whitespace_col(col: pd.Series) -> pd.Series:
+    """Spaltenweise Variante von ``normalize_whitespace`` (Regex läuft in C)."""
+    # astype(object): auch rein leere (float-NaN) Spalten erlauben den .str-Accessor
+    return (
+        col.astype(object)
+        .str.replace(WHITESPACE_PATTERN, " ", regex=True)
+        .str.strip()
+    )
+
+
+def clean_contact_name_col(col: pd.Series) -> pd.Series:
+    """Spaltenweise Variante von ``clean_contact_name``."""
+    return (
+        col.astype(object)
+        .str.replace(DOUBLE_COMMA_PATTERN, ",", regex=True)
+        .str.replace(WHITESPACE_PATTERN, " ", regex=True)
+        .str.strip()
+        .str.replace(TRAILING_COLON_PATTERN, "", regex=True)
+    )
+
+
 def extract_first_email(text: str) -> Optional[str]:
     """Extrahiert die erste E-Mail-Adresse aus einem Textblock."""
     if not text:
@@ -482,6 +426,76 @@ def extract_first_email(text: str) -> Optional[str]:
     return match.group(0) if match else None
 
 
+def extract_email(soup: BeautifulSoup) -> Optional[str]:
+    """Liest die E-Mail bevorzugt aus dem ersten ``mailto:``-Link.
+
+    Nur ohne verwertbaren Link wird der gesamte Seitentext zusammengesetzt
+    und mit ``EMAIL_PATTERN`` durchsucht.
+    """
+    mailto = soup.find("a", href=MAILTO_PATTERN)
+    if mailto is not None:
+        email = unquote(mailto["href"][len("mailto:"):].split("?", 1)[0]).strip()
+        if email:
+            return email
+    return extract_first_email(" ".join(soup.stripped_strings))
+
+
+def extract_name_and_email(
+    soup: BeautifulSoup, html: Union[str, bytes], list_name: str, url: str
+) -> Tuple[str, Optional[str]]:
+    """Liest Name (``<h1>``) und E-Mail einer Detailseite.
+
+    ``soup`` enthält nur den per Strainer gefilterten Inhaltsblock. Fehlt dort
+    die Überschrift oder die E-Mail (z.B. weil sie im Header/Footer steht),
+    wird für diese Felder einmal das komplette Dokument geparst. Findet der
+    volle Parse etwas, das im Inhaltsblock fehlte, wird das geloggt – ein
+    Hinweis, dass der Strainer für diese Seite zu eng ist.
+
+    Args:
+        soup: Gefilterter Baum der Seite.
+        html: Rohes HTML der Seite.
+        list_name: Name aus der URL-Liste (Fallback ohne ``<h1>``).
+        url: URL der Seite (für Logging).
+
+    Returns:
+        Tuple (Name, E-Mail oder None).
+    """
+    h1 = soup.find("h1")
+    email = extract_email(soup)
+    if h1 is None or email is None:
+        full = BeautifulSoup(html, "lxml")
+        missing = []
+        if h1 is None:
+            h1 = full.find("h1")
+            if h1 is not None:
+                missing.append("h1")
+        if email is None:
+            email = extract_email(full)
+            if email is not None:
+                missing.append("email")
+        if missing:
+            logging.info(
+                "%s außerhalb des Inhaltsblocks gefunden: %s", "/".join(missing), url
+            )
+    name = h1.get_text(strip=True) if h1 else list_name
+    return name, email
+
+
+def save_outputs(df: pd.DataFrame, path: Path) -> None:
+    """Schreibt ``df`` als CSV (UTF-8 mit BOM) und Parquet-Kopie daneben.
+
+    Beide Dateien entstehen aus derselben Arrow-Tabelle; der CSV-Writer von
+    pyarrow formatiert in C statt zeilenweise in Python.
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    with open(path, "wb") as fh:
+        fh.write("\ufeff".encode("utf-8"))  # BOM wie bisher bei encoding="utf-8-sig"
+        pa_csv.write_csv(
+            table, fh, write_options=pa_csv.WriteOptions(include_header=True)
+        )
+    pq.write_table(table, path.with_suffix(".parquet"), compression="snappy")
+
+
 # ---------------------------------------------------------------------------
 # Parsing Stadt Linz (Serviceguide-Seiten)
 # ---------------------------------------------------------------------------
@@ -491,57 +505,66 @@ def parse_linz_facility_page(
     url: str,
     list_name: str,
     facility_type: str,
+    html: Optional[bytes] = None,
 ) -> Dict[str, Optional[str]]:
     """Parst eine Kinderbetreuungs-Seite der Stadt Linz (Serviceguide)."""
-    soup = fetch_html(url)
-
-    h1 = soup.find("h1")
-    name = h1.get_text(strip=True) if h1 else list_name
+    if html is None:
+        html = fetch_page(url)
+    soup = _parse(html, LINZ_STRAINER)
 
-    full_text = " ".join(soup.stripped_strings)
+    name, email = extract_name_and_email(soup, html, list_name, url)
 
     street: Optional[str] = None
     plz: Optional[str] = None
     ort: Optional[str] = None
     telefon: Optional[str] = None
-    email = extract_first_email(full_text)
 
-    for p in soup.find_all(["p", "li"]):
+    opening_lines: List[str] = []
+    description: Optional[str] = None
+
+    # Ein einziger Durchlauf über alle Textblöcke (statt drei find_all-Pässen);
+    # Adresse/Telefon nur aus p/li, Beschreibung nur aus p – wie zuvor.
+    for p in soup.find_all(["p", "li", "div"]):
         text = normalize_whitespace(p.get_text(" ", strip=True))
 
-        if text and re.search(r"\b\d{4,5}\b", text) and "," in text and street is None:
-            addr_street, rest = text.split(",", 1)
-            addr_street = addr_street.strip()
-            rest = rest.strip()
-            parts = rest.split(maxsplit=1)
-            if len(parts) == 2 and re.fullmatch(r"\d{4,5}", parts[0]):
-                street = addr_street
-                plz = parts[0]
-                ort = parts[1]
-                continue
+        if p.name != "div":
+            is_address = False
+            if street is None and text and "," in text and PLZ_PATTERN.search(text):
+                addr_street, rest = text.split(",", 1)
+                addr_street = addr_street.strip()
+                rest = rest.strip()
+                parts = rest.split(maxsplit=1)
+                if len(parts) == 2 and PLZ_FULL_PATTERN.fullmatch(parts[0]):
+                    street = addr_street
+                    plz = parts[0]
+                    ort = parts[1]
+                    is_address = True
+
+            if (
+                not is_address
+                and telefon is None
+                and PHONE_PATTERN.search(text or "")
+            ):
+                telefon = text
+
+        if not text:
+            continue
 
-        if telefon is None and re.search(r"\+?\d[\d\s/()-]{5,}", text or ""):
-            telefon = text
+        if "Öffnungszeiten" in text or WEEKDAY_PATTERN.search(text):
+            opening_lines.append(text)
 
-    opening_lines: List[str] = []
-    for p in soup.find_all(["p", "li", "div"]):
-        txt = normalize_whitespace(p.get_text(" ", strip=True))
-        if not txt:
-            continue
-        if "Öffnungszeiten" in txt or WEEKDAY_PATTERN.search(txt):
-            opening_lines.append(txt)
+        if (
+            description is None
+            and p.name == "p"
+            and len(text) > 80
+            and "kind" in text.lower()
+        ):
+            description = text
 
     opening_hours = (
         " | ".join(dict.fromkeys(opening_lines)) if opening_lines else None
     )
 
-    description: Optional[str] = None
-    for p in soup.find_all("p"):
-        txt = normalize_whitespace(p.get_text(" ", strip=True))
-        if txt and len(txt) > 80 and "kind" in txt.lower():
-            description = txt
-            break
-
     form_url = FORM_URLS.get(facility_type.lower())
 
     return {
@@ -570,15 +593,14 @@ def parse_kinderfreunde_page(
     url: str,
     list_name: str,
     facility_type: str,
+    html: Optional[bytes] = None,
 ) -> Dict[str, Optional[str]]:
     """Parst eine Kinderfreunde-Seite (kinderfreunde.at)."""
-    soup = fetch_html(url)
-
-    h1 = soup.find("h1")
-    name = h1.get_text(strip=True) if h1 else list_name
+    if html is None:
+        html = fetch_page(url)
+    soup = _parse(html, KF_STRAINER)
 
-    full_text = " ".join(soup.stripped_strings)
-    email = extract_first_email(full_text)
+    name, email = extract_name_and_email(soup, html, list_name, url)
 
     street: Optional[str] = None
     plz: Optional[str] = None
@@ -594,12 +616,16 @@ def parse_kinderfreunde_page(
         if not txt:
             continue
 
-        if street is None and "," in txt and re.search(r"\b\d{4,5}\b", txt):
+        # Beschreibung im selben Durchlauf (erster längerer Absatz)
+        if beschreibung is None and p.name == "p" and len(txt) > 80:
+            beschreibung = txt
+
+        if street is None and "," in txt and PLZ_PATTERN.search(txt):
             addr_street, rest = txt.split(",", 1)
             addr_street = addr_street.strip()
             rest = rest.strip()
             parts = rest.split(maxsplit=1)
-            if len(parts) == 2 and re.fullmatch(r"\d{4,5}", parts[0]):
+            if len(parts) == 2 and PLZ_FULL_PATTERN.fullmatch(parts[0]):
                 street = addr_street
                 plz = parts[0]
                 ort = parts[1]
@@ -623,12 +649,6 @@ def parse_kinderfreunde_page(
                 txt if schliesstage is None else f"{schliesstage} | {txt}"
             )
 
-    for p in soup.find_all("p"):
-        txt = normalize_whitespace(p.get_text(" ", strip=True))
-        if txt and len(txt) > 80:
-            beschreibung = txt
-            break
-
     return {
         "art": facility_type,
         "name": name,
@@ -658,6 +678,7 @@ def parse_familienbund_page(
     list_name: str,
     traeger_label: str,
     facility_type: Optional[str] = None,
+    html: Optional[bytes] = None,
 ) -> Dict[str, Optional[str]]:
     """Parst eine Familienbund-Seite (ooe.familienbund.at).
 
@@ -666,17 +687,16 @@ def parse_familienbund_page(
         list_name: Name aus der URL-Liste.
         traeger_label: Text, der den Träger beschreibt (z.B. „Familienbund OÖ“).
         facility_type: Art der Einrichtung (z.B. "kindergarten", "krabbelstube", "hort").
+        html: Bereits geladenes HTML (Bytes); ohne Angabe wird die Seite geladen.
 
     Returns:
         Dictionary mit harmonisierten Feldern.
     """
-    soup = fetch_html(url)
-
-    h1 = soup.find("h1")
-    name = h1.get_text(strip=True) if h1 else list_name
+    if html is None:
+        html = fetch_page(url)
+    soup = _parse(html, FB_STRAINER)
 
-    full_text = " ".join(soup.stripped_strings)
-    email = extract_first_email(full_text)
+    name, email = extract_name_and_email(soup, html, list_name, url)
 
     street: Optional[str] = None
     plz: Optional[str] = None
@@ -689,12 +709,12 @@ def parse_familienbund_page(
             continue
 
         # Adresse
-        if street is None and "," in txt and re.search(r"\b\d{4,5}\b", txt):
+        if street is None and "," in txt and PLZ_PATTERN.search(txt):
             addr_street, rest = txt.split(",", 1)
             addr_street = addr_street.strip()
             rest = rest.strip()
             parts = rest.split(maxsplit=1)
-            if len(parts) == 2 and re.fullmatch(r"\d{4,5}", parts[0]):
+            if len(parts) == 2 and PLZ_FULL_PATTERN.fullmatch(parts[0]):
                 street = addr_street
                 plz = parts[0]
                 ort = parts[1]
@@ -704,6 +724,10 @@ def parse_familienbund_page(
         if telefon is None and ("Tel" in txt or "Telefon" in txt):
             telefon = txt
 
+        # Alle gesuchten Felder gefunden -> restliche Absätze überspringen
+        if street is not None and telefon is not None:
+            break
+
     return {
         "art": facility_type,
         "name": name,
@@ -732,18 +756,48 @@ def scrape_facility_list(
     parser_kwargs: Optional[Dict[str, object]] = None,
     desc: str = "Scraping",
     sleep_seconds: float = 0.5,
+    pages: Optional[Dict[str, Union[bytes, BaseException]]] = None,
+    executor: Optional[Executor] = None,
 ) -> List[Dict[str, Optional[str]]]:
-    """Scraped eine Liste von Einrichtungen mit einer Parser-Funktion."""
+    """Scraped eine Liste von Einrichtungen mit einer Parser-Funktion.
+
+    Mit ``pages`` (Ergebnis von ``fetch_all``) wird nur noch geparst – bei
+    übergebenem ``executor`` parallel in Worker-Prozessen, da das Parsen
+    CPU-gebunden ist. Ohne ``pages`` werden die Seiten sequenziell mit Pause
+    ``sleep_seconds`` geladen.
+    """
     parser_kwargs = parser_kwargs or {}
     records: List[Dict[str, Optional[str]]] = []
 
-    for name, url in tqdm(urls, desc=desc):
+    if pages is None:
+        for name, url in tqdm(urls, desc=desc):
+            try:
+                records.append(parser_func(url=url, list_name=name, **parser_kwargs))
+            except Exception as exc:  # noqa: BLE001
+                logging.warning("[ERROR] %s – %s: %s", name, url, exc)
+            time.sleep(sleep_seconds)
+        return records
+
+    jobs = []
+    for name, url in urls:
+        page = pages[url]
+        if isinstance(page, BaseException):
+            logging.warning("[ERROR] %s – %s: %s", name, url, page)
+            continue
+        job_kwargs = dict(url=url, list_name=name, html=page, **parser_kwargs)
+        if executor is not None:
+            jobs.append((name, url, executor.submit(parser_func, **job_kwargs)))
+        else:
+            jobs.append((name, url, job_kwargs))
+
+    for name, url, job in tqdm(jobs, desc=desc):
         try:
-            rec = parser_func(url=url, list_name=name, **parser_kwargs)
-            records.append(rec)
+            if executor is not None:
+                records.append(job.result())
+            else:
+                records.append(parser_func(**job))
         except Exception as exc:  # noqa: BLE001
             logging.warning("[ERROR] %s – %s: %s", name, url, exc)
-        time.sleep(sleep_seconds)
 
     return records
 
@@ -764,202 +818,252 @@ def main() -> int:
     logging.info("Output-Verzeichnis: %s", OUTPUT_DIR)
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
-    # -------------------------
-    # 1) Stadt Linz
-    # -------------------------
-    linz_records: List[Dict[str, Optional[str]]] = []
-
-    if hort_urls:
-        linz_records += scrape_facility_list(
-            urls=hort_urls,
-            parser_func=parse_linz_facility_page,
-            parser_kwargs={"facility_type": "hort"},
-            desc="Linz: Horte scrapen",
-        )
+    hort_urls = url_list("hort_urls")
+    kindergarten_urls = url_list("kindergarten_urls")
+    krabbelstube_urls = url_list("krabbelstube_urls")
+    kinderfreunde_hort_urls = url_list("kinderfreunde_hort_urls")
+    kinderfreunde_kindergarten_urls = url_list("kinderfreunde_kindergarten_urls")
+    kinderfreunde_krabbelstube_urls = url_list("kinderfreunde_krabbelstube_urls")
+    familienbund_kindergarten_urls = url_list("familienbund_kindergarten_urls")
+    familienbund_krabbelstube_urls = url_list("familienbund_krabbelstube_urls")
+    familienbund_krabbelstube_betrieb_urls = url_list(
+        "familienbund_krabbelstube_betrieb_urls"
+    )
+    familienbund_flexible_urls = url_list("familienbund_flexible_urls")
+    familienbund_hort_urls = url_list("familienbund_hort_urls")
+
+    # Alle Detailseiten nebenläufig laden, danach synchron parsen
+    all_urls = (
+        hort_urls
+        + kindergarten_urls
+        + krabbelstube_urls
+        + kinderfreunde_hort_urls
+        + kinderfreunde_kindergarten_urls
+        + kinderfreunde_krabbelstube_urls
+        + familienbund_kindergarten_urls
+        + familienbund_krabbelstube_urls
+        + familienbund_krabbelstube_betrieb_urls
+        + familienbund_hort_urls
+        + familienbund_flexible_urls
+    )
+    pages = asyncio.run(fetch_all(all_urls))
+    # Parsen ist CPU-gebunden -> Worker-Prozesse statt GIL-gebundener Threads;
+    # der with-Block beendet die Worker auch, wenn Parsen/Speichern fehlschlägt
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as pool:
+        # -------------------------
+        # 1) Stadt Linz
+        # -------------------------
+        linz_records: List[Dict[str, Optional[str]]] = []
+
+        if hort_urls:
+            linz_records += scrape_facility_list(
+                urls=hort_urls,
+                pages=pages,
+                executor=pool,
+                parser_func=parse_linz_facility_page,
+                parser_kwargs={"facility_type": "hort"},
+                desc="Linz: Horte scrapen",
+            )
 
-    if kindergarten_urls:
-        linz_records += scrape_facility_list(
-            urls=kindergarten_urls,
-            parser_func=parse_linz_facility_page,
-            parser_kwargs={"facility_type": "kindergarten"},
-            desc="Linz: Kindergärten scrapen",
-        )
+        if kindergarten_urls:
+            linz_records += scrape_facility_list(
+                urls=kindergarten_urls,
+                pages=pages,
+                executor=pool,
+                parser_func=parse_linz_facility_page,
+                parser_kwargs={"facility_type": "kindergarten"},
+                desc="Linz: Kindergärten scrapen",
+            )
 
-    if krabbelstube_urls:
-        linz_records += scrape_facility_list(
-            urls=krabbelstube_urls,
-            parser_func=parse_linz_facility_page,
-            parser_kwargs={"facility_type": "krabbelstube"},
-            desc="Linz: Krabbelstuben scrapen",
-        )
+        if krabbelstube_urls:
+            linz_records += scrape_facility_list(
+                urls=krabbelstube_urls,
+                pages=pages,
+                executor=pool,
+                parser_func=parse_linz_facility_page,
+                parser_kwargs={"facility_type": "krabbelstube"},
+                desc="Linz: Krabbelstuben scrapen",
+            )
 
-    df_linz = pd.DataFrame(linz_records)
-    logging.info("Linz – Anzahl Einrichtungen: %s", len(df_linz))
-    if not df_linz.empty:
-        df_linz.to_csv(OUTPUT_LINZ, index=False, encoding="utf-8-sig")
-        logging.info("Linz-Daten gespeichert unter: %s", OUTPUT_LINZ)
-
-    # -------------------------
-    # 2) Kinderfreunde
-    # -------------------------
-    kf_records: List[Dict[str, Optional[str]]] = []
-
-    if kinderfreunde_hort_urls:
-        kf_records += scrape_facility_list(
-            urls=kinderfreunde_hort_urls,
-            parser_func=parse_kinderfreunde_page,
-            parser_kwargs={"facility_type": "hort"},
-            desc="Kinderfreunde: Horte scrapen",
-        )
+        df_linz = pd.DataFrame(linz_records)
+        logging.info("Linz – Anzahl Einrichtungen: %s", len(df_linz))
+        if not df_linz.empty:
+            save_outputs(df_linz, OUTPUT_LINZ)
+            logging.info("Linz-Daten gespeichert unter: %s", OUTPUT_LINZ)
+
+        # -------------------------
+        # 2) Kinderfreunde
+        # -------------------------
+        kf_records: List[Dict[str, Optional[str]]] = []
+
+        if kinderfreunde_hort_urls:
+            kf_records += scrape_facility_list(
+                urls=kinderfreunde_hort_urls,
+                pages=pages,
+                executor=pool,
+                parser_func=parse_kinderfreunde_page,
+                parser_kwargs={"facility_type": "hort"},
+                desc="Kinderfreunde: Horte scrapen",
+            )
 
-    if kinderfreunde_kindergarten_urls:
-        kf_records += scrape_facility_list(
-            urls=kinderfreunde_kindergarten_urls,
-            parser_func=parse_kinderfreunde_page,
-            parser_kwargs={"facility_type": "kindergarten"},
-            desc="Kinderfreunde: Kindergärten scrapen",
-        )
+        if kinderfreunde_kindergarten_urls:
+            kf_records += scrape_facility_list(
+                urls=kinderfreunde_kindergarten_urls,
+                pages=pages,
+                executor=pool,
+                parser_func=parse_kinderfreunde_page,
+                parser_kwargs={"facility_type": "kindergarten"},
+                desc="Kinderfreunde: Kindergärten scrapen",
+            )
 
-    if kinderfreunde_krabbelstube_urls:
-        kf_records += scrape_facility_list(
-            urls=kinderfreunde_krabbelstube_urls,
-            parser_func=parse_kinderfreunde_page,
-            parser_kwargs={"facility_type": "krabbelstube"},
-            desc="Kinderfreunde: Krabbelstuben scrapen",
-        )
+        if kinderfreunde_krabbelstube_urls:
+            kf_records += scrape_facility_list(
+                urls=kinderfreunde_krabbelstube_urls,
+                pages=pages,
+                executor=pool,
+                parser_func=parse_kinderfreunde_page,
+                parser_kwargs={"facility_type": "krabbelstube"},
+                desc="Kinderfreunde: Krabbelstuben scrapen",
+            )
 
-    df_kf = pd.DataFrame(kf_records)
-
-    kf_base_cols = [
-        "art",
-        "name",
-        "weburl",
-        "contact_name",
-        "strasse",
-        "plz",
-        "ort",
-        "telefon",
-        "email",
-        "oeffnungszeiten",
-    ]
-    kf_extra_cols = [
-        "angebot_art_label",
-        "kosten",
-        "schliesstage",
-        "beschreibung",
-        "traeger",
-    ]
-
-    for col in kf_base_cols + kf_extra_cols:
-        if col not in df_kf.columns:
-            df_kf[col] = None
-
-    if not df_kf.empty:
-        df_kf["strasse"] = df_kf["strasse"].apply(normalize_whitespace)
-        df_kf["oeffnungszeiten"] = df_kf["oeffnungszeiten"].apply(
-            normalize_whitespace
-        )
-        df_kf["contact_name"] = df_kf["contact_name"].apply(clean_contact_name)
-        df_kf = df_kf[kf_base_cols + kf_extra_cols]
-
-    logging.info("Kinderfreunde – Anzahl Einrichtungen: %s", len(df_kf))
-    if not df_kf.empty:
-        df_kf.to_csv(OUTPUT_KF, index=False, encoding="utf-8-sig")
-        logging.info("Kinderfreunde-Daten gespeichert unter: %s", OUTPUT_KF)
-
-    # -------------------------
-    # 3) Familienbund
-    # -------------------------
-    fb_records: List[Dict[str, Optional[str]]] = []
-
-    if familienbund_kindergarten_urls:
-        fb_records += scrape_facility_list(
-            urls=familienbund_kindergarten_urls,
-            parser_func=parse_familienbund_page,
-            parser_kwargs={
-                "traeger_label": "Familienbund OÖ",
-                "facility_type": "kindergarten",
-            },
-            desc="Familienbund: Kindergärten scrapen",
+        kf_base_cols = [
+            "art",
+            "name",
+            "weburl",
+            "contact_name",
+            "strasse",
+            "plz",
+            "ort",
+            "telefon",
+            "email",
+            "oeffnungszeiten",
+        ]
+        kf_extra_cols = [
+            "angebot_art_label",
+            "kosten",
+            "schliesstage",
+            "beschreibung",
+            "traeger",
+        ]
+
+        # Einmalige Konstruktion im kanonischen Schema; fehlende Felder werden leer
+        df_kf = pd.DataFrame.from_records(
+            kf_records, columns=kf_base_cols + kf_extra_cols
         )
 
-    if familienbund_krabbelstube_urls:
-        fb_records += scrape_facility_list(
-            urls=familienbund_krabbelstube_urls,
-            parser_func=parse_familienbund_page,
-            parser_kwargs={
-                "traeger_label": "Familienbund OÖ",
-                "facility_type": "krabbelstube",
-            },
-            desc="Familienbund: Krabbelstuben scrapen",
-        )
+        if not df_kf.empty:
+            df_kf["strasse"] = normalize_whitespace_col(df_kf["strasse"])
+            df_kf["oeffnungszeiten"] = normalize_whitespace_col(
+                df_kf["oeffnungszeiten"]
+            )
+            df_kf["contact_name"] = clean_contact_name_col(df_kf["contact_name"])
+
+        logging.info("Kinderfreunde – Anzahl Einrichtungen: %s", len(df_kf))
+        if not df_kf.empty:
+            save_outputs(df_kf, OUTPUT_KF)
+            logging.info("Kinderfreunde-Daten gespeichert unter: %s", OUTPUT_KF)
+
+        # -------------------------
+        # 3) Familienbund
+        # -------------------------
+        fb_records: List[Dict[str, Optional[str]]] = []
+
+        if familienbund_kindergarten_urls:
+            fb_records += scrape_facility_list(
+                urls=familienbund_kindergarten_urls,
+                pages=pages,
+                executor=pool,
+                parser_func=parse_familienbund_page,
+                parser_kwargs={
+                    "traeger_label": "Familienbund OÖ",
+                    "facility_type": "kindergarten",
+                },
+                desc="Familienbund: Kindergärten scrapen",
+            )
 
-    if familienbund_krabbelstube_betrieb_urls:
-        fb_records += scrape_facility_list(
-            urls=familienbund_krabbelstube_betrieb_urls,
-            parser_func=parse_familienbund_page,
-            parser_kwargs={
-                "traeger_label": "Familienbund OÖ",
-                "facility_type": "krabbelstube",
-            },
-            desc="Familienbund: Betriebliche Krabbelstuben scrapen",
-        )
+        if familienbund_krabbelstube_urls:
+            fb_records += scrape_facility_list(
+                urls=familienbund_krabbelstube_urls,
+                pages=pages,
+                executor=pool,
+                parser_func=parse_familienbund_page,
+                parser_kwargs={
+                    "traeger_label": "Familienbund OÖ",
+                    "facility_type": "krabbelstube",
+                },
+                desc="Familienbund: Krabbelstuben scrapen",
+            )
 
-    if familienbund_hort_urls:
-        fb_records += scrape_facility_list(
-            urls=familienbund_hort_urls,
-            parser_func=parse_familienbund_page,
-            parser_kwargs={
-                "traeger_label": "Familienbund OÖ",
-                "facility_type": "hort",
-            },
-            desc="Familienbund: Horte scrapen",
-        )
+        if familienbund_krabbelstube_betrieb_urls:
+            fb_records += scrape_facility_list(
+                urls=familienbund_krabbelstube_betrieb_urls,
+                pages=pages,
+                executor=pool,
+                parser_func=parse_familienbund_page,
+                parser_kwargs={
+                    "traeger_label": "Familienbund OÖ",
+                    "facility_type": "krabbelstube",
+                },
+                desc="Familienbund: Betriebliche Krabbelstuben scrapen",
+            )
 
-    if familienbund_flexible_urls:
-        fb_records += scrape_facility_list(
-            urls=familienbund_flexible_urls,
-            parser_func=parse_familienbund_page,
-            parser_kwargs={
-                "traeger_label": "Familienbund OÖ",
-                "facility_type": "flexible",
-            },
-            desc="Familienbund: Flexible Angebote scrapen",
+        if familienbund_hort_urls:
+            fb_records += scrape_facility_list(
+                urls=familienbund_hort_urls,
+                pages=pages,
+                executor=pool,
+                parser_func=parse_familienbund_page,
+                parser_kwargs={
+                    "traeger_label": "Familienbund OÖ",
+                    "facility_type": "hort",
+                },
+                desc="Familienbund: Horte scrapen",
+            )
+
+        if familienbund_flexible_urls:
+            fb_records += scrape_facility_list(
+                urls=familienbund_flexible_urls,
+                pages=pages,
+                executor=pool,
+                parser_func=parse_familienbund_page,
+                parser_kwargs={
+                    "traeger_label": "Familienbund OÖ",
+                    "facility_type": "flexible",
+                },
+                desc="Familienbund: Flexible Angebote scrapen",
+            )
+
+        fb_base_cols = [
+            "art",
+            "name",
+            "weburl",
+            "contact_name",
+            "strasse",
+            "plz",
+            "ort",
+            "telefon",
+            "email",
+        ]
+        fb_extra_cols = [
+            "traeger",
+            "anmeldung_url",
+            "anmeldung_krabbelstube_url",
+            "anmeldung_kindergarten_url",
+        ]
+
+        # Einmalige Konstruktion im kanonischen Schema; fehlende Felder werden leer
+        df_fb = pd.DataFrame.from_records(
+            fb_records, columns=fb_base_cols + fb_extra_cols
         )
 
-    df_fb = pd.DataFrame(fb_records)
-
-    fb_base_cols = [
-        "art",
-        "name",
-        "weburl",
-        "contact_name",
-        "strasse",
-        "plz",
-        "ort",
-        "telefon",
-        "email",
-    ]
-    fb_extra_cols = [
-        "traeger",
-        "anmeldung_url",
-        "anmeldung_krabbelstube_url",
-        "anmeldung_kindergarten_url",
-    ]
-
-    for col in fb_base_cols + fb_extra_cols:
-        if col not in df_fb.columns:
-            df_fb[col] = None
-
-    if not df_fb.empty:
-        df_fb["strasse"] = df_fb["strasse"].apply(normalize_whitespace)
-        df_fb["contact_name"] = df_fb["contact_name"].apply(clean_contact_name)
-        df_fb = df_fb[fb_base_cols + fb_extra_cols]
-
-    logging.info("Familienbund – Anzahl Einrichtungen: %s", len(df_fb))
-    if not df_fb.empty:
-        df_fb.to_csv(OUTPUT_FB, index=False, encoding="utf-8-sig")
-        logging.info("Familienbund-Daten gespeichert unter: %s", OUTPUT_FB)
+        if not df_fb.empty:
+            df_fb["strasse"] = normalize_whitespace_col(df_fb["strasse"])
+            df_fb["contact_name"] = clean_contact_name_col(df_fb["contact_name"])
+
+        logging.info("Familienbund – Anzahl Einrichtungen: %s", len(df_fb))
+        if not df_fb.empty:
+            save_outputs(df_fb, OUTPUT_FB)
+            logging.info("Familienbund-Daten gespeichert unter: %s", OUTPUT_FB)
 
     logging.info("Scraping abgeschlossen.")
     return 0
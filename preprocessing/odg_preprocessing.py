@@ -16,13 +16,19 @@ Funktionen:
 
 from __future__ import annotations
 
+import hashlib
+import json
 import logging
+import os
+import re
 from pathlib import Path
-from typing import Optional
+from types import MappingProxyType
+from typing import List, Optional
 
-import matplotlib.pyplot as plt
-import missingno as msno
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 
 # ---------------------------------------------------------------------------
 # Pfade & Konfiguration
@@ -36,12 +42,19 @@ OUTPUT_DIR = PREPROCESSING_DIR / "outputs"
 
 INPUT_FILE = DATA_DIR / "kbbes.csv"
 OUTPUT_FILE = OUTPUT_DIR / "ogd_preprocessed.csv"
+# Hash über Mappings + Quelltext des letzten Laufs (OGD_FORCE_REBUILD=1: Neulauf)
+STAMP_FILE = OUTPUT_FILE.with_suffix(".stamp")
+
+# Einmal kompilierte Muster für die spaltenweisen .str.replace-Aufrufe
+PHONE_CLEAN_RE = re.compile(r"^\s*nan\s*$|\s+")
 
 # ---------------------------------------------------------------------------
 # URL-Mapping (manuell gepflegt)
 # ---------------------------------------------------------------------------
+# Alle Mappings sind schreibgeschützt (MappingProxyType), damit sie zur
+# Laufzeit nicht versehentlich verändert werden.
 
-URL_MAPPING = {
+URL_MAPPING = MappingProxyType({
     "https://www.steyr.gv.at/einrichtungen/soziale_einrichtungen/"
     "kindergaerten_und_horte": (
         "https://www.steyr.at/Leben/Familie_Kinder/"
@@ -72,16 +85,16 @@ URL_MAPPING = {
         "https://www.rossbach.at/Unser_Rossbach/Kinderbetreuung..."
         "_Rossbach_-_St_Veit/Kontakt_und_Aufnahme/Kontakt_und_Aufnahme"
     ),
-}
+})
 
-ART_MAPPING = {
+ART_MAPPING = MappingProxyType({
     "KG": "Kindergarten",
     "KS": "Krabbelstube",
     "HO": "Hort",
     "SOF": "Sonstige Form der Kinderbetreuung",
-}
+})
 
-BEZIRK_MAPPING = {
+BEZIRK_MAPPING = MappingProxyType({
     401: "Linz (Stadt)",
     402: "Steyr (Stadt)",
     403: "Wels (Stadt)",
@@ -100,7 +113,14 @@ BEZIRK_MAPPING = {
     416: "Urfahr-Umgebung",
     417: "Vöcklabruck",
     418: "Wels-Land",
-}
+})
+
+# Lookup-Array für die zusammenhängenden Kennzahlen 401..418 (Index = Kennzahl - 401)
+_BEZIRK_MIN = min(BEZIRK_MAPPING)
+_BEZIRK_ARR = np.array(
+    [BEZIRK_MAPPING.get(code) for code in range(_BEZIRK_MIN, max(BEZIRK_MAPPING) + 1)],
+    dtype=object,
+)
 
 # ---------------------------------------------------------------------------
 # Hilfsfunktionen
@@ -114,116 +134,171 @@ def plot_missingness(df: pd.DataFrame, title: Optional[str] = None) -> None:
         df: DataFrame, dessen Missingness visualisiert werden soll.
         title: Optionaler Titel für die Grafik.
     """
+    # Imports erst hier: normale Läufe laden matplotlib/missingno gar nicht
+    import matplotlib.pyplot as plt
+    import missingno as msno
+
     if title:
         plt.title(title)
     msno.matrix(df)
     plt.show()
 
 
-def clean_column_names(df: pd.DataFrame) -> pd.DataFrame:
+def clean_column_names(df: pd.DataFrame, _inplace: bool = False) -> pd.DataFrame:
     """Bereinigt Spaltennamen (Trimmen und Kleinschreibung).
 
     Args:
         df: Ursprünglicher DataFrame.
+        _inplace: ``df`` direkt verändern statt zu kopieren
+            (für die Pipeline in ``clean_ogd_dataset``).
 
     Returns:
         DataFrame mit bereinigten Spaltennamen.
     """
-    df = df.copy()
+    if not _inplace:
+        df = df.copy()
     df.columns = df.columns.str.strip().str.lower()
     return df
 
 
-def clean_phone_column(df: pd.DataFrame, column: str = "telefon") -> pd.DataFrame:
+def clean_phone_column(
+    df: pd.DataFrame, column: str = "telefon", _inplace: bool = False
+) -> pd.DataFrame:
     """Bereinigt die Telefonnummernspalte.
 
     - Entfernt Leerzeichen.
-    - Wandelt 'nan' wieder in leere Strings um.
+    - Wandelt fehlende Werte (NaN/None) und 'nan' in leere Strings um.
 
     Args:
         df: Eingangs-DataFrame.
         column: Name der Telefonspalte.
+        _inplace: ``df`` direkt verändern statt zu kopieren
+            (für die Pipeline in ``clean_ogd_dataset``).
 
     Returns:
         DataFrame mit bereinigter Telefonspalte.
     """
-    df = df.copy()
+    if not _inplace:
+        df = df.copy()
+    # Fehlende Werte vor dem Cast auf "" setzen: der pyarrow-Parser liefert
+    # None statt NaN, astype(str) würde daraus 'None' machen
     df[column] = (
         df[column]
+        .where(df[column].notna(), "")
         .astype(str)
-        .str.replace(r"\s+", "", regex=True)  # alle Leerzeichen entfernen
-        .str.replace(r"^nan$", "", regex=True)  # 'nan' wieder zu leer
+        # ein Durchlauf: 'nan' wieder zu leer, sonst alle Leerzeichen entfernen
+        .str.replace(PHONE_CLEAN_RE, "", regex=True)
     )
     return df
 
 
-def normalize_weburl_column(df: pd.DataFrame, column: str = "weburl") -> pd.DataFrame:
+def normalize_weburl_column(
+    df: pd.DataFrame, column: str = "weburl", _inplace: bool = False
+) -> pd.DataFrame:
     """Normalisiert die Web-URLs (Trimmen, Kleinschreibung, www-Präfix).
 
     Args:
         df: Eingangs-DataFrame.
         column: Name der Spalte mit URLs.
+        _inplace: ``df`` direkt verändern statt zu kopieren
+            (für die Pipeline in ``clean_ogd_dataset``).
 
     Returns:
         DataFrame mit bereinigter URL-Spalte.
     """
-    df = df.copy()
-    df[column] = (
-        df[column]
-        .astype(str)
-        .str.strip()
-        .str.replace(r"^nan$", "", regex=True)
-        .str.lower()
-        .str.replace(r"^www\.", "https://www.", regex=True)
-    )
+    if not _inplace:
+        df = df.copy()
+    # Arrow-Kernels (C++) auf einem zusammenhängenden UTF-8-Puffer statt
+    # einer neuen object-Series pro .str-Schritt
+    # fehlende Werte (NaN oder None je nach CSV-Parser) → "" vor dem Cast
+    values = df[column].where(df[column].notna(), "").astype(str)
+    arr = pa.array(values.to_numpy(dtype=object), type=pa.string())
+    arr = pc.utf8_trim_whitespace(arr)
+    arr = pc.replace_substring_regex(arr, pattern=r"^nan$", replacement="")
+    arr = pc.utf8_lower(arr)
+    arr = pc.replace_substring_regex(arr, pattern=r"^www\.", replacement="https://www.")
+    df[column] = arr.to_numpy(zero_copy_only=False)
     return df
 
 
-def map_art_column(df: pd.DataFrame, column: str = "art") -> pd.DataFrame:
+def map_art_column(
+    df: pd.DataFrame, column: str = "art", _inplace: bool = False
+) -> pd.DataFrame:
     """Mappt Kurzbezeichnungen in der Spalte 'art' auf Langformen.
 
     Args:
         df: Eingangs-DataFrame.
         column: Name der Spalte mit der Art der Einrichtung.
+        _inplace: ``df`` direkt verändern statt zu kopieren
+            (für die Pipeline in ``clean_ogd_dataset``).
 
     Returns:
         DataFrame mit gemappter 'art'-Spalte.
     """
-    df = df.copy()
-    df[column] = df[column].map(ART_MAPPING)
+    if not _inplace:
+        df = df.copy()
+    # Dict-Lookup nur je eindeutigem Wert; Code -1 (fehlend) zeigt auf das
+    # angehängte None. Ergebnis bleibt eine normale object-Spalte (kein
+    # Categorical, damit die Parquet-Kopie für kbbe_merge String-Typen behält).
+    codes, uniques = pd.factorize(df[column])
+    mapped = np.append(uniques.map(ART_MAPPING).to_numpy(dtype=object), None)
+    df[column] = mapped[codes]
     return df
 
 
-def map_bezirk_column(df: pd.DataFrame, column: str = "bezirk") -> pd.DataFrame:
+def map_bezirk_column(
+    df: pd.DataFrame, column: str = "bezirk", _inplace: bool = False
+) -> pd.DataFrame:
     """Mappt Bezirkskennzahlen auf Bezirksnamen.
 
     Args:
         df: Eingangs-DataFrame.
         column: Name der Spalte mit der Bezirkskennzahl.
+        _inplace: ``df`` direkt verändern statt zu kopieren
+            (für die Pipeline in ``clean_ogd_dataset``).
 
     Returns:
         DataFrame mit Bezirksnamen.
     """
-    df = df.copy()
-    # robust konvertieren, falls es doch mal NaNs gibt
-    df[column] = pd.to_numeric(df[column], errors="coerce").astype("Int64")
-    df[column] = df[column].map(BEZIRK_MAPPING)
+    if not _inplace:
+        df = df.copy()
+    # robust konvertieren, falls es doch mal NaNs gibt; Lookup per Array-Index
+    codes = pd.to_numeric(df[column], errors="coerce").to_numpy(dtype=float)
+    idx = codes - _BEZIRK_MIN
+    valid = (idx >= 0) & (idx < len(_BEZIRK_ARR)) & (idx == np.floor(idx))
+    names = np.full(len(codes), None, dtype=object)
+    names[valid] = _BEZIRK_ARR[idx[valid].astype(np.intp)]
+    df[column] = names
     return df
 
 
-def apply_url_mapping(df: pd.DataFrame, column: str = "weburl") -> pd.DataFrame:
+def apply_url_mapping(
+    df: pd.DataFrame,
+    column: str = "weburl",
+    _inplace: bool = False,
+    _normalized: bool = False,
+) -> pd.DataFrame:
     """Bereinigt und aktualisiert Web-URLs über ein manuell gepflegtes Mapping.
 
     Args:
         df: Eingangs-DataFrame.
         column: Name der Spalte mit URLs.
+        _inplace: ``df`` direkt verändern statt zu kopieren
+            (für die Pipeline in ``clean_ogd_dataset``).
+        _normalized: Spalte kommt bereits als getrimmte Strings aus
+            ``normalize_weburl_column``; Umwandeln und Trimmen entfallen.
 
     Returns:
         DataFrame mit aktualisierten URLs.
     """
-    df = df.copy()
-    df[column] = df[column].astype(str).str.strip()
-    df[column] = df[column].replace(URL_MAPPING)
+    if not _inplace:
+        df = df.copy()
+    if not _normalized:
+        df[column] = df[column].astype(str).str.strip()
+    # Nur die (wenigen) Treffer ersetzen statt replace() über die ganze Spalte
+    mask = df[column].isin(URL_MAPPING.keys())
+    if mask.any():
+        df.loc[mask, column] = df.loc[mask, column].map(URL_MAPPING)
     return df
 
 
@@ -236,24 +311,81 @@ def clean_ogd_dataset(df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         Bereinigter DataFrame.
     """
-    df = clean_column_names(df)
-    df = clean_phone_column(df, column="telefon")
-    df = normalize_weburl_column(df, column="weburl")
-    df = map_art_column(df, column="art")
-    df = map_bezirk_column(df, column="bezirk")
-    df = apply_url_mapping(df, column="weburl")
+    # Für die Spaltennamen genügt eine flache Kopie (Rohdaten bleiben unverändert)
+    df = clean_column_names(df.copy(deep=False), _inplace=True)
+
+    # Zeilen mit "TEST" im Namen zuerst entfernen: drop(inplace=True) legt
+    # die verbleibenden Zeilen einmal neu an (statt Maske + .copy()), danach
+    # arbeiten alle folgenden Schritte direkt darauf
+    mask = df["name"].str.contains("TEST", case=False, regex=False, na=False)
+    df.drop(df.index[mask.to_numpy()], inplace=True)
 
-    # Zeilen mit "TEST" im Namen entfernen
-    df = df[~df["name"].str.contains("TEST", case=False, na=False)].copy()
+    df = clean_phone_column(df, column="telefon", _inplace=True)
+    df = normalize_weburl_column(df, column="weburl", _inplace=True)
+    df = map_art_column(df, column="art", _inplace=True)
+    df = map_bezirk_column(df, column="bezirk", _inplace=True)
+    df = apply_url_mapping(df, column="weburl", _inplace=True, _normalized=True)
 
     return df
 
 
+def config_stamp() -> str:
+    """Berechnet einen Hash über die Mappings und den Quelltext dieses Moduls.
+
+    Returns:
+        SHA-256-Hexdigest; ändert sich, sobald Mapping oder Code geändert werden.
+    """
+    h = hashlib.sha256()
+    mappings = [dict(m) for m in (ART_MAPPING, BEZIRK_MAPPING, URL_MAPPING)]
+    h.update(json.dumps(mappings, sort_keys=True, ensure_ascii=False).encode("utf-8"))
+    h.update(Path(__file__).read_bytes())
+    return h.hexdigest()
+
+
+def output_is_current() -> bool:
+    """Prüft, ob der bereinigte Output noch zu Input, Mappings und Code passt.
+
+    Returns:
+        True, wenn der Output neuer als der Input ist und der gespeicherte
+        Stamp dem aktuellen ``config_stamp()`` entspricht.
+    """
+    if os.environ.get("OGD_FORCE_REBUILD") == "1":
+        return False
+    if not (OUTPUT_FILE.is_file() and STAMP_FILE.is_file()):
+        return False
+    if OUTPUT_FILE.stat().st_mtime < INPUT_FILE.stat().st_mtime:
+        return False
+    return STAMP_FILE.read_text(encoding="utf-8").strip() == config_stamp()
+
+
 # ---------------------------------------------------------------------------
 # Hauptlogik
 # ---------------------------------------------------------------------------
 
 
+def parser_mismatch_columns(df_a: pd.DataFrame, df_b: pd.DataFrame) -> List[str]:
+    """Vergleicht zwei bereinigte DataFrames so, wie sie ins CSV geschrieben werden.
+
+    Fehlende Werte (NaN/None) zählen als leer, alle anderen Werte werden als
+    String verglichen.
+
+    Args:
+        df_a: Ergebnis mit dem pyarrow-Parser.
+        df_b: Ergebnis mit dem Standard-Parser (C-Engine).
+
+    Returns:
+        Spalten, deren Inhalt sich unterscheidet (leer, wenn identisch).
+    """
+    if list(df_a.columns) != list(df_b.columns) or len(df_a) != len(df_b):
+        return ["<Form/Spalten>"]
+
+    def rendered(col: pd.Series) -> pd.Series:
+        col = col.astype(object)
+        return col.where(col.notna(), "").astype(str).reset_index(drop=True)
+
+    return [c for c in df_a.columns if not rendered(df_a[c]).equals(rendered(df_b[c]))]
+
+
 def main() -> int:
     """Hauptfunktion: lädt, bereinigt und speichert den OGD-Datensatz."""
     logging.basicConfig(
@@ -269,14 +401,25 @@ def main() -> int:
         logging.error("Input-Datei existiert nicht: %s", INPUT_FILE)
         return 1
 
+    if output_is_current():
+        logging.info("Output ist aktuell (%s) – nichts zu tun.", OUTPUT_FILE)
+        return 0
+
     # Daten laden
-    df_raw = pd.read_csv(INPUT_FILE)
+    # Arrow-Parser (C++, mehrere Threads); Fallback auf den Standard-Parser
+    used_pyarrow = True
+    try:
+        df_raw = pd.read_csv(INPUT_FILE, engine="pyarrow")
+    except (ImportError, ValueError) as exc:
+        logging.info("pyarrow-Parser nicht nutzbar (%s) – nutze Standard-Parser.", exc)
+        df_raw = pd.read_csv(INPUT_FILE, low_memory=False)
+        used_pyarrow = False
 
     logging.info("Form (Zeilen, Spalten) vor Cleaning: %s", df_raw.shape)
     logging.info("Spaltennamen: %s", list(df_raw.columns))
 
     logging.info("Fehlende Werte pro Spalte (Top 10):\n%s",
-                 df_raw.isna().sum().sort_values(ascending=False).head(10))
+                 df_raw.isna().sum().nlargest(10))
 
     # Missingness-Matrix vor dem Cleaning (optional; kann auskommentiert werden)
     # plot_missingness(df_raw, title="Missingness vor dem Cleaning")
@@ -284,6 +427,17 @@ def main() -> int:
     # Bereinigung
     df = clean_ogd_dataset(df_raw)
 
+    # Optionaler Abgleich (OGD_VERIFY_PARSER=1): Ergebnis muss dem des
+    # Standard-Parsers entsprechen, sonst wird nichts geschrieben
+    if used_pyarrow and os.environ.get("OGD_VERIFY_PARSER") == "1":
+        df_c = clean_ogd_dataset(pd.read_csv(INPUT_FILE, low_memory=False))
+        mismatch = parser_mismatch_columns(df, df_c)
+        if mismatch:
+            logging.error("pyarrow- und C-Parser liefern verschiedene Werte in: %s",
+                          mismatch)
+            return 1
+        logging.info("Abgleich mit dem Standard-Parser: identisch.")
+
     logging.info("Form nach Cleaning: %s", df.shape)
     logging.info("Bezirkswerte nach Mapping (unique): %s",
                  sorted(df["bezirk"].dropna().unique().tolist()))
@@ -295,7 +449,15 @@ def main() -> int:
 
     # Output-Verzeichnis anlegen und CSV schreiben
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-    df.to_csv(OUTPUT_FILE, index=False)
+    # 1 MiB Schreibpuffer: viele kleine Writes von to_csv -> wenige Syscalls
+    with open(OUTPUT_FILE, "wb", buffering=1 << 20) as fh:
+        df.to_csv(fh, index=False, encoding="utf-8")
+    # Parquet-Kopie: kbbe_merge liest diese bevorzugt (schneller als CSV)
+    try:
+        df.to_parquet(OUTPUT_FILE.with_suffix(".parquet"), compression="snappy", index=False)
+    except (ImportError, TypeError, ValueError) as exc:
+        logging.warning("Parquet-Kopie für %s nicht geschrieben: %s", "OGD-Daten", exc)
+    STAMP_FILE.write_text(config_stamp(), encoding="utf-8")
 
     logging.info("Bereinigter Datensatz gespeichert unter: %s", OUTPUT_FILE)
     return 0
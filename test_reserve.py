@@ -1,12 +1,12 @@
-from backend.sql_db import get_free_places, reserve_place
+from backend.sql_db import reserve_place_and_count
 
 def main():
     kennzahl = 401102  # Beispiel-Einrichtung: Krabbelstube Allendeplatz
 
-    print("Freie Plätze vorher:", get_free_places(kennzahl))
-    ok = reserve_place(kennzahl, "Max Muster", "max@example.com", "Emma Mustermann")
-    print("Vormerkung erfolgreich?", ok)
-    print("Freie Plätze nachher:", get_free_places(kennzahl))
+    # Prüfen, Hochzählen und Rückgabe der freien Plätze in einem UPDATE ... RETURNING
+    free_after = reserve_place_and_count(kennzahl, "Max Muster", "max@example.com", "Emma Mustermann")
+    print("Vormerkung erfolgreich?", free_after is not None)
+    print("Freie Plätze nachher:", free_after)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
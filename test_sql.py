@@ -1,16 +1,15 @@
-from backend.sql_db import get_facilities_by_city, format_facilities
-from backend.sql_db import get_free_places, reserve_place
+from backend.sql_db import get_facilities_by_query, format_facilities
+from backend.sql_db import reserve_place_and_count
 
 def main():
     city = "Linz"
-    rows = get_facilities_by_city(city)
+    rows = get_facilities_by_query(city)
     print(format_facilities(rows, city))
 
+    kennzahl = 401102  # Beispiel-Einrichtung: Krabbelstube Allendeplatz
+    free_after = reserve_place_and_count(kennzahl, "Max Mustermann", "max@example.com", "Erika Mustermann")
+    print("erfolgreich?", free_after is not None)
+    print("freie Plätze nachher:", free_after)
+
 if __name__ == "__main__":
     main()
-
-fid = "…deine-facility-id…"
-print("freie Plätze vorher:", get_free_places(fid))
-ok = reserve_place(fid, "Max Mustermann", "max@example.com")
-print("erfolgreich?", ok)
-print("freie Plätze nachher:", get_free_places(fid))
\ No newline at end of file